@@ -2,25 +2,65 @@ import re
 import PyPDF2
 import docx
 from io import BytesIO
-from typing import Dict
-from config.settings import MAX_FILE_SIZE_MB  # Import MAX_FILE_SIZE_MB
+from typing import Dict, Iterable, Iterator, Union
+from config.settings import MAX_FILE_SIZE_MB, MAX_RESUME_PAGES, MAX_RESUME_CHARS  # Import MAX_FILE_SIZE_MB
 import streamlit as st  # Import Streamlit
+from backend.skill_matcher import get_skill_matcher
+from backend.parse_cache import cached_extract, upload_hash
+from backend.metrics import timed
 
-def parse_resume(file) -> str:
-    """Secure resume parsing with size validation"""
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+NON_ASCII_PATTERN = re.compile(r'[^\x00-\x7F]+')
+EXPERIENCE_PATTERN = re.compile(r'(\d+)\s*\+?\s*years?', re.IGNORECASE)
+# Text kept from the previous chunk so an experience phrase split across pages is still found
+EXPERIENCE_CARRY = 64
+
+def _iter_raw_text(stream, file_type: str) -> Iterator[str]:
+    if file_type == PDF_MIME:
+        reader = PyPDF2.PdfReader(stream)
+        for page_number, page in enumerate(reader.pages):
+            if MAX_RESUME_PAGES and page_number >= MAX_RESUME_PAGES:
+                return
+            yield page.extract_text()
+    elif file_type == DOCX_MIME:
+        for index, para in enumerate(docx.Document(stream).paragraphs):
+            yield para.text if index == 0 else "\n" + para.text
+
+def iter_resume_text(source, file_type: str, max_chars: int = MAX_RESUME_CHARS) -> Iterator[str]:
+    """Yield resume text page by page (paragraph by paragraph for DOCX)
+
+    source is raw bytes or a seekable binary file such as a Streamlit upload,
+    which is read in place instead of being copied into a new buffer.
+    Extraction stops after MAX_RESUME_PAGES pages or max_chars characters.
+    """
+    stream = BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    stream.seek(0)
+    remaining = max_chars or None
+    for chunk in _iter_raw_text(stream, file_type):
+        if remaining is not None:
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+        yield chunk
+        if remaining is not None and remaining <= 0:
+            return
+
+@timed("extract_text")
+def extract_text(source, file_type: str) -> str:
+    """Extract plain text from PDF/DOCX bytes or file; raises on unreadable documents"""
+    return "".join(iter_resume_text(source, file_type))
+
+@timed("parse_resume")
+def parse_resume(file, content_key: str = None) -> str:
+    """Secure resume parsing with size validation; text is cached by content hash"""
     try:
         max_size = MAX_FILE_SIZE_MB * 1024 * 1024
         if file.size > max_size:
             st.error(f"File too large. Max size: {MAX_FILE_SIZE_MB}MB")
             return ""
 
-        if file.type == "application/pdf":
-            with BytesIO(file.getbuffer()) as pdf_file:
-                reader = PyPDF2.PdfReader(pdf_file)
-                return "".join(page.extract_text() for page in reader.pages)
-        elif file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            return "\n".join(para.text for para in docx.Document(file).paragraphs)
-        return ""
+        return cached_extract(file, file.type, extract_text, content_key or upload_hash(file))
     except PyPDF2.errors.PdfReadError:
         st.error("Error: Could not read PDF file - may be corrupted or encrypted")
         return ""
@@ -28,38 +68,55 @@ def parse_resume(file) -> str:
         st.error(f"Resume parsing error: {str(e)}")
         return ""
 
-def analyze_resume(text: str, position: str) -> Dict:
-    """Enhanced resume analysis with security checks"""
-    sanitized_text = re.sub(r'[^\x00-\x7F]+', ' ', text)
+def _score(matcher, required: int, preferred: int) -> float:
+    """Resume score from the number of required and preferred matches (repeats included)"""
+    base_score = (required / len(matcher.required_skills)) * 100 if matcher.required_skills else 0
+    bonus_score = (preferred / len(matcher.preferred_skills)) * 20 if matcher.preferred_skills else 0
+    return max(0, min(base_score + bonus_score, 100))
+
+@timed("analyze_resume")
+def analyze_resume(text: Union[str, Iterable[str]], position: str, stop_when_saturated: bool = False) -> Dict:
+    """Enhanced resume analysis with security checks
+
+    text may also be an iterable of chunks (see iter_resume_text). With
+    stop_when_saturated the stream is abandoned once the experience figure
+    is found and the score has reached its 100 cap, so score and experience
+    equal a full scan; the match lists then omit later mentions.
+    """
+    chunks = [text] if isinstance(text, str) else text
     
-    required_skills = POSITION_CONFIG[position]["required_skills"]
-    preferred_skills = POSITION_CONFIG[position]["preferred_skills"]
+    matcher = get_skill_matcher(position)
     
-    valid_skills = required_skills + preferred_skills
-    found_skills = re.findall(
-        r'\b(' + '|'.join(re.escape(skill) for skill in valid_skills) + r')\b',
-        sanitized_text,
-        re.IGNORECASE
-    )
-    normalized_skills = [skill.strip().title() for skill in found_skills]
-
-    experience = 0
-    try:
-        exp_match = re.search(r'(\d+)\s*\+?\s*years?', sanitized_text, re.IGNORECASE)
-        if exp_match:
-            experience = int(exp_match.group(1))
-    except ValueError:
-        experience = 0
+    scan = matcher.scanner()
+    experience = None
+    carry = ""
+    for chunk in chunks:
+        sanitized_text = NON_ASCII_PATTERN.sub(' ', chunk)
+        if experience is None:
+            try:
+                exp_match = EXPERIENCE_PATTERN.search(carry + sanitized_text)
+                if exp_match:
+                    experience = int(exp_match.group(1))
+            except ValueError:
+                experience = 0
+            carry = (carry + sanitized_text)[-EXPERIENCE_CARRY:]
+        scan.feed(sanitized_text)
+        if stop_when_saturated and experience is not None and \
+                _score(matcher, scan.required_hits, scan.preferred_hits) >= 100:
+            break
+    scan.finish()
+    experience = experience or 0
+    
+    matched = scan.matches
+    normalized_skills = [matcher.normalized[i] for i in matched]
 
-    required_matches = [skill for skill in normalized_skills if skill in required_skills]
-    preferred_matches = [skill for skill in normalized_skills if skill in preferred_skills]
+    required_matches = [matcher.normalized[i] for i in matched if matcher.is_required[i]]
+    preferred_matches = [matcher.normalized[i] for i in matched if matcher.is_preferred[i]]
     
-    base_score = (len(required_matches) / len(required_skills)) * 100 if required_skills else 0
-    bonus_score = (len(preferred_matches) / len(preferred_skills)) * 20 if preferred_skills else 0
-    total_score = max(0, min(base_score + bonus_score, 100))
+    total_score = _score(matcher, len(required_matches), len(preferred_matches))
 
     return {
-        "skills": list(set(normalized_skills))[:8],
+        "skills": list(dict.fromkeys(normalized_skills))[:8],  # first-seen order, stable across processes
         "experience": experience,
         "resume_score": round(total_score, 1),
         "required_matches": required_matches,
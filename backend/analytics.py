@@ -0,0 +1,187 @@
+import argparse
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import pandas as pd
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from backend.db import (
+    get_engine, results_table, position_stats_table, hour_stats_table, skill_stats_table,
+)
+
+SUCCESS_THRESHOLD = 70
+TOP_SKILLS = 10
+REBUILD_CHUNK_SIZE = 10000
+
+
+def _hour_of(timestamp: str):
+    """Hour of day from a 'YYYY-MM-DD HH:MM:SS' timestamp, None if malformed"""
+    try:
+        hour = int(str(timestamp)[11:13])
+    except ValueError:
+        return None
+    return hour if 0 <= hour < 24 else None
+
+
+def _split_skills(skills: str) -> List[str]:
+    return [skill for skill in str(skills or "").split(", ") if skill]
+
+
+def _upsert(conn, table, keys: Dict, increments: Dict):
+    stmt = insert(table).values(**keys, **increments)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={column: table.c[column] + stmt.excluded[column] for column in increments},
+    )
+    conn.execute(stmt)
+
+
+def apply_result(conn, row: Dict, sign: int = 1) -> None:
+    """Add (or with sign=-1 remove) one results row to the materialized aggregates"""
+    position = row.get("position", "")
+    score = float(row.get("resume_score", 0) or 0)
+    _upsert(conn, position_stats_table, {"position": position}, {
+        "candidates": sign,
+        "score_sum": sign * score,
+        "successes": sign if score >= SUCCESS_THRESHOLD else 0,
+    })
+
+    hour = _hour_of(row.get("timestamp", ""))
+    if hour is not None:
+        _upsert(conn, hour_stats_table, {"position": position, "hour": hour}, {"candidates": sign})
+
+    for skill in set(_split_skills(row.get("skills", ""))):
+        _upsert(conn, skill_stats_table, {"position": position, "skill": skill}, {"candidates": sign})
+
+
+def clear_aggregates(conn) -> None:
+    for table in (position_stats_table, hour_stats_table, skill_stats_table):
+        conn.execute(delete(table))
+
+
+def load_summary() -> Dict:
+    """Dashboard figures read from the aggregate tables only"""
+    with get_engine().connect() as conn:
+        positions = pd.DataFrame(
+            conn.execute(select(
+                position_stats_table.c.position,
+                position_stats_table.c.candidates,
+                position_stats_table.c.score_sum,
+                position_stats_table.c.successes,
+            ).where(position_stats_table.c.candidates > 0).order_by(position_stats_table.c.position)).all(),
+            columns=["Position", "Candidates", "Score Sum", "Successes"],
+        )
+        hours = dict(conn.execute(
+            select(hour_stats_table.c.hour, func.sum(hour_stats_table.c.candidates))
+            .group_by(hour_stats_table.c.hour)
+            .having(func.sum(hour_stats_table.c.candidates) > 0)
+            .order_by(hour_stats_table.c.hour)
+        ).all())
+        total_skill = func.sum(skill_stats_table.c.candidates)
+        skills = dict(conn.execute(
+            select(skill_stats_table.c.skill, total_skill)
+            .group_by(skill_stats_table.c.skill)
+            .having(total_skill > 0)
+            .order_by(total_skill.desc(), skill_stats_table.c.skill)
+            .limit(TOP_SKILLS)
+        ).all())
+
+    candidates = int(positions["Candidates"].sum()) if not positions.empty else 0
+    score_sum = float(positions["Score Sum"].sum()) if not positions.empty else 0.0
+    successes = int(positions["Successes"].sum()) if not positions.empty else 0
+    if not positions.empty:
+        positions["Average Score"] = (positions["Score Sum"] / positions["Candidates"]).round(1)
+        positions["Success Rate"] = (positions["Successes"] / positions["Candidates"] * 100).round(1)
+        positions = positions.drop(columns=["Score Sum", "Successes"])
+
+    return {
+        "candidates": candidates,
+        "average_score": score_sum / candidates if candidates else 0.0,
+        "success_rate": successes / candidates * 100 if candidates else 0.0,
+        "hours": hours,
+        "top_skills": skills,
+        "positions": positions,
+    }
+
+
+def _snapshot(conn) -> Dict:
+    return {
+        "positions": {
+            row.position: (row.candidates, round(row.score_sum, 6), row.successes)
+            for row in conn.execute(select(position_stats_table)) if row.candidates
+        },
+        "hours": {
+            (row.position, row.hour): row.candidates
+            for row in conn.execute(select(hour_stats_table)) if row.candidates
+        },
+        "skills": {
+            (row.position, row.skill): row.candidates
+            for row in conn.execute(select(skill_stats_table)) if row.candidates
+        },
+    }
+
+
+def rebuild_aggregates() -> Dict:
+    """Recompute every aggregate from the raw results and report what drifted"""
+    positions = defaultdict(lambda: [0, 0.0, 0])
+    hours = Counter()
+    skills = Counter()
+
+    with get_engine().begin() as conn:
+        # Take the write lock before the scan: pysqlite would only begin at the first write,
+        # and a result appended in between would be missing from the rebuilt aggregates
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        before = _snapshot(conn)
+        rows = conn.execute(select(
+            results_table.c.position, results_table.c.resume_score,
+            results_table.c.timestamp, results_table.c.skills,
+        )).yield_per(REBUILD_CHUNK_SIZE)
+        for position, score, timestamp, skill_list in rows:
+            score = float(score or 0)
+            stats = positions[position]
+            stats[0] += 1
+            stats[1] += score
+            stats[2] += int(score >= SUCCESS_THRESHOLD)
+            hour = _hour_of(timestamp)
+            if hour is not None:
+                hours[(position, hour)] += 1
+            for skill in set(_split_skills(skill_list)):
+                skills[(position, skill)] += 1
+
+        clear_aggregates(conn)
+        if positions:
+            conn.execute(insert(position_stats_table), [
+                {"position": p, "candidates": c, "score_sum": s, "successes": w}
+                for p, (c, s, w) in positions.items()
+            ])
+        if hours:
+            conn.execute(insert(hour_stats_table), [
+                {"position": p, "hour": h, "candidates": c} for (p, h), c in hours.items()
+            ])
+        if skills:
+            conn.execute(insert(skill_stats_table), [
+                {"position": p, "skill": s, "candidates": c} for (p, s), c in skills.items()
+            ])
+        after = _snapshot(conn)
+
+    return {
+        section: sum(
+            1 for key in set(before[section]) | set(after[section])
+            if before[section].get(key) != after[section].get(key)
+        )
+        for section in after
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard aggregate maintenance")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild aggregates from the raw results")
+    args = parser.parse_args()
+    if args.rebuild:
+        drift = rebuild_aggregates()
+        print("Rebuilt analytics aggregates; entries corrected: " +
+              ", ".join(f"{section}={count}" for section, count in drift.items()))
+    else:
+        summary = load_summary()
+        print(f"{summary['candidates']} candidates, average score {summary['average_score']:.1f}%")
@@ -0,0 +1,241 @@
+"""Keyword coverage of interview answers
+
+Each question lists the key points an answer should cover. A keyword
+counts as covered when the answer contains it, or one of its synonyms
+from the position's "keyword_synonyms", as whole words after light
+stemming ("models" covers "modeling", "imputing" covers "imputation",
+"k fold" covers "k-fold").
+
+Coverage is stored with every answer. When the admin panel edits a
+question's keywords or the position's synonyms, the stored answers to
+the affected questions are re-scored in the background.
+"""
+import re
+import threading
+import time
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, select, update
+
+from backend.data_manager import get_positions_snapshot, on_positions_saved
+from backend.db import answers_table, get_engine, interviews_table
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+ANSWER_RESCORE_CHUNK_SIZE = 500
+
+
+def stem(token: str) -> str:
+    """Light suffix stemmer: plurals, -ation/-ion/-ing/-ed/-ly, a trailing e and a doubled final consonant"""
+    if len(token) <= 3:
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith(("sses", "shes", "ches", "xes", "zes")):
+        token = token[:-2]
+    elif token.endswith("ses") and token[-5:-3] in ("as", "us", "is"):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is", "as")):
+        token = token[:-1]
+
+    for suffix in ("ation", "ion", "ing", "ed", "ly"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)]
+            break
+    if token.endswith("e") and len(token) > 3:
+        token = token[:-1]
+    # Undouble whether or not a suffix came off, so "process" and "processing" meet at "proces"
+    if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "aeiou":
+        token = token[:-1]
+    return token
+
+
+def stem_phrase(text: str) -> Tuple[str, ...]:
+    return tuple(stem(token) for token in _TOKEN.findall(text.lower()))
+
+
+class KeywordScorer:
+    """Precompiled keyword set of one question, scored in a single pass over the answer"""
+
+    def __init__(self, keywords: Sequence[str], synonyms: Optional[Dict[str, List[str]]] = None):
+        self.keywords = [k for k in keywords if k and k.strip()]
+        synonyms = {key.strip().lower(): values for key, values in (synonyms or {}).items()}
+        # first stem of a phrase -> [(keyword index, stemmed phrase)]
+        self._by_first: Dict[str, list] = defaultdict(list)
+        for index, keyword in enumerate(self.keywords):
+            for variant in [keyword] + list(synonyms.get(keyword.strip().lower(), [])):
+                phrase = stem_phrase(variant)
+                if phrase:
+                    self._by_first[phrase[0]].append((index, phrase))
+
+    def score(self, answer: str) -> Tuple[List[str], List[str], float]:
+        """(covered keywords, missing keywords, coverage %)"""
+        stems = stem_phrase(answer)
+        covered = set()
+        for position, token in enumerate(stems):
+            for index, phrase in self._by_first.get(token, ()):
+                if index not in covered and stems[position:position + len(phrase)] == phrase:
+                    covered.add(index)
+            if len(covered) == len(self.keywords):
+                break
+        found = [k for i, k in enumerate(self.keywords) if i in covered]
+        missing = [k for i, k in enumerate(self.keywords) if i not in covered]
+        coverage = round(len(found) / len(self.keywords) * 100, 1) if self.keywords else 0.0
+        return found, missing, coverage
+
+
+# (position, config version, keywords) -> scorer; stale versions are dropped on the next build
+_scorers: Dict[Tuple[str, int, Tuple[str, ...]], KeywordScorer] = {}
+_scorers_lock = Lock()
+
+
+def get_keyword_scorer(position: str, keywords: Sequence[str]) -> KeywordScorer:
+    """Cached scorer for a question's keywords with the position's current synonyms"""
+    positions, version = get_positions_snapshot()
+    key = (position, version, tuple(keywords))
+    scorer = _scorers.get(key)
+    if scorer is None:
+        scorer = KeywordScorer(keywords, positions.get(position, {}).get("keyword_synonyms"))
+        with _scorers_lock:
+            for stale in [k for k in _scorers if k[1] != version]:
+                del _scorers[stale]
+            _scorers[key] = scorer
+    return scorer
+
+
+def _question_keywords(config: Dict) -> Dict[str, List[str]]:
+    return {question: keywords for question, keywords in config.get("technical", []) + config.get("behavioral", [])}
+
+
+def keywords_changed(previous: Dict, positions: Dict) -> Dict[str, List[str]]:
+    """Position -> questions whose keywords (or the position's synonyms) differ between two configs"""
+    changed = {}
+    for position, config in positions.items():
+        if position not in previous:
+            continue
+        old, new = _question_keywords(previous[position]), _question_keywords(config)
+        if previous[position].get("keyword_synonyms") != config.get("keyword_synonyms"):
+            questions = list(new)
+        else:
+            questions = [q for q, keywords in new.items() if q in old and old[q] != keywords]
+        if questions:
+            changed[position] = questions
+    return changed
+
+
+class AnswerRescoreJob:
+    """Background re-scoring of the stored answers to some questions of one position"""
+
+    def __init__(self, position: str, config: Dict, questions: List[str],
+                 previous: Optional["AnswerRescoreJob"] = None):
+        self.position = position
+        self.status = "queued"
+        self.total = 0
+        self.done = 0
+        self.updated = 0
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+        self.questions = list(questions)
+        self._cancelled = threading.Event()
+        self._keywords = {q: k for q, k in _question_keywords(config).items() if q in set(questions)}
+        self._synonyms = config.get("keyword_synonyms")
+        self._previous = previous
+        self._thread = threading.Thread(target=self._run, name=f"answer-rescore-{position}", daemon=True)
+
+    @property
+    def progress(self) -> float:
+        return self.done / self.total if self.total else (1.0 if self.finished_at else 0.0)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def join(self, timeout: Optional[float] = None):
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            if self._previous is not None:
+                self._previous.join()  # its last chunk must not land after ours
+                self._previous = None
+            self.status = "running"
+            self._rescore()
+            self.status = "superseded" if self._cancelled.is_set() else "completed"
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+
+    def _rescore(self):
+        scorers = {q: KeywordScorer(k, self._synonyms) for q, k in self._keywords.items()}
+        with get_engine().connect() as conn:
+            rows = conn.execute(
+                select(
+                    answers_table.c.interview_id, answers_table.c.question_index, answers_table.c.question,
+                    answers_table.c.answer, answers_table.c.coverage, answers_table.c.keywords_found,
+                )
+                .join(interviews_table, interviews_table.c.interview_id == answers_table.c.interview_id)
+                .where(interviews_table.c.position == self.position)
+                .where(answers_table.c.question.in_(list(scorers)))
+            ).all()
+        self.total = len(rows)
+
+        stmt = (
+            update(answers_table)
+            .where(answers_table.c.interview_id == bindparam("b_interview_id"))
+            .where(answers_table.c.question_index == bindparam("b_question_index"))
+            .values(coverage=bindparam("b_coverage"), keywords_found=bindparam("b_keywords_found"))
+        )
+        for start in range(0, len(rows), ANSWER_RESCORE_CHUNK_SIZE):
+            if self._cancelled.is_set():
+                return
+            changes = []
+            for row in rows[start:start + ANSWER_RESCORE_CHUNK_SIZE]:
+                found, _, coverage = scorers[row.question].score(row.answer)
+                keywords_found = ", ".join(found)
+                if coverage != row.coverage or keywords_found != row.keywords_found:
+                    changes.append({
+                        "b_interview_id": row.interview_id, "b_question_index": row.question_index,
+                        "b_coverage": coverage, "b_keywords_found": keywords_found,
+                    })
+            if changes:
+                with get_engine().begin() as conn:
+                    conn.execute(stmt, changes)
+            self.updated += len(changes)
+            self.done = min(start + ANSWER_RESCORE_CHUNK_SIZE, len(rows))
+
+
+_jobs: Dict[str, AnswerRescoreJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def start_answer_rescore(position: str, config: Dict, questions: List[str]) -> AnswerRescoreJob:
+    """Re-score answers to questions of a position, taking over the questions of a job still running"""
+    with _jobs_lock:
+        previous = _jobs.get(position)
+        if previous is not None and previous.finished_at is None:
+            previous.cancel()
+            questions = list(dict.fromkeys(questions + previous.questions))
+        else:
+            previous = None
+        job = AnswerRescoreJob(position, config, questions, previous)
+        _jobs[position] = job
+    job.start()
+    return job
+
+
+def get_answer_rescore_jobs() -> Dict[str, AnswerRescoreJob]:
+    with _jobs_lock:
+        return dict(_jobs)
+
+
+def _on_positions_saved(previous: Dict, positions: Dict) -> None:
+    for position, questions in keywords_changed(previous, positions).items():
+        start_answer_rescore(position, positions[position], questions)
+
+
+on_positions_saved(_on_positions_saved)
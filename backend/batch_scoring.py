@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.analysis_engine import EXPERIENCE_PATTERN, NON_ASCII_PATTERN
+from backend.data_manager import get_positions
+from backend.skill_matcher import SkillMatcher
+
+ROWS_PER_BLOCK = 1024
+
+
+@dataclass
+class EncodedResume:
+    """Skill occurrence counts of one resume over the scorer's union vocabulary"""
+    terms: np.ndarray
+    counts: np.ndarray
+    experience: int
+    # set only when occurrences overlap, for the exact per-position fix-up
+    occurrences: Optional[List[Tuple[int, int, int]]] = None
+    overlapping_pairs: Optional[List[Tuple[int, int]]] = None
+
+
+class BatchScorer:
+    """Score many resumes against many positions with matrix operations
+
+    Each resume is tokenized once over the union of every position's
+    skills. Scores come from (resumes x terms) @ (terms x positions) weight
+    matrices and match analyze_resume exactly. The rare resumes whose skill
+    mentions overlap (e.g. "Machine Learning" when another position lists
+    "Learning") are corrected per affected position with the same
+    leftmost, first-listed-wins rule the scalar matcher applies.
+    """
+
+    def __init__(self, positions: Optional[Dict] = None):
+        positions = positions if positions is not None else get_positions()
+        self.position_names = list(positions)
+
+        vocabulary: Dict[str, int] = {}
+        for config in positions.values():
+            for skill in config["required_skills"] + config["preferred_skills"]:
+                if skill:
+                    vocabulary.setdefault(skill.lower(), len(vocabulary))
+        self.vocabulary = list(vocabulary)
+        self._matcher = SkillMatcher(self.vocabulary, [])
+
+        n_terms, n_positions = len(self.vocabulary), len(self.position_names)
+        self.required_weights = np.zeros((n_terms, n_positions), dtype=np.float32)
+        self.preferred_weights = np.zeros((n_terms, n_positions), dtype=np.float32)
+        self.membership = np.zeros((n_positions, n_terms), dtype=bool)
+        self.required_counts = np.zeros(n_positions)
+        self.preferred_counts = np.zeros(n_positions)
+        # per position: term -> priority (first listing wins, as in the regex alternation)
+        self._priorities: List[Dict[int, int]] = []
+
+        for p, name in enumerate(self.position_names):
+            config = positions[name]
+            required, preferred = config["required_skills"], config["preferred_skills"]
+            self.required_counts[p] = len(required)
+            self.preferred_counts[p] = len(preferred)
+            priorities: Dict[int, int] = {}
+            for priority, skill in enumerate(s for s in required + preferred if s):
+                term = vocabulary[skill.lower()]
+                if term in priorities:
+                    continue
+                priorities[term] = priority
+                self.membership[p, term] = True
+                normalized = skill.strip().title()
+                self.required_weights[term, p] = normalized in required
+                self.preferred_weights[term, p] = normalized in preferred
+            self._priorities.append(priorities)
+
+    def encode(self, text: str) -> EncodedResume:
+        """Tokenize one resume into its sparse term-count vector"""
+        sanitized_text = NON_ASCII_PATTERN.sub(' ', text)
+        exp_match = EXPERIENCE_PATTERN.search(sanitized_text)
+        experience = int(exp_match.group(1)) if exp_match else 0
+
+        occurrences = sorted(self._matcher.occurrences(sanitized_text.lower()))
+        terms, counts = np.unique(
+            np.fromiter((index for _, _, index in occurrences), dtype=np.int64, count=len(occurrences)),
+            return_counts=True,
+        )
+        encoded = EncodedResume(terms, counts, experience)
+
+        pairs = set()
+        for i, (start, end, term) in enumerate(occurrences):
+            for other_start, _, other_term in occurrences[i + 1:]:
+                if other_start >= end:
+                    break
+                pairs.add((term, other_term))
+        if pairs:
+            encoded.occurrences = occurrences
+            encoded.overlapping_pairs = sorted(pairs)
+        return encoded
+
+    def encode_all(self, texts: Iterable[str]) -> List[EncodedResume]:
+        return [self.encode(text) for text in texts]
+
+    def _greedy_counts(self, encoded: EncodedResume, p: int) -> Tuple[int, int]:
+        """(required, preferred) match counts for one position via the scalar matching rule"""
+        priorities = self._priorities[p]
+        occurrences = [o for o in encoded.occurrences if o[2] in priorities]
+        required = preferred = 0
+        cursor = 0
+        i = 0
+        while i < len(occurrences):
+            start = occurrences[i][0]
+            best = occurrences[i]
+            i += 1
+            while i < len(occurrences) and occurrences[i][0] == start:
+                if priorities[occurrences[i][2]] < priorities[best[2]]:
+                    best = occurrences[i]
+                i += 1
+            if start >= cursor:
+                cursor = best[1]
+                required += int(self.required_weights[best[2], p])
+                preferred += int(self.preferred_weights[best[2], p])
+        return required, preferred
+
+    def match_counts(self, encoded: List[EncodedResume]) -> Tuple[np.ndarray, np.ndarray]:
+        """(resumes x positions) required and preferred match counts"""
+        n_terms, n_positions = len(self.vocabulary), len(self.position_names)
+        required = np.empty((len(encoded), n_positions))
+        preferred = np.empty((len(encoded), n_positions))
+        for block_start in range(0, len(encoded), ROWS_PER_BLOCK):
+            block = encoded[block_start:block_start + ROWS_PER_BLOCK]
+            counts = np.zeros((len(block), n_terms), dtype=np.float32)
+            lengths = [len(e.terms) for e in block]
+            if sum(lengths):
+                rows = np.repeat(np.arange(len(block)), lengths)
+                counts[rows, np.concatenate([e.terms for e in block])] = np.concatenate([e.counts for e in block])
+            block_slice = slice(block_start, block_start + len(block))
+            required[block_slice] = counts @ self.required_weights
+            preferred[block_slice] = counts @ self.preferred_weights
+
+        for row, e in enumerate(encoded):
+            if not e.overlapping_pairs:
+                continue
+            affected = np.zeros(n_positions, dtype=bool)
+            for a, b in e.overlapping_pairs:
+                affected |= self.membership[:, a] & self.membership[:, b]
+            for p in np.flatnonzero(affected):
+                required[row, p], preferred[row, p] = self._greedy_counts(e, p)
+        return required, preferred
+
+    def score(self, encoded: List[EncodedResume]) -> np.ndarray:
+        """(resumes x positions) resume_score matrix, identical to analyze_resume"""
+        required, preferred = self.match_counts(encoded)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            base = np.where(self.required_counts > 0, required / self.required_counts * 100, 0)
+            bonus = np.where(self.preferred_counts > 0, preferred / self.preferred_counts * 20, 0)
+        return round_half_even(np.clip(base + bonus, 0, 100))
+
+    def score_texts(self, texts: Iterable[str]) -> np.ndarray:
+        return self.score(self.encode_all(texts))
+
+
+def round_half_even(scores: np.ndarray) -> np.ndarray:
+    """np.round(x, 1) with Python's round() semantics for values near a .x5 tie"""
+    rounded = np.round(scores, 1)
+    scaled = scores * 10
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in zip(*np.nonzero(near_tie)):
+        rounded[index] = round(float(scores[index]), 1)
+    return rounded
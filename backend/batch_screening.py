@@ -0,0 +1,239 @@
+"""Headless bulk resume screening
+
+Usage:
+    python -m backend.batch_screening RESUMES (directory or .zip) --position "Data Scientist"
+        [--position ...] [--output scored.jsonl | scored.parquet] [--workers N]
+
+Every PDF/DOCX is parsed and scored against each requested position in a
+process pool. Results are written as they complete, and at most
+``workers * IN_FLIGHT_PER_WORKER`` documents are held in memory at once.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from backend.analysis_engine import DOCX_MIME, PDF_MIME, analyze_resume, extract_text, iter_resume_text
+from backend.parse_cache import cached_extract
+from config.settings import MAX_FILE_SIZE_MB
+
+MIME_TYPES = {".pdf": PDF_MIME, ".docx": DOCX_MIME}
+IN_FLIGHT_PER_WORKER = 4
+PARQUET_BATCH_SIZE = 1000
+PROGRESS_EVERY = 500
+
+# (archive path or None, file path / archive member)
+Task = Tuple[Optional[str], str]
+
+
+def iter_tasks(source: str) -> Iterator[Task]:
+    """Resume files found in a directory tree or a zip archive"""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for member in archive.namelist():
+                if os.path.splitext(member)[1].lower() in MIME_TYPES:
+                    yield source, member
+        return
+
+    for root, _, files in os.walk(source):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in MIME_TYPES:
+                yield None, os.path.join(root, name)
+
+
+def _size(task: Task) -> int:
+    archive_path, name = task
+    if archive_path:
+        with zipfile.ZipFile(archive_path) as archive:
+            return archive.getinfo(name).file_size
+    return os.path.getsize(name)
+
+
+def _read(task: Task) -> bytes:
+    archive_path, name = task
+    if archive_path:
+        with zipfile.ZipFile(archive_path) as archive:
+            return archive.read(name)
+    with open(name, "rb") as f:
+        return f.read()
+
+
+def screen_resume(task: Task, positions: List[str], early_stop: bool = False) -> Dict:
+    """Parse one resume and score it against every position (runs in a worker)
+
+    With early_stop the document is streamed page by page and extraction
+    ends once every position's score has reached its cap; the text is
+    then not cached.
+    """
+    name = task[1]
+    record = {"file": name, "error": None, "timings": {}}
+    try:
+        if _size(task) > MAX_FILE_SIZE_MB * 1024 * 1024:
+            record["error"] = f"File too large. Max size: {MAX_FILE_SIZE_MB}MB"
+            return record
+        start = time.perf_counter()
+        data = _read(task)
+        record["timings"]["read"] = time.perf_counter() - start
+
+        file_type = MIME_TYPES[os.path.splitext(name)[1].lower()]
+        if early_stop:
+            start = time.perf_counter()
+            streams = itertools.tee(iter_resume_text(data, file_type), len(positions))
+            record["scores"] = {
+                position: analyze_resume(stream, position, stop_when_saturated=True)
+                for position, stream in zip(positions, streams)
+            }
+            record["timings"]["stream"] = time.perf_counter() - start
+            return record
+
+        start = time.perf_counter()
+        text = cached_extract(data, file_type, extract_text)
+        record["timings"]["parse"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        record["scores"] = {position: analyze_resume(text, position) for position in positions}
+        record["timings"]["analyze"] = time.perf_counter() - start
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+class JsonlWriter:
+    def __init__(self, path: str):
+        self._file = sys.stdout if path == "-" else open(path, "w")
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class ParquetWriter:
+    """Flat one-row-per-(file, position) Parquet output, written in row groups"""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow (pip install pyarrow)")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._path = path
+        self._writer = None
+        self._rows: List[Dict] = []
+
+    def write(self, record: Dict):
+        for position, result in (record.get("scores") or {None: {}}).items():
+            self._rows.append({
+                "file": record["file"],
+                "position": position,
+                "resume_score": result.get("resume_score"),
+                "experience": result.get("experience"),
+                "skills": ", ".join(result.get("skills", [])),
+                "required_matches": len(result.get("required_matches", [])),
+                "preferred_matches": len(result.get("preferred_matches", [])),
+                "error": record["error"],
+            })
+        if len(self._rows) >= PARQUET_BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        table = self._pa.Table.from_pylist(self._rows)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def check_positions(positions: List[str]) -> None:
+    """Raise ValueError naming any position missing from the position config"""
+    from backend.data_manager import get_positions
+
+    unknown = [position for position in positions if position not in get_positions()]
+    if unknown:
+        raise ValueError(f"Unknown position(s): {', '.join(unknown)}")
+
+
+def run_batch(source: str, positions: List[str], writer, workers: int, early_stop: bool = False) -> Dict:
+    """Screen every resume under source, streaming records to writer; returns run statistics"""
+    check_positions(positions)  # before any worker starts, not once per failed record
+    stats = {"resumes": 0, "errors": 0, "stage_seconds": {}}
+    started = time.perf_counter()
+    tasks = iter_tasks(source)
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                task = next(tasks, None)
+                if task is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(screen_resume, task, positions, early_stop))
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                writer.write(record)
+                stats["resumes"] += 1
+                stats["errors"] += int(record["error"] is not None)
+                for stage, seconds in record["timings"].items():
+                    stats["stage_seconds"][stage] = stats["stage_seconds"].get(stage, 0.0) + seconds
+                if stats["resumes"] % PROGRESS_EVERY == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"{stats['resumes']} resumes, {stats['resumes'] / elapsed:.1f}/s", file=sys.stderr)
+
+    stats["elapsed_seconds"] = time.perf_counter() - started
+    stats["resumes_per_second"] = stats["resumes"] / stats["elapsed_seconds"] if stats["elapsed_seconds"] else 0.0
+    stats["stage_mean_ms"] = {
+        stage: seconds / stats["resumes"] * 1000 if stats["resumes"] else 0.0
+        for stage, seconds in stats["stage_seconds"].items()
+    }
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Bulk resume screening")
+    parser.add_argument("source", help="directory or zip archive of PDF/DOCX resumes")
+    parser.add_argument("--position", action="append", required=True, help="position to score against (repeatable)")
+    parser.add_argument("--output", default="-", help="output .jsonl or .parquet file (default: JSONL on stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--early-stop", action="store_true",
+                        help="stream pages and stop once every score is capped (uncached, same scores)")
+    args = parser.parse_args(argv)
+    try:
+        check_positions(args.position)
+    except ValueError as e:
+        parser.error(str(e))
+
+    writer = ParquetWriter(args.output) if args.output.endswith(".parquet") else JsonlWriter(args.output)
+    try:
+        stats = run_batch(args.source, args.position, writer, max(1, args.workers), args.early_stop)
+    finally:
+        writer.close()
+
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
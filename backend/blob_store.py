@@ -0,0 +1,321 @@
+"""Content-addressed resume storage
+
+Every uploaded resume is stored once, gzip-compressed, under its SHA-256
+content hash in a two-level hash-prefix layout (``ab/cd/abcd....gz``), so
+no directory holds more than a few dozen files even at millions of
+resumes. Writing content that is already stored only refreshes the
+blob's mtime. A small index file keeps the blob count and the original
+and stored byte totals, so counting resumes never lists a directory.
+
+Blobs that no interview record (completed or in progress) refers to are
+removed by collect_garbage once they are older than a grace period, which
+covers uploads whose interview has not started yet. Resumes saved by
+earlier versions as loose files are moved in with migrate_directory or
+``python -m backend.blob_store --migrate``; results saved back then carry
+no resume hash, so migrated blobs are pinned and never collected.
+
+Several processes may write one store: a blob is published with an
+exclusive link, so only the first writer of some content counts it, and
+the index file is re-read and rewritten under a file lock.
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from backend.file_lock import file_lock
+from backend.metrics import increment, timed
+from backend.parse_cache import content_hash
+from config.settings import BLOB_COMPRESS_LEVEL, BLOB_GC_GRACE_HOURS, RESUMES_DIR
+
+INDEX_FILE = "index.json"
+PINS_FILE = "pinned.txt"
+LOCK_FILE = "index.lock"
+_METADATA = {INDEX_FILE, PINS_FILE, LOCK_FILE}
+_SHARD = re.compile(r'^[0-9a-f]{2}$')
+_BLOB = re.compile(r'^[0-9a-f]{64}\.gz$')
+
+
+def sniff_type(data: bytes) -> Optional[str]:
+    """MIME type of a stored resume from its leading bytes (blobs keep no file name)"""
+    from backend.analysis_engine import DOCX_MIME, PDF_MIME
+
+    if data.startswith(b"%PDF"):
+        return PDF_MIME
+    if data.startswith(b"PK\x03\x04"):
+        return DOCX_MIME
+    return None
+
+
+class BlobStore:
+    """Compressed blobs keyed by content hash, sharded by hash prefix, with a count/size index file"""
+
+    def __init__(self, directory: str, compress_level: int = BLOB_COMPRESS_LEVEL):
+        self.directory = directory
+        self.compress_level = compress_level
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:4], f"{key}.gz")
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    @timed("blob_store_put")
+    def put(self, data: bytes, key: Optional[str] = None) -> str:
+        """Store data (once per distinct content) and return its content hash"""
+        key = key or content_hash(data)
+        path = self.path(key)
+        if os.path.exists(path):
+            os.utime(path)  # a fresh reference restarts the garbage-collection grace period
+            increment("blob_store_dedup")
+            return key
+
+        shard = os.path.dirname(path)
+        os.makedirs(shard, exist_ok=True)
+        compressed = gzip.compress(data, compresslevel=self.compress_level, mtime=0)
+        fd, tmp_path = tempfile.mkstemp(dir=shard, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.link(tmp_path, path)  # fails if a concurrent writer stored the same content first
+        except FileExistsError:
+            os.utime(path)
+            increment("blob_store_dedup")
+            return key
+        finally:
+            os.remove(tmp_path)
+        self._update(1, len(data), len(compressed))
+        return key
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self.path(key), "rb") as f:
+                return gzip.decompress(f.read())
+        except FileNotFoundError:
+            return None
+
+    def keys(self) -> Iterator[str]:
+        """Every stored content hash, shard by shard"""
+        for first in self._shards(self.directory):
+            for second in self._shards(first):
+                for entry in os.scandir(second):
+                    if _BLOB.match(entry.name):
+                        yield entry.name[:-3]
+
+    @staticmethod
+    def _shards(directory: str) -> Iterator[str]:
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if _SHARD.match(entry.name) and entry.is_dir():
+                yield entry.path
+
+    # ----------------- Index file -----------------
+
+    def stats(self) -> Dict[str, int]:
+        """Blob count and original/stored byte totals, from the index file (rebuilt if missing)"""
+        stats = self._read_index()
+        if stats is None:
+            with file_lock(os.path.join(self.directory, LOCK_FILE)):
+                stats = self._read_index()
+                if stats is None:
+                    stats = self._scan()
+                    self._write_index(stats)
+        return stats
+
+    def rebuild_index(self) -> Dict[str, int]:
+        """Recount the blobs on disk, e.g. after blobs were copied in or removed by hand"""
+        with file_lock(os.path.join(self.directory, LOCK_FILE)):
+            stats = self._scan()
+            self._write_index(stats)
+        return stats
+
+    def _update(self, blobs: int, original: int, stored: int) -> None:
+        with file_lock(os.path.join(self.directory, LOCK_FILE)):
+            stats = self._read_index()
+            if stats is None:
+                stats = self._scan()  # already includes the change
+            else:
+                stats["blobs"] += blobs
+                stats["bytes"] += original
+                stats["stored_bytes"] += stored
+            self._write_index(stats)
+
+    def _read_index(self) -> Optional[Dict[str, int]]:
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                index = json.load(f)
+            return {name: index[name] for name in ("blobs", "bytes", "stored_bytes")}
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def _write_index(self, stats: Dict[str, int]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({**stats, "updated": int(time.time())}, f)
+        os.replace(tmp_path, os.path.join(self.directory, INDEX_FILE))
+
+    def _scan(self) -> Dict[str, int]:
+        stats = {"blobs": 0, "bytes": 0, "stored_bytes": 0}
+        for key in self.keys():
+            stats["blobs"] += 1
+            stats["stored_bytes"] += os.path.getsize(self.path(key))
+            stats["bytes"] += _original_size(self.path(key))
+        return stats
+
+    # ----------------- Pins -----------------
+
+    def pin(self, keys: Iterable[str]) -> None:
+        """Keep blobs out of garbage collection for good (resumes no record can be traced to)"""
+        keys = list(keys)
+        if keys:
+            with file_lock(os.path.join(self.directory, LOCK_FILE)):
+                with open(os.path.join(self.directory, PINS_FILE), "a", encoding="utf-8") as f:
+                    f.writelines(f"{key}\n" for key in keys)
+
+    def pinned(self) -> Set[str]:
+        try:
+            with open(os.path.join(self.directory, PINS_FILE), "r", encoding="utf-8") as f:
+                return {line.strip() for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+
+    # ----------------- Garbage collection -----------------
+
+    @timed("blob_store_gc")
+    def collect_garbage(self, grace_hours: float = BLOB_GC_GRACE_HOURS, dry_run: bool = False) -> Dict[str, int]:
+        """Remove unpinned blobs no interview record refers to that are older than grace_hours; returns counts"""
+        from backend.results_store import referenced_resume_hashes
+
+        pinned = self.pinned()
+        kept = referenced_resume_hashes() | pinned
+        cutoff = time.time() - grace_hours * 3600
+        result = {"scanned": 0, "removed": 0, "freed_bytes": 0, "pinned": len(pinned)}
+        original_bytes = 0
+        for key in list(self.keys()):
+            result["scanned"] += 1
+            if key in kept:
+                continue
+            path = self.path(key)
+            try:
+                stored = os.stat(path)
+                if stored.st_mtime > cutoff:
+                    continue
+                original = _original_size(path)
+                if not dry_run:
+                    os.remove(path)
+            except FileNotFoundError:
+                continue
+            result["removed"] += 1
+            result["freed_bytes"] += stored.st_size
+            original_bytes += original
+        if result["removed"] and not dry_run:
+            self._update(-result["removed"], -original_bytes, -result["freed_bytes"])
+        return result
+
+
+def _original_size(path: str) -> int:
+    """Uncompressed size recorded in the gzip trailer (ISIZE, modulo 2**32)"""
+    with open(path, "rb") as f:
+        f.seek(-4, os.SEEK_END)
+        return int.from_bytes(f.read(4), "little")
+
+
+_store = BlobStore(RESUMES_DIR)
+
+
+def get_blob_store() -> BlobStore:
+    return _store
+
+
+def _loose_files(directory: str) -> Iterator[Tuple[str, bytes, str]]:
+    """(path, content, MIME type) of resumes saved as plain files, outside the hash-prefix shards"""
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [name for name in dirs if not _SHARD.match(name)]
+        for name in sorted(files):
+            if name in _METADATA or name.endswith(".tmp"):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            # Earlier versions named DOCX files after the full MIME subtype, so go by content
+            file_type = sniff_type(data)
+            if file_type is not None:
+                yield path, data, file_type
+
+
+def iter_documents(directory: str = RESUMES_DIR) -> Iterator[Tuple[str, bytes, str]]:
+    """(content hash, content, MIME type) of every resume in the store rooted at directory, loose files included"""
+    store = _store if os.path.abspath(directory) == os.path.abspath(_store.directory) else BlobStore(directory)
+    for key in store.keys():
+        data = store.get(key)
+        file_type = sniff_type(data) if data is not None else None
+        if file_type is not None:
+            yield key, data, file_type
+    for _, data, file_type in _loose_files(directory):
+        yield content_hash(data), data, file_type
+
+
+def migrate_directory(directory: str = RESUMES_DIR) -> Dict[str, int]:
+    """Move loose resume files under directory into the blob store and repoint in-progress interviews
+
+    The moved blobs are pinned: results saved before resumes were hashed
+    cannot be traced to them, so garbage collection must never take them.
+    """
+    from sqlalchemy import update
+    from backend.db import get_engine, interviews_table
+
+    stats = {"files": 0, "stored": 0, "duplicates": 0}
+    moved = []
+    for path, data, _ in _loose_files(directory):
+        stats["files"] += 1
+        key = content_hash(data)
+        stats["duplicates" if _store.exists(key) else "stored"] += 1
+        _store.put(data, key)
+        moved.append((path, key))
+    _store.pin(key for _, key in moved)
+
+    with get_engine().begin() as conn:
+        for path, key in moved:
+            conn.execute(
+                update(interviews_table)
+                .where(interviews_table.c.resume_path == path)
+                .values(resume_path=_store.path(key))
+            )
+    for path, _ in moved:
+        os.remove(path)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the content-addressed resume store")
+    parser.add_argument("--migrate", action="store_true", help="move loose resume files into the store first")
+    parser.add_argument("--gc", action="store_true", help="remove blobs no interview record refers to")
+    parser.add_argument("--grace-hours", type=float, default=BLOB_GC_GRACE_HOURS)
+    parser.add_argument("--dry-run", action="store_true", help="report what --gc would remove")
+    parser.add_argument("--rebuild-index", action="store_true", help="recount the blobs on disk")
+    args = parser.parse_args()
+
+    if args.migrate:
+        print(json.dumps({"migrate": migrate_directory()}))
+    if args.gc:
+        result = _store.collect_garbage(args.grace_hours, args.dry_run)
+        if result["pinned"]:
+            print(f"Note: {result['pinned']} resumes moved in by --migrate are pinned and never collected "
+                  f"(remove them from {os.path.join(_store.directory, PINS_FILE)} to release them)", file=sys.stderr)
+        print(json.dumps({"gc": result}))
+    if args.rebuild_index:
+        _store.rebuild_index()
+    print(json.dumps({"stats": _store.stats()}))
+
+
+if __name__ == "__main__":
+    main()
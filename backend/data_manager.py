@@ -1,23 +1,95 @@
+import copy
 import json
 import os
-from typing import Dict
+import tempfile
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+from backend.metrics import increment, timed
+from config.settings import POSITIONS_FILE
 
-# Define the path to the positions file
-POSITIONS_FILE = "data/positions/positions.json"
+# Callbacks run after every save with (previous, saved) configs, e.g. to drop derived caches
+_save_listeners: List[Callable[[Dict, Dict], None]] = []
 
-def load_positions() -> Dict:
-    """Load position configurations from JSON file"""
-    if not os.path.exists(POSITIONS_FILE):
-        with open(POSITIONS_FILE, 'w') as f:
-            json.dump(default_positions(), f)
+# In-process copy of positions.json, revalidated against the file's mtime and size
+_cache_lock = Lock()
+_cached: Tuple[Optional[Dict], int] = (None, 0)  # (positions, version), replaced as one so readers never mix them
+_cached_stamp: Optional[Tuple[int, int]] = None
+
+def _stamp(stat_result) -> Tuple[int, int]:
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+def _write_atomic(positions: Dict) -> Tuple[int, int]:
+    """Write the config to a temp file and rename it over positions.json"""
+    directory = os.path.dirname(POSITIONS_FILE) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".positions-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(positions, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, POSITIONS_FILE)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return _stamp(os.stat(POSITIONS_FILE))
+
+def get_positions_snapshot() -> Tuple[Dict, int]:
+    """Shared (read-only) position config and its version
+
+    Costs one stat() when nothing changed; the file is re-read only after
+    a save or an external edit, which also bumps the version.
+    """
+    global _cached, _cached_stamp
+    try:
+        stamp = _stamp(os.stat(POSITIONS_FILE))
+    except FileNotFoundError:
+        with _cache_lock:
+            if not os.path.exists(POSITIONS_FILE):
+                _write_atomic(default_positions())
+        stamp = _stamp(os.stat(POSITIONS_FILE))
     
-    with open(POSITIONS_FILE, 'r') as f:
-        return json.load(f)
+    if stamp != _cached_stamp:
+        with _cache_lock:
+            if stamp != _cached_stamp:
+                with open(POSITIONS_FILE, 'r') as f:
+                    stamp = _stamp(os.fstat(f.fileno()))
+                    _cached = (json.load(f), _cached[1] + 1)
+                _cached_stamp = stamp
+                increment("positions_reload")
+    return _cached
+
+def get_positions() -> Dict:
+    """Shared position config for read-only hot paths; do not mutate"""
+    return get_positions_snapshot()[0]
 
+def get_positions_version() -> int:
+    """Counter bumped whenever the position config changes; key derived caches on it"""
+    return get_positions_snapshot()[1]
+
+@timed("load_positions")
+def load_positions() -> Dict:
+    """Load position configurations (an editable copy)"""
+    return copy.deepcopy(get_positions())
+
+@timed("save_positions")
 def save_positions(positions: Dict):
     """Save position configurations to JSON file"""
-    with open(POSITIONS_FILE, 'w') as f:
-        json.dump(positions, f, indent=2)
+    global _cached, _cached_stamp
+    previous = get_positions()
+    with _cache_lock:
+        stamp = _write_atomic(positions)
+        _cached = (copy.deepcopy(positions), _cached[1] + 1)
+        _cached_stamp = stamp
+    
+    for listener in _save_listeners:
+        listener(previous, positions)
+
+def on_positions_saved(listener: Callable[[Dict, Dict], None]):
+    """Register a callback invoked with the previous and new config after save_positions"""
+    if listener not in _save_listeners:
+        _save_listeners.append(listener)
 
 def default_positions() -> Dict:
     """Return default position configurations"""
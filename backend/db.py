@@ -0,0 +1,239 @@
+import os
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import (
+    Column, Float, Index, Integer, LargeBinary, MetaData, String, Table, Text,
+    create_engine, event, inspect, text,
+)
+from sqlalchemy.engine import Engine
+
+from config.settings import RESULTS_DB
+
+metadata = MetaData()
+
+results_table = Table(
+    "results",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String(255), nullable=False, default=""),
+    Column("email", String(255), nullable=False, default=""),
+    Column("position", String(255), nullable=False, default=""),
+    Column("experience", Integer, nullable=False, default=0),
+    Column("resume_score", Float, nullable=False, default=0.0),
+    Column("skills", Text, nullable=False, default=""),
+    Column("timestamp", String(19), nullable=False, default=""),
+    Column("responses", Text, nullable=False, default=""),
+    Column("interview_id", String(36), nullable=False, default=""),
+    Column("resume_hash", String(64), nullable=False, default=""),
+    Index("ix_results_email", "email"),
+    Index("ix_results_interview_id", "interview_id"),
+    Index("ix_results_position", "position"),
+    Index("ix_results_timestamp", "timestamp"),
+    Index("ix_results_resume_hash", "resume_hash"),
+)
+
+# Per-position leaderboard order: best score, then most experience, then earliest
+# completion. Top-K and paged ranking queries walk this index instead of sorting.
+RANKING_ORDER = (
+    results_table.c.resume_score.desc(),
+    results_table.c.experience.desc(),
+    results_table.c.timestamp,
+    results_table.c.id,
+)
+Index("ix_results_ranking", results_table.c.position, *RANKING_ORDER)
+
+# In-progress interviews, written when the interview starts so it can be resumed after a restart
+interviews_table = Table(
+    "interviews",
+    metadata,
+    Column("interview_id", String(36), primary_key=True),
+    Column("name", String(255), nullable=False, default=""),
+    Column("email", String(255), nullable=False, default=""),
+    Column("phone", String(32), nullable=False, default=""),
+    Column("experience", Integer, nullable=False, default=0),
+    Column("position", String(255), nullable=False, default=""),
+    Column("resume_score", Float, nullable=False, default=0.0),
+    Column("skills", Text, nullable=False, default=""),
+    Column("resume_path", Text, nullable=False, default=""),
+    Column("resume_hash", String(64), nullable=False, default=""),
+    Column("questions", Text, nullable=False, default="[]"),  # JSON [[question, [keywords]], ...]
+    Column("started_at", String(19), nullable=False, default=""),
+    Column("status", String(16), nullable=False, default="in_progress"),
+)
+
+# Every submitted answer, appended as it is submitted and keyed by question index
+answers_table = Table(
+    "interview_answers",
+    metadata,
+    Column("interview_id", String(36), primary_key=True),
+    Column("question_index", Integer, primary_key=True),
+    Column("answer", Text, nullable=False, default=""),
+    Column("question", Text, nullable=False, default=""),
+    Column("coverage", Float, nullable=False, default=0.0),  # % of the question's keywords covered
+    Column("keywords_found", Text, nullable=False, default=""),
+    Index("ix_interview_answers_question", "question"),
+)
+
+# Materialized dashboard aggregates, maintained incrementally by backend.analytics
+position_stats_table = Table(
+    "analytics_positions",
+    metadata,
+    Column("position", String(255), primary_key=True),
+    Column("candidates", Integer, nullable=False, default=0),
+    Column("score_sum", Float, nullable=False, default=0.0),
+    Column("successes", Integer, nullable=False, default=0),
+)
+
+hour_stats_table = Table(
+    "analytics_hours",
+    metadata,
+    Column("position", String(255), primary_key=True),
+    Column("hour", Integer, primary_key=True),
+    Column("candidates", Integer, nullable=False, default=0),
+)
+
+skill_stats_table = Table(
+    "analytics_skills",
+    metadata,
+    Column("position", String(255), primary_key=True),
+    Column("skill", String(255), primary_key=True),
+    Column("candidates", Integer, nullable=False, default=0),
+)
+
+# Outbound email queue drained by backend.email_queue
+email_outbox_table = Table(
+    "email_outbox",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("recipient", String(255), nullable=False),
+    Column("subject", Text, nullable=False, default=""),
+    Column("body", Text, nullable=False, default=""),
+    Column("html", Text),
+    Column("status", String(16), nullable=False, default="pending"),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("next_attempt_at", Float, nullable=False, default=0.0),
+    Column("created_at", Float, nullable=False, default=0.0),
+    Column("last_error", Text),
+    Index("ix_email_outbox_due", "status", "next_attempt_at"),
+)
+
+# MinHash signatures of extracted resume text and their LSH band buckets (backend.near_duplicates)
+resume_signatures_table = Table(
+    "resume_signatures",
+    metadata,
+    Column("resume_hash", String(64), primary_key=True),
+    Column("signature", LargeBinary, nullable=False),
+    Column("indexed_at", Float, nullable=False, default=0.0),
+)
+
+resume_lsh_table = Table(
+    "resume_lsh",
+    metadata,
+    Column("band", Integer, primary_key=True),
+    Column("bucket", Integer, primary_key=True),  # signed 64-bit hash of the band's rows
+    Column("resume_hash", String(64), primary_key=True),
+)
+
+# Full-text inverted index over resume text (backend.search_index)
+search_documents_table = Table(
+    "search_documents",
+    metadata,
+    Column("doc_id", Integer, primary_key=True, autoincrement=True),
+    Column("resume_hash", String(64), nullable=False, unique=True),
+    Column("length", Integer, nullable=False, default=0),  # tokens
+    Column("experience", Integer, nullable=False, default=0),  # years stated in the resume
+    Column("indexed_at", Float, nullable=False, default=0.0),
+)
+
+search_terms_table = Table(
+    "search_terms",
+    metadata,
+    Column("term", String(255), primary_key=True),
+    Column("doc_freq", Integer, nullable=False, default=0),
+)
+
+# Positional postings of a term for one block of consecutive doc ids: sorted uint32 doc ids,
+# their term frequencies, and the token offsets of every occurrence (freqs[i] per document, in doc order)
+search_postings_table = Table(
+    "search_postings",
+    metadata,
+    Column("term", String(255), primary_key=True),
+    Column("block", Integer, primary_key=True),
+    Column("doc_ids", LargeBinary, nullable=False),
+    Column("freqs", LargeBinary, nullable=False),
+    Column("positions", LargeBinary, nullable=False),  # last, so term-only reads skip its overflow pages
+)
+
+_engine: Optional[Engine] = None
+_engine_lock = Lock()
+_db_path = RESULTS_DB
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL journal so readers never block the single appending writer"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def get_engine() -> Engine:
+    """Return the shared results engine, creating the schema on first use"""
+    global _engine
+    if _engine is not None:
+        return _engine
+    with _engine_lock:  # concurrent first callers must not both run create_all
+        if _engine is None:
+            db_dir = os.path.dirname(_db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            engine = create_engine(
+                f"sqlite:///{_db_path}",
+                connect_args={"check_same_thread": False},
+            )
+            event.listen(engine, "connect", _set_sqlite_pragmas)
+            with engine.begin() as conn:
+                # SQLite's write lock makes other processes opening a fresh database wait their turn
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                metadata.create_all(conn)
+                _add_missing_columns(conn)
+                _add_missing_indexes(conn)
+            _engine = engine
+    return _engine
+
+
+def _add_missing_columns(conn) -> None:
+    """Bring tables created by older releases up to the current column set"""
+    inspector = inspect(conn)
+    for table in metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            default = column.default.arg if column.default is not None else None
+            clause = f" NOT NULL DEFAULT {default!r}" if default is not None else ""
+            conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{clause}'))
+
+
+def _add_missing_indexes(conn) -> None:
+    """create_all skips indexes of tables that already exist"""
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def get_database_path() -> str:
+    return _db_path
+
+
+def use_database(path: str) -> None:
+    """Point the store at another SQLite file (benchmarks, maintenance scripts)"""
+    global _engine, _db_path
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+        _db_path = path
@@ -0,0 +1,216 @@
+"""Persistent outbox for outbound email
+
+Messages are written to the email_outbox table and delivered by a
+background thread over one reused SMTP connection, so the Streamlit
+script never waits on the mail server. Failed sends are retried with
+exponential backoff until EMAIL_MAX_ATTEMPTS.
+
+To try it against a local stand-in server:
+    python -m aiosmtpd -n -l localhost:8025
+    SMTP_SERVER=localhost SMTP_PORT=8025 SMTP_USE_TLS=0 EMAIL_PASSWORD= python -m backend.email_queue --drain
+"""
+import argparse
+import smtplib
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Dict, Optional
+
+from sqlalchemy import func, insert, select, update
+
+from backend.db import email_outbox_table, get_engine
+from backend.metrics import increment, timer
+from config.settings import (
+    EMAIL_ADDRESS, EMAIL_BATCH_SIZE, EMAIL_CONNECTION_IDLE_SECONDS, EMAIL_CONNECTION_PROBE_SECONDS,
+    EMAIL_MAX_ATTEMPTS, EMAIL_PASSWORD, EMAIL_POLL_SECONDS, EMAIL_RETRY_BASE_SECONDS, SMTP_PORT, SMTP_SERVER,
+    SMTP_USE_TLS,
+)
+
+# A claimed message is retried after this long if its sender died mid-delivery
+CLAIM_LEASE_SECONDS = 300
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+def build_message(recipient: str, subject: str, body: str, html: Optional[str] = None) -> MIMEMultipart:
+    msg = MIMEMultipart('alternative')
+    msg['From'] = EMAIL_ADDRESS
+    msg['To'] = recipient
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    if html:
+        msg.attach(MIMEText(html, 'html'))
+    return msg
+
+
+def enqueue_email(recipient: str, subject: str, body: str, html: Optional[str] = None) -> int:
+    """Durably queue a message and wake the delivery worker; returns the outbox id"""
+    now = time.time()
+    with get_engine().begin() as conn:
+        message_id = conn.execute(insert(email_outbox_table).values(
+            recipient=recipient, subject=subject, body=body, html=html,
+            status="pending", attempts=0, next_attempt_at=now, created_at=now,
+        )).inserted_primary_key[0]
+    get_worker().wake()
+    return message_id
+
+
+def retry_delay(attempts: int) -> float:
+    return min(EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+
+
+class SMTPConnection:
+    """Lazily opened SMTP session reused across messages and batches"""
+
+    def __init__(self, host: str = SMTP_SERVER, port: int = SMTP_PORT, use_tls: bool = SMTP_USE_TLS,
+                 username: str = EMAIL_ADDRESS, password: str = EMAIL_PASSWORD):
+        self.host, self.port, self.use_tls = host, port, use_tls
+        self.username, self.password = username, password
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    def get(self) -> smtplib.SMTP:
+        if self._server is not None:
+            idle = time.monotonic() - self._last_used
+            try:
+                # back-to-back sends skip the probe; a dead session then fails the send and is retried
+                if idle > EMAIL_CONNECTION_IDLE_SECONDS or \
+                        (idle > EMAIL_CONNECTION_PROBE_SECONDS and self._server.noop()[0] != 250):
+                    self.close()
+            except (smtplib.SMTPException, OSError):
+                self.close()
+        if self._server is None:
+            server = smtplib.SMTP(self.host, self.port, timeout=30)
+            if self.use_tls:
+                server.starttls()
+            if self.password:
+                server.login(self.username, self.password)
+            self._server = server
+        self._last_used = time.monotonic()
+        return self._server
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+
+def _claim_due(conn, limit: int):
+    """Lease a batch of due messages so no other sender picks them up"""
+    now = time.time()
+    rows = conn.execute(
+        select(email_outbox_table)
+        .where(email_outbox_table.c.status == "pending")
+        .where(email_outbox_table.c.next_attempt_at <= now)
+        .order_by(email_outbox_table.c.next_attempt_at, email_outbox_table.c.id)
+        .limit(limit)
+    ).all()
+    claimed = []
+    for row in rows:
+        result = conn.execute(
+            update(email_outbox_table)
+            .where(email_outbox_table.c.id == row.id)
+            .where(email_outbox_table.c.next_attempt_at == row.next_attempt_at)
+            .values(next_attempt_at=now + CLAIM_LEASE_SECONDS)
+        )
+        if result.rowcount == 1:
+            claimed.append(row)
+    return claimed
+
+
+def deliver_pending(connection: SMTPConnection, limit: int = EMAIL_BATCH_SIZE) -> Dict[str, int]:
+    """Send one batch of due messages over connection; returns sent/retried/failed counts"""
+    engine = get_engine()
+    with engine.begin() as conn:
+        batch = _claim_due(conn, limit)
+
+    counts = {"sent": 0, "retried": 0, "failed": 0}
+    for row in batch:
+        try:
+            with timer("smtp_send"):
+                connection.get().send_message(build_message(row.recipient, row.subject, row.body, row.html))
+            values = {"status": "sent", "attempts": row.attempts + 1, "last_error": None}
+            counts["sent"] += 1
+        except Exception as e:
+            # also a message that cannot be built or encoded, so it fails after its attempts like any other
+            connection.close()
+            attempts = row.attempts + 1
+            if attempts >= EMAIL_MAX_ATTEMPTS:
+                values = {"status": "failed", "attempts": attempts, "last_error": f"{type(e).__name__}: {e}"}
+                counts["failed"] += 1
+            else:
+                values = {"attempts": attempts, "last_error": f"{type(e).__name__}: {e}",
+                          "next_attempt_at": time.time() + retry_delay(attempts)}
+                counts["retried"] += 1
+        with engine.begin() as conn:
+            conn.execute(update(email_outbox_table).where(email_outbox_table.c.id == row.id).values(**values))
+    for outcome, count in counts.items():
+        if count:
+            increment(f"email_{outcome}", count)
+    return counts
+
+
+def outbox_status() -> Dict[str, int]:
+    """Message counts per outbox status"""
+    with get_engine().connect() as conn:
+        return dict(conn.execute(
+            select(email_outbox_table.c.status, func.count()).group_by(email_outbox_table.c.status)
+        ).all())
+
+
+class OutboxWorker(threading.Thread):
+    """Daemon thread draining the outbox"""
+
+    def __init__(self):
+        super().__init__(name="email-outbox", daemon=True)
+        self._wakeup = threading.Event()
+        self.connection = SMTPConnection()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def run(self):
+        while True:
+            # cleared before draining, so a wake() during delivery makes the wait below return at once
+            self._wakeup.clear()
+            try:
+                counts = deliver_pending(self.connection)
+            except Exception:
+                counts = {}
+            if counts.get("sent", 0) + counts.get("retried", 0) + counts.get("failed", 0) == EMAIL_BATCH_SIZE:
+                continue
+            self._wakeup.wait(EMAIL_POLL_SECONDS)
+
+
+_worker: Optional[OutboxWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_worker() -> OutboxWorker:
+    """Process-wide delivery worker, started on first use"""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = OutboxWorker()
+            _worker.start()
+        return _worker
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Outbound email queue")
+    parser.add_argument("--drain", action="store_true", help="deliver every due message, then exit")
+    args = parser.parse_args()
+    if args.drain:
+        connection = SMTPConnection()
+        try:
+            while True:
+                counts = deliver_pending(connection)
+                print(counts)
+                if sum(counts.values()) < EMAIL_BATCH_SIZE:
+                    break
+        finally:
+            connection.close()
+    print(outbox_status())
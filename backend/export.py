@@ -0,0 +1,82 @@
+"""Chunked export of stored candidate records to CSV or Parquet
+
+Records are streamed from the results store EXPORT_CHUNK_SIZE rows at a
+time and appended to the output, so memory stays flat however many
+interviews are stored:
+
+    python -m backend.export data/exports/candidates.parquet --position "Data Scientist" --since 2024-01-01 --min-score 70
+"""
+import argparse
+import os
+import re
+from typing import Dict, Optional
+
+from backend.metrics import timed
+from backend.results_store import COLUMN_LABELS, iter_results
+from config.settings import EXPORT_CHUNK_SIZE, EXPORT_DIR
+
+FORMATS = ("csv", "parquet")
+
+
+def _parquet_schema(pyarrow):
+    types = {"Experience": pyarrow.int64(), "Resume Score": pyarrow.float64()}
+    return pyarrow.schema([(label, types.get(label, pyarrow.string())) for label in COLUMN_LABELS])
+
+
+def export_csv(path: str, chunk_size: int = EXPORT_CHUNK_SIZE, **filters) -> int:
+    """Write matching records to a CSV file chunk by chunk; returns the row count"""
+    rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for chunk in iter_results(chunk_size, **filters):
+            chunk.to_csv(f, header=rows == 0, index=False)
+            rows += len(chunk)
+    return rows
+
+
+def export_parquet(path: str, chunk_size: int = EXPORT_CHUNK_SIZE, **filters) -> int:
+    """Write matching records to a Parquet file, one row group per chunk; returns the row count"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+    schema = _parquet_schema(pyarrow)
+    rows = 0
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for chunk in iter_results(chunk_size, **filters):
+            writer.write_table(pyarrow.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            rows += len(chunk)
+    return rows
+
+
+@timed("export_results")
+def export_results(path: str, fmt: Optional[str] = None, **filters) -> int:
+    """Export to path in fmt (default: from the file extension)"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return (export_parquet if fmt == "parquet" else export_csv)(path, **filters)
+
+
+def export_filename(fmt: str, filters: Dict) -> str:
+    """Export path under EXPORT_DIR named after the active filters (path separators and the like become _)"""
+    parts = ["candidates"] + [
+        re.sub(r'[^\w.-]', '_', str(value)) for value in filters.values() if value not in (None, "")
+    ]
+    return os.path.join(EXPORT_DIR, f"{'_'.join(parts)}.{fmt}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export stored candidate records")
+    parser.add_argument("output", help="destination .csv or .parquet file")
+    parser.add_argument("--position")
+    parser.add_argument("--since", help="first day, YYYY-MM-DD")
+    parser.add_argument("--until", help="last day, YYYY-MM-DD")
+    parser.add_argument("--min-score", type=float)
+    args = parser.parse_args()
+    count = export_results(args.output, position=args.position, since=args.since,
+                           until=args.until, min_score=args.min_score)
+    print(f"Exported {count} records to {args.output}")
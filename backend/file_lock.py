@@ -0,0 +1,38 @@
+"""Advisory file locks for on-disk stores shared by several processes
+
+The Streamlit app, the scoring service and the maintenance CLIs can all
+write the same blob store or similarity index; writers hold an exclusive
+lock on a sidecar file while they update shared metadata. On platforms
+without fcntl the lock only orders the threads of one process.
+"""
+import contextlib
+import os
+import threading
+from typing import Dict, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on path (created if missing) for the duration of the block"""
+    path = os.path.abspath(path)
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(path, threading.Lock())
+    # flock is per open file, so threads of one process are ordered separately
+    with thread_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,229 @@
+"""In-process latency histograms and event counters
+
+Hot paths are wrapped with @timed("operation") or `with timer("operation")`
+and counted with increment("event"). Everything lives in this process;
+it is shown in the admin panel and rendered in the Prometheus text
+format, served at /metrics on METRICS_PORT when set, or written to
+METRICS_FILE for a node_exporter textfile collector.
+
+With METRICS_ENABLED=0 the decorators return the undecorated function
+and timer() hands back a shared no-op context, so nothing is recorded.
+"""
+import contextlib
+import functools
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from config.settings import METRICS_ENABLED, METRICS_HOST, METRICS_PORT
+
+# Upper bounds in seconds: the Prometheus client defaults plus sub-millisecond buckets
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "recruiter"
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count", "max", "_lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate from the buckets by linear interpolation, like histogram_quantile()"""
+        with self._lock:
+            counts, total, largest = list(self.counts), self.count, self.max
+        if not total:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index] if index < len(BUCKETS) else largest
+                return min(lower + (upper - lower) * (rank - cumulative) / count, largest)
+            cumulative += count
+        return largest
+
+
+_histograms: Dict[str, Histogram] = {}
+_counters: Dict[str, int] = defaultdict(int)
+_registry_lock = threading.Lock()
+
+
+def get_histogram(operation: str) -> Histogram:
+    histogram = _histograms.get(operation)
+    if histogram is None:
+        with _registry_lock:
+            histogram = _histograms.setdefault(operation, Histogram())
+    return histogram
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def timer(operation: str):
+    """Context manager timing one block"""
+    return _Timer(get_histogram(operation)) if METRICS_ENABLED else _NULL_TIMER
+
+
+def timed(operation: str):
+    """Decorator recording every call's latency (exceptions included)"""
+    def decorate(func):
+        if not METRICS_ENABLED:
+            return func
+        histogram = get_histogram(operation)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def increment(event: str, amount: int = 1) -> None:
+    if METRICS_ENABLED:
+        with _registry_lock:
+            _counters[event] += amount
+
+
+def _histogram_items() -> List:
+    """(operation, histogram) pairs by name, copied under the lock: timed() registers new ones at import time"""
+    with _registry_lock:
+        return sorted(_histograms.items())
+
+
+def summary() -> List[Dict]:
+    """One row per timed operation for display"""
+    rows = []
+    for operation, histogram in _histogram_items():
+        if not histogram.count:
+            continue
+        rows.append({
+            "Operation": operation,
+            "Calls": histogram.count,
+            "Mean (ms)": round(histogram.sum / histogram.count * 1000, 2),
+            "p50 (ms)": round(histogram.quantile(0.5) * 1000, 2),
+            "p95 (ms)": round(histogram.quantile(0.95) * 1000, 2),
+            "Max (ms)": round(histogram.max * 1000, 2),
+        })
+    return rows
+
+
+def counters() -> Dict[str, int]:
+    with _registry_lock:
+        return dict(sorted(_counters.items()))
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = [
+        f"# HELP {PREFIX}_operation_seconds Latency of instrumented operations.",
+        f"# TYPE {PREFIX}_operation_seconds histogram",
+    ]
+    for operation, histogram in _histogram_items():
+        with histogram._lock:
+            counts, total, count = list(histogram.counts), histogram.sum, histogram.count
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS + (float("inf"),), counts):
+            cumulative += bucket
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{PREFIX}_operation_seconds_bucket{{operation="{operation}",le="{le}"}} {cumulative}')
+        lines.append(f'{PREFIX}_operation_seconds_sum{{operation="{operation}"}} {total}')
+        lines.append(f'{PREFIX}_operation_seconds_count{{operation="{operation}"}} {count}')
+    lines += [
+        f"# HELP {PREFIX}_events_total Counted application events.",
+        f"# TYPE {PREFIX}_events_total counter",
+    ]
+    for event, value in counters().items():
+        lines.append(f'{PREFIX}_events_total{{event="{event}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    """Atomically write the metrics file read by a textfile collector"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_bind_failed = False
+
+
+def start_exporter(port: int = METRICS_PORT, host: str = METRICS_HOST) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics from this process on host:port (once; no-op when port is 0 or metrics are off)
+
+    A port that cannot be bound (e.g. taken by another process) is logged
+    once and not retried, so reruns of the app keep working.
+    """
+    global _server, _bind_failed
+    if not port or not METRICS_ENABLED:
+        return None
+    with _registry_lock:
+        if _server is None and not _bind_failed:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                _bind_failed = True
+                logging.getLogger(__name__).warning("Metrics exporter not started on %s:%s: %s", host, port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return _server
+
@@ -0,0 +1,272 @@
+"""Near-duplicate resume detection with MinHash signatures and an LSH index
+
+The extracted text of every resume is reduced to a MinHash signature over
+word shingles (MINHASH_PERMUTATIONS 32-bit minimums). The signature is cut
+into MINHASH_BANDS bands and each band is hashed to a bucket stored in the
+resume_lsh table, so the candidates for a query are the resumes sharing a
+bucket with it -- a handful of index lookups rather than a scan. Candidates
+are then confirmed by the similarity the two signatures estimate.
+
+Uploads are indexed as they are parsed (backend.resume_jobs); stored
+resumes are indexed in batch, together with the other resume indexes,
+with ``python -m backend.resume_jobs --index-dir data/resumes``.
+"""
+import argparse
+import hashlib
+import json
+import re
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.sqlite import insert
+
+from backend.db import get_engine, resume_lsh_table, resume_signatures_table
+from backend.metrics import increment, timed
+from config.settings import (
+    DUPLICATE_THRESHOLD, MINHASH_BANDS, MINHASH_PERMUTATIONS, SHINGLE_WORDS,
+)
+
+_WORD = re.compile(r'[a-z0-9]+')
+_MASK = np.uint64(0xFFFFFFFF)
+_PRIME = np.uint64((1 << 61) - 1)
+_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+SHINGLE_BLOCK = 4096
+
+# Fixed seed: signatures are persisted, so the permutations must never change between runs
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, 1 << 32, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.randint(0, 1 << 32, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text: str) -> np.ndarray:
+    """32-bit hashes of the distinct SHINGLE_WORDS-word windows of the normalized text"""
+    words = _WORD.findall(text.lower())
+    if len(words) <= SHINGLE_WORDS:
+        grams = {" ".join(words)} if words else set()
+    else:
+        grams = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature of the text (uint32 per permutation)"""
+    hashes = shingles(text)
+    signature = np.full(MINHASH_PERMUTATIONS, _MASK, dtype=np.uint64)
+    for start in range(0, len(hashes), SHINGLE_BLOCK):
+        block = hashes[start:start + SHINGLE_BLOCK, None]
+        # (a*x + b) mod p on 64-bit wrapping arithmetic, truncated to 32 bits
+        permuted = ((block * _A + _B) % _PRIME) & _MASK
+        np.minimum(signature, permuted.min(axis=0), out=signature)
+    return signature.astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def band_buckets(signature: np.ndarray) -> List[Tuple[int, int]]:
+    """(band, bucket) keys of a signature in the LSH index"""
+    return [
+        (band, int.from_bytes(
+            hashlib.blake2b(signature[band * _ROWS:(band + 1) * _ROWS].tobytes(), digest_size=8).digest(),
+            "big", signed=True,
+        ))
+        for band in range(MINHASH_BANDS)
+    ]
+
+
+def _decode(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.uint32)
+
+
+def get_signature(resume_hash: str) -> Optional[np.ndarray]:
+    with get_engine().connect() as conn:
+        blob = conn.execute(
+            select(resume_signatures_table.c.signature)
+            .where(resume_signatures_table.c.resume_hash == resume_hash)
+        ).scalar()
+    return None if blob is None else _decode(blob)
+
+
+def _candidates(conn, signature: np.ndarray) -> Dict[str, np.ndarray]:
+    """Signatures of every indexed resume sharing at least one band bucket"""
+    lsh = resume_lsh_table.c
+    hashes = select(lsh.resume_hash).where(or_(*(
+        and_(lsh.band == band, lsh.bucket == bucket) for band, bucket in band_buckets(signature)
+    ))).distinct()
+    rows = conn.execute(
+        select(resume_signatures_table.c.resume_hash, resume_signatures_table.c.signature)
+        .where(resume_signatures_table.c.resume_hash.in_(hashes))
+    )
+    return {row.resume_hash: _decode(row.signature) for row in rows}
+
+
+@timed("near_duplicates_find")
+def find_near_duplicates(signature: np.ndarray, threshold: float = DUPLICATE_THRESHOLD,
+                         exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+    """(resume hash, similarity) of indexed resumes at least threshold similar, most similar first"""
+    with get_engine().connect() as conn:
+        candidates = _candidates(conn, signature)
+    matches = [
+        (resume_hash, similarity(signature, other))
+        for resume_hash, other in candidates.items() if resume_hash != exclude
+    ]
+    return sorted((m for m in matches if m[1] >= threshold), key=lambda m: -m[1])
+
+
+@timed("near_duplicates_index")
+def index_resume(resume_hash: str, text: str, threshold: float = DUPLICATE_THRESHOLD) -> List[Tuple[str, float]]:
+    """Add a resume's signature to the index (once per hash); returns its near-duplicates"""
+    signature = get_signature(resume_hash)
+    if signature is None:
+        signature = minhash(text)
+        _store_signatures({resume_hash: signature})
+    duplicates = find_near_duplicates(signature, threshold, exclude=resume_hash)
+    if duplicates:
+        increment("resume_near_duplicate")
+    return duplicates
+
+
+@timed("near_duplicates_index_documents")
+def index_documents(documents: Iterable[Tuple[str, str]]) -> int:
+    """Add the signatures of (resume hash, text) pairs that are not indexed yet; returns the number added"""
+    documents = dict(documents)
+    known = indexed(list(documents))
+    signatures = {h: minhash(text) for h, text in documents.items() if h not in known}
+    if signatures:
+        _store_signatures(signatures)
+    return len(signatures)
+
+
+def _store_signatures(signatures: Dict[str, np.ndarray]) -> None:
+    with get_engine().begin() as conn:
+        conn.execute(insert(resume_signatures_table).on_conflict_do_nothing(), [
+            {"resume_hash": h, "signature": signature.tobytes(), "indexed_at": time.time()}
+            for h, signature in signatures.items()
+        ])
+        conn.execute(insert(resume_lsh_table).on_conflict_do_nothing(), [
+            {"band": band, "bucket": bucket, "resume_hash": h}
+            for h, signature in signatures.items()
+            for band, bucket in band_buckets(signature)
+        ])
+
+
+def indexed(resume_hashes: List[str]) -> Set[str]:
+    """Those of resume_hashes that already have a signature"""
+    signatures = resume_signatures_table.c
+    with get_engine().connect() as conn:
+        return set(conn.execute(
+            select(signatures.resume_hash).where(signatures.resume_hash.in_(resume_hashes))
+        ).scalars())
+
+
+def duplicate_groups(threshold: float = DUPLICATE_THRESHOLD,
+                     resume_hashes: Optional[Iterable[str]] = None) -> List[List[str]]:
+    """Groups of two or more near-duplicate resumes (connected components), optionally among some hashes only
+
+    Only buckets holding more than one resume are read, and pairs are
+    confirmed by signature similarity before they are joined.
+    """
+    return _components(threshold, resume_hashes)[0]
+
+
+def _components(threshold: float,
+                resume_hashes: Optional[Iterable[str]]) -> Tuple[List[List[str]], Dict[str, np.ndarray]]:
+    """duplicate_groups plus the signatures of their members"""
+    allowed = set(resume_hashes) if resume_hashes is not None else None
+    lsh = resume_lsh_table.c
+    shared = (
+        select(lsh.band, lsh.bucket)
+        .group_by(lsh.band, lsh.bucket)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    with get_engine().connect() as conn:
+        buckets: Dict[Tuple[int, int], List[str]] = {}
+        for row in conn.execute(
+            select(lsh.band, lsh.bucket, lsh.resume_hash)
+            .join(shared, and_(lsh.band == shared.c.band, lsh.bucket == shared.c.bucket))
+        ):
+            if allowed is None or row.resume_hash in allowed:
+                buckets.setdefault((row.band, row.bucket), []).append(row.resume_hash)
+        members = {h for hashes in buckets.values() if len(hashes) > 1 for h in hashes}
+        signatures = {}
+        member_list = list(members)
+        for start in range(0, len(member_list), 500):
+            for row in conn.execute(
+                select(resume_signatures_table.c.resume_hash, resume_signatures_table.c.signature)
+                .where(resume_signatures_table.c.resume_hash.in_(member_list[start:start + 500]))
+            ):
+                signatures[row.resume_hash] = _decode(row.signature)
+
+    parent = {h: h for h in members}
+
+    def root(h: str) -> str:
+        while parent[h] != h:
+            parent[h] = parent[parent[h]]
+            h = parent[h]
+        return h
+
+    checked = set()
+    for hashes in buckets.values():
+        for i, a in enumerate(hashes):
+            for b in hashes[i + 1:]:
+                pair = (a, b) if a < b else (b, a)
+                if pair in checked or root(a) == root(b):
+                    continue
+                checked.add(pair)
+                if similarity(signatures[a], signatures[b]) >= threshold:
+                    parent[root(a)] = root(b)
+
+    groups: Dict[str, List[str]] = {}
+    for h in members:
+        groups.setdefault(root(h), []).append(h)
+    groups = sorted((sorted(group) for group in groups.values() if len(group) > 1), key=lambda g: (-len(g), g[0]))
+    return groups, signatures
+
+
+def representatives(resume_hashes: Iterable[str], threshold: float = DUPLICATE_THRESHOLD) -> Dict[str, str]:
+    """Map each hash to a member of its near-duplicate group at least threshold similar to it (itself when unique)
+
+    A group is a connected component, so its members can be linked only
+    through a chain of near-duplicates. Representatives are picked greedily,
+    the member with the most direct near-duplicates first, and each one
+    stands in only for those direct near-duplicates.
+    """
+    resume_hashes = list(resume_hashes)
+    mapping = {h: h for h in resume_hashes}
+    groups, signatures = _components(threshold, resume_hashes)
+    for group in groups:
+        neighbours = {
+            a: {b for b in group if b != a and similarity(signatures[a], signatures[b]) >= threshold}
+            for a in group
+        }
+        unassigned = set(group)
+        while unassigned:
+            chosen = min(unassigned, key=lambda h: (-len(neighbours[h] & unassigned), h))
+            for h in (neighbours[chosen] & unassigned) | {chosen}:
+                mapping[h] = chosen
+            unassigned -= neighbours[chosen] | {chosen}
+    return mapping
+
+
+def count_indexed() -> int:
+    with get_engine().connect() as conn:
+        return conn.execute(select(func.count()).select_from(resume_signatures_table)).scalar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List near-duplicate resume groups")
+    parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD)
+    args = parser.parse_args()
+
+    for group in duplicate_groups(args.threshold):
+        print(json.dumps(group))
+
+
+if __name__ == "__main__":
+    main()
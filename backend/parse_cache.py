@@ -0,0 +1,134 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Optional
+
+from backend.metrics import increment
+from config.settings import PARSE_CACHE_DIR, PARSE_CACHE_MAX_MB, PARSE_CACHE_MEMORY_ITEMS
+
+
+def content_hash(data: bytes) -> str:
+    """Content address of an uploaded document"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def upload_hash(file) -> str:
+    """Content hash of an in-memory upload without copying its buffer"""
+    with file.getbuffer() as view:
+        return content_hash(view)
+
+
+class ParseCache:
+    """Extracted resume text keyed by content hash, in memory and on disk
+
+    Both tiers are LRU: the memory tier is bounded by entry count, the disk
+    tier by total size (file mtimes are refreshed on every hit and the
+    oldest files are evicted first).
+    """
+
+    def __init__(self, directory: str, max_bytes: int, memory_items: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._disk_bytes: Optional[int] = None
+        self._lock = Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                return text
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        self._remember(key, text)
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += os.path.getsize(path)
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _remember(self, key: str, text: str) -> None:
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith(".txt"))
+
+    def _evict(self) -> None:
+        """Drop least recently used files until the disk tier is back under 90% of its budget"""
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(self.directory) if entry.name.endswith(".txt")
+        )
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._disk_bytes = total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith(".txt"):
+                        os.remove(entry.path)
+            self._disk_bytes = 0
+
+
+_cache = ParseCache(PARSE_CACHE_DIR, PARSE_CACHE_MAX_MB * 1024 * 1024, PARSE_CACHE_MEMORY_ITEMS)
+
+
+def get_parse_cache() -> ParseCache:
+    return _cache
+
+
+def cached_extract(source, file_type: str, extractor: Callable, key: Optional[str] = None) -> str:
+    """Return extracted text for source (bytes, or a file when key is given), extracting only on a miss"""
+    key = key or content_hash(source)
+    text = _cache.get(key)
+    if text is None:
+        increment("parse_cache_miss")
+        text = extractor(source, file_type)
+        _cache.put(key, text)
+    else:
+        increment("parse_cache_hit")
+    return text
@@ -0,0 +1,53 @@
+import itertools
+from threading import Lock
+from typing import Dict, List, Sequence, Tuple
+
+from backend.data_manager import get_positions_snapshot
+
+Question = Tuple[str, Tuple[str, ...]]
+
+# (position, config version) -> technical + behavioral questions, shared by every session.
+# Old versions are kept: sessions started before an edit still index into them.
+_pools: Dict[Tuple[str, int], Tuple[Question, ...]] = {}
+_pools_lock = Lock()
+# Negative versions name pools restored from interviews started under an older config
+_restored_versions = itertools.count(-1, -1)
+
+
+def get_question_pool(position: str) -> Tuple[int, Tuple[Question, ...]]:
+    """Current config version and the shared question pool of a position"""
+    positions, version = get_positions_snapshot()
+    key = (position, version)
+    pool = _pools.get(key)
+    if pool is None:
+        config = positions[position]
+        pool = tuple(
+            (question, tuple(keywords)) for question, keywords in config["technical"] + config["behavioral"]
+        )
+        with _pools_lock:
+            pool = _pools.setdefault(key, pool)
+    return version, pool
+
+
+def get_questions(position: str, version: int, indices: Tuple[int, ...]) -> List[Question]:
+    """Resolve (position, version, index) references into question tuples"""
+    pool = _pools[(position, version)]
+    return [pool[index] for index in indices]
+
+
+def restore_questions(position: str, questions: Sequence) -> Tuple[int, Tuple[int, ...]]:
+    """(version, indices) referencing a stored question set, e.g. when resuming an interview
+
+    Uses the current pool when it still holds every question; otherwise the
+    stored set becomes a pool of its own under a fresh negative version.
+    """
+    questions = tuple((question, tuple(keywords)) for question, keywords in questions)
+    if position in get_positions_snapshot()[0]:
+        version, pool = get_question_pool(position)
+        indexed = {question: index for index, question in enumerate(pool)}
+        if all(question in indexed for question in questions):
+            return version, tuple(indexed[question] for question in questions)
+    with _pools_lock:
+        version = next(_restored_versions)
+        _pools[(position, version)] = questions
+    return version, tuple(range(len(questions)))
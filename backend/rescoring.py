@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, update
+
+from backend import analytics
+from backend.analysis_engine import analyze_resume, extract_text
+from backend.blob_store import get_blob_store, sniff_type
+from backend.data_manager import on_positions_saved
+from backend.db import get_engine, results_table
+from backend.near_duplicates import representatives
+from backend.parse_cache import cached_extract, get_parse_cache
+from config.settings import RESCORE_CHUNK_SIZE, RESCORE_REUSE_DUPLICATES, RESCORE_WORKERS
+
+SKILL_KEYS = ("required_skills", "preferred_skills")
+
+
+def _resume_text(resume_hash: str) -> Optional[str]:
+    """Cached resume text, re-extracted from the stored upload when the cache has evicted it"""
+    text = get_parse_cache().get(resume_hash)
+    if text is not None:
+        return text
+    data = get_blob_store().get(resume_hash)
+    file_type = sniff_type(data) if data is not None else None
+    if file_type is None:
+        return None
+    try:
+        return cached_extract(data, file_type, extract_text, resume_hash)
+    except Exception:
+        return None
+
+
+def _score_chunk(position: str, resume_hashes: List[str]) -> Dict:
+    """Re-run analyze_resume on each resume's text (runs in a worker process)"""
+    scores = {}
+    for resume_hash in resume_hashes:
+        text = _resume_text(resume_hash)
+        if text is None:
+            scores[resume_hash] = None
+            continue
+        analysis = analyze_resume(text, position)
+        scores[resume_hash] = (analysis["resume_score"], ", ".join(analysis["skills"]))
+    return scores
+
+
+class RescoreJob:
+    """Background re-scoring of every stored candidate of one position
+
+    With reuse_duplicates only one resume of each near-duplicate group is
+    scored and the others take its score.
+    """
+
+    def __init__(self, position: str, reuse_duplicates: bool = RESCORE_REUSE_DUPLICATES):
+        self.position = position
+        self.reuse_duplicates = reuse_duplicates
+        self.status = "queued"
+        self.total = 0
+        self.done = 0
+        self.updated = 0
+        self.missing_text = 0
+        self.reused = 0
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"rescore-{position}", daemon=True)
+
+    @property
+    def progress(self) -> float:
+        return self.done / self.total if self.total else (1.0 if self.finished_at else 0.0)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def join(self, timeout: Optional[float] = None):
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            self.status = "running"
+            self._rescore()
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+
+    def _rescore(self):
+        with get_engine().connect() as conn:
+            rows = conn.execute(
+                select(
+                    results_table.c.id, results_table.c.resume_hash, results_table.c.resume_score,
+                    results_table.c.skills, results_table.c.timestamp,
+                ).where(results_table.c.position == self.position)
+            ).all()
+
+        rows_by_hash = defaultdict(list)
+        for row in rows:
+            if row.resume_hash:
+                rows_by_hash[row.resume_hash].append(row)
+            else:
+                self.missing_text += 1
+
+        hashes = list(rows_by_hash)
+        shared = representatives(hashes) if self.reuse_duplicates else {}
+        if shared:
+            hashes = list(dict.fromkeys(shared.values()))
+            self.reused = len(shared) - len(hashes)
+        self.total = len(hashes)
+        scores = {}
+        if hashes:
+            chunks = [hashes[i:i + RESCORE_CHUNK_SIZE] for i in range(0, len(hashes), RESCORE_CHUNK_SIZE)]
+            with ProcessPoolExecutor(max_workers=min(RESCORE_WORKERS, len(chunks))) as pool:
+                futures = {pool.submit(_score_chunk, self.position, chunk): len(chunk) for chunk in chunks}
+                for future in as_completed(futures):
+                    if self._cancelled.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        self.status = "superseded"
+                        return
+                    scores.update(future.result())
+                    self.done += futures[future]
+
+        if self._cancelled.is_set():
+            self.status = "superseded"
+            return
+        for resume_hash, representative in shared.items():
+            scores[resume_hash] = scores.get(representative)
+        self._publish(rows_by_hash, scores)
+        self.status = "completed"
+
+    def _publish(self, rows_by_hash: Dict, scores: Dict):
+        """Write every changed score in one transaction, keeping the dashboard aggregates in step"""
+        with get_engine().begin() as conn:
+            for resume_hash, new in scores.items():
+                if new is None:
+                    self.missing_text += len(rows_by_hash[resume_hash])
+                    continue
+                new_score, new_skills = new
+                for row in rows_by_hash[resume_hash]:
+                    if row.resume_score == new_score and _skill_set(row.skills) == _skill_set(new_skills):
+                        continue
+                    result = conn.execute(
+                        update(results_table)
+                        .where(results_table.c.id == row.id)
+                        .where(results_table.c.resume_score == row.resume_score)
+                        .values(resume_score=new_score, skills=new_skills)
+                    )
+                    if result.rowcount != 1:
+                        continue
+                    old_row = {"position": self.position, "resume_score": row.resume_score,
+                               "skills": row.skills, "timestamp": row.timestamp}
+                    analytics.apply_result(conn, old_row, -1)
+                    analytics.apply_result(conn, {**old_row, "resume_score": new_score, "skills": new_skills})
+                    self.updated += 1
+
+
+def _skill_set(skills: Optional[str]) -> frozenset:
+    """Skills column as a set: rows saved before skills were kept in first-seen order differ only in order"""
+    return frozenset(filter(None, (skills or "").split(", ")))
+
+
+_jobs: Dict[str, RescoreJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def start_rescore(position: str) -> RescoreJob:
+    """Start re-scoring a position, superseding any job still running for it"""
+    with _jobs_lock:
+        previous = _jobs.get(position)
+        if previous is not None and previous.finished_at is None:
+            previous.cancel()
+        job = RescoreJob(position)
+        _jobs[position] = job
+    job.start()
+    return job
+
+
+def get_rescore_jobs() -> Dict[str, RescoreJob]:
+    with _jobs_lock:
+        return dict(_jobs)
+
+
+def skills_changed(previous: Dict, positions: Dict) -> List[str]:
+    """Existing positions whose required or preferred skills differ between two configs"""
+    return [
+        position for position, config in positions.items()
+        if position in previous
+        and any(previous[position].get(key) != config.get(key) for key in SKILL_KEYS)
+    ]
+
+
+def _on_positions_saved(previous: Dict, positions: Dict) -> None:
+    for position in skills_changed(previous, positions):
+        start_rescore(position)
+
+
+on_positions_saved(_on_positions_saved)
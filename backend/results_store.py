@@ -0,0 +1,294 @@
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Set
+
+import pandas as pd
+from sqlalchemy import delete, func, insert, select, union, update
+from sqlalchemy.dialects.sqlite import insert as upsert
+
+from backend import analytics
+from backend.metrics import timed
+from backend.db import (
+    RANKING_ORDER, get_engine, get_database_path, use_database,
+    answers_table, interviews_table, results_table, position_stats_table,
+)
+from config.settings import LEGACY_RESULTS_FILE
+
+__all__ = [
+    "COLUMN_LABELS", "append_result", "start_interview", "find_interview", "load_results", "load_results_page",
+    "iter_results", "find_results", "find_results_by_email", "find_results_by_resume_hashes", "top_candidates",
+    "count_candidates", "save_answer", "load_answers", "referenced_resume_hashes", "has_results", "count_results",
+    "purge_results", "import_excel",
+    # re-exported from backend.db for the benchmarks
+    "get_engine", "results_table", "use_database",
+]
+
+# Report labels used by the UI (and the legacy results.xlsx) -> table columns
+COLUMN_LABELS = {
+    "Name": "name",
+    "Email": "email",
+    "Position": "position",
+    "Experience": "experience",
+    "Resume Score": "resume_score",
+    "Skills": "skills",
+    "Timestamp": "timestamp",
+    "Responses": "responses",
+    "Interview ID": "interview_id",
+    "Resume Hash": "resume_hash",
+}
+
+
+def _to_row(record: Dict) -> Dict:
+    """Map a labelled report record onto table columns"""
+    row = {}
+    for label, column in COLUMN_LABELS.items():
+        value = record.get(label)
+        if value is None or (isinstance(value, float) and pd.isna(value)):
+            continue
+        row[column] = value
+    if "timestamp" in row:
+        row["timestamp"] = str(row["timestamp"])[:19]
+    return row
+
+
+def _to_frame(rows) -> pd.DataFrame:
+    """Build a labelled DataFrame from result rows"""
+    labels = list(COLUMN_LABELS)
+    return pd.DataFrame([tuple(row) for row in rows], columns=labels)
+
+
+def _labelled_columns():
+    return [results_table.c[column] for column in COLUMN_LABELS.values()]
+
+
+def _filtered(query, position: Optional[str] = None, since: Optional[str] = None,
+              until: Optional[str] = None, min_score: Optional[float] = None):
+    """Restrict a results query; since/until are YYYY-MM-DD dates, both inclusive"""
+    if position:
+        query = query.where(results_table.c.position == position)
+    if since:
+        query = query.where(results_table.c.timestamp >= str(since))
+    if until:
+        query = query.where(results_table.c.timestamp <= f"{until} 23:59:59")
+    if min_score is not None:
+        query = query.where(results_table.c.resume_score >= min_score)
+    return query
+
+
+@timed("results_append_result")
+def append_result(record: Dict) -> None:
+    """Append one completed interview record, fold it into the dashboard aggregates and close the interview"""
+    row = _to_row(record)
+    with get_engine().begin() as conn:
+        conn.execute(insert(results_table), [row])
+        analytics.apply_result(conn, row)
+        conn.execute(
+            update(interviews_table)
+            .where(interviews_table.c.interview_id == row.get("interview_id", ""))
+            .values(status="completed")
+        )
+
+
+@timed("results_start_interview")
+def start_interview(interview: Dict, questions: List) -> None:
+    """Record a started interview and its question set so it can be resumed"""
+    with get_engine().begin() as conn:
+        conn.execute(insert(interviews_table).values(**interview, questions=json.dumps(questions)))
+
+
+@timed("results_find_interview")
+def find_interview(email: str, interview_id: str) -> Optional[Dict]:
+    """An unfinished interview by ID and email, with its questions decoded"""
+    with get_engine().connect() as conn:
+        row = conn.execute(
+            select(interviews_table)
+            .where(interviews_table.c.interview_id == interview_id)
+            .where(interviews_table.c.email == email)
+            .where(interviews_table.c.status == "in_progress")
+        ).mappings().first()
+    if row is None:
+        return None
+    interview = dict(row)
+    interview["questions"] = json.loads(interview["questions"])
+    return interview
+
+
+def load_results(position: Optional[str] = None) -> pd.DataFrame:
+    """Load stored interview records, optionally for a single position"""
+    query = select(*_labelled_columns()).order_by(results_table.c.id)
+    if position:
+        query = query.where(results_table.c.position == position)
+    with get_engine().connect() as conn:
+        return _to_frame(conn.execute(query))
+
+
+@timed("results_load_results_page")
+def load_results_page(limit: int, offset: int = 0, **filters) -> pd.DataFrame:
+    """One page of stored records, newest first, so only the visible rows are read"""
+    query = _filtered(select(*_labelled_columns()), **filters).order_by(results_table.c.id.desc())
+    with get_engine().connect() as conn:
+        return _to_frame(conn.execute(query.limit(limit).offset(offset)))
+
+
+def iter_results(chunk_size: int = 5000, **filters) -> Iterator[pd.DataFrame]:
+    """Stream stored records in insertion order as DataFrames of at most chunk_size rows"""
+    query = _filtered(select(*_labelled_columns()), **filters).order_by(results_table.c.id)
+    with get_engine().connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size).execute(query)
+        for rows in result.partitions():
+            yield _to_frame(rows)
+
+
+@timed("results_find_results")
+def find_results(email: str, interview_id: str) -> pd.DataFrame:
+    """Point lookup of a candidate's records by interview ID and email
+
+    Served by the interview ID index, so only the matching rows are read
+    regardless of how many interviews are stored.
+    """
+    query = (
+        select(*_labelled_columns())
+        .where(results_table.c.interview_id == interview_id)
+        .where(results_table.c.email == email)
+        .order_by(results_table.c.id)
+    )
+    with get_engine().connect() as conn:
+        return _to_frame(conn.execute(query))
+
+
+def find_results_by_email(email: str) -> pd.DataFrame:
+    """Every record for a candidate email, served by the email index"""
+    query = (
+        select(*_labelled_columns())
+        .where(results_table.c.email == email)
+        .order_by(results_table.c.id)
+    )
+    with get_engine().connect() as conn:
+        return _to_frame(conn.execute(query))
+
+
+def find_results_by_resume_hashes(resume_hashes: List[str], chunk_size: int = 500) -> pd.DataFrame:
+    """Every record whose resume is one of resume_hashes, best score first"""
+    rows = []
+    with get_engine().connect() as conn:
+        for start in range(0, len(resume_hashes), chunk_size):
+            rows += conn.execute(
+                select(*_labelled_columns())
+                .where(results_table.c.resume_hash.in_(resume_hashes[start:start + chunk_size]))
+            ).all()
+    frame = _to_frame(rows)
+    return frame.sort_values(["Resume Score", "Timestamp"], ascending=[False, True], ignore_index=True)
+
+
+@timed("results_top_candidates")
+def top_candidates(position: str, limit: int = 50, offset: int = 0) -> pd.DataFrame:
+    """One leaderboard page for a position, best candidates first
+
+    Ranked by resume score, then experience, then earliest completion. The
+    ranking index keeps rows in this order as interviews are appended and
+    re-scored, so a page is an index range read rather than a sort.
+    """
+    query = (
+        select(*_labelled_columns())
+        .where(results_table.c.position == position)
+        .order_by(*RANKING_ORDER)
+        .limit(limit)
+        .offset(offset)
+    )
+    with get_engine().connect() as conn:
+        df = _to_frame(conn.execute(query))
+    df.insert(0, "Rank", range(offset + 1, offset + len(df) + 1))
+    return df
+
+
+def count_candidates(position: str) -> int:
+    """Stored interviews for a position, from the maintained analytics aggregate"""
+    with get_engine().connect() as conn:
+        count = conn.execute(
+            select(position_stats_table.c.candidates).where(position_stats_table.c.position == position)
+        ).scalar()
+    return int(count or 0)
+
+
+@timed("results_save_answer")
+def save_answer(interview_id: str, question_index: int, answer: str, question: str = "",
+                coverage: float = 0.0, keywords_found: str = "") -> None:
+    """Durably store one submitted answer with its keyword coverage; resubmitting replaces it"""
+    values = {"answer": answer, "question": question, "coverage": coverage, "keywords_found": keywords_found}
+    stmt = upsert(answers_table).values(interview_id=interview_id, question_index=question_index, **values)
+    with get_engine().begin() as conn:
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=["interview_id", "question_index"],
+            set_={column: stmt.excluded[column] for column in values},
+        ))
+
+
+@timed("results_load_answers")
+def load_answers(interview_id: str) -> Dict[int, str]:
+    """Stored answers of one interview by question index"""
+    with get_engine().connect() as conn:
+        return dict(conn.execute(
+            select(answers_table.c.question_index, answers_table.c.answer)
+            .where(answers_table.c.interview_id == interview_id)
+        ).all())
+
+
+def referenced_resume_hashes() -> Set[str]:
+    """Content hashes of every resume that a completed or in-progress interview refers to"""
+    with get_engine().connect() as conn:
+        return {h for h in conn.execute(
+            union(select(results_table.c.resume_hash), select(interviews_table.c.resume_hash))
+        ).scalars() if h}
+
+
+def has_results() -> bool:
+    """Cheap existence check that avoids counting the whole table"""
+    with get_engine().connect() as conn:
+        return conn.execute(select(results_table.c.id).limit(1)).first() is not None
+
+
+@timed("results_count_results")
+def count_results(**filters) -> int:
+    """Number of stored interview records, optionally filtered like iter_results"""
+    with get_engine().connect() as conn:
+        return conn.execute(_filtered(select(func.count()).select_from(results_table), **filters)).scalar_one()
+
+
+def purge_results() -> None:
+    """Delete every stored interview record"""
+    with get_engine().begin() as conn:
+        conn.execute(delete(results_table))
+        conn.execute(delete(answers_table))
+        conn.execute(delete(interviews_table))
+        analytics.clear_aggregates(conn)
+
+
+@timed("results_import_excel")
+def import_excel(path: str = LEGACY_RESULTS_FILE) -> int:
+    """One-shot import of a legacy results.xlsx; already imported interviews are skipped"""
+    if not os.path.exists(path):
+        return 0
+
+    df = pd.read_excel(path)
+    with get_engine().begin() as conn:
+        known_ids = set(conn.execute(select(results_table.c.interview_id)).scalars())
+        rows = []
+        for record in df.to_dict("records"):
+            row = _to_row(record)
+            interview_id = str(row.get("interview_id", ""))
+            if interview_id and interview_id in known_ids:
+                continue
+            row["interview_id"] = interview_id
+            known_ids.add(interview_id)
+            rows.append(row)
+        if rows:
+            conn.execute(insert(results_table), rows)
+            for row in rows:
+                analytics.apply_result(conn, row)
+    return len(rows)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else LEGACY_RESULTS_FILE
+    print(f"Imported {import_excel(source)} records from {source} into {get_database_path()}")
@@ -0,0 +1,138 @@
+import argparse
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+import PyPDF2
+
+from backend import near_duplicates, search_index, similarity
+from backend.analysis_engine import extract_text
+from backend.metrics import increment
+from backend.parse_cache import cached_extract
+from config.settings import PARSE_WORKERS, RESUMES_DIR
+from utils.iterables import batched
+
+INDEXES = (near_duplicates, search_index, similarity)
+INDEX_BATCH_SIZE = 500  # stored resumes read (and held in memory) at a time when indexing a folder
+
+_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="resume-parse")
+# One indexing thread: index writers take turns anyway, and a parse never waits for them
+_index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume-index")
+
+
+def _extract(data: bytes, file_type: str, resume_hash: str) -> str:
+    """Extract resume text through the parse cache and queue it for indexing (runs on an executor thread)"""
+    try:
+        text = cached_extract(data, file_type, extract_text, resume_hash)
+    except PyPDF2.errors.PdfReadError:
+        raise ValueError("Error: Could not read PDF file - may be corrupted or encrypted")
+    except Exception as e:
+        raise ValueError(f"Resume parsing error: {str(e)}")
+    _index_executor.submit(_index_text, resume_hash, text)
+    return text
+
+
+def _index_text(resume_hash: str, text: str) -> None:
+    for index in INDEXES:
+        try:
+            index.index_resume(resume_hash, text)
+        except Exception:
+            # Indexing is best effort; "Index Resume Folder" picks the resume up later
+            increment("resume_index_error")
+            logging.getLogger(__name__).exception("Indexing resume %s in %s failed", resume_hash, index.__name__)
+
+
+class ParseJob:
+    """Handle to one background resume extraction, kept on the session state"""
+
+    def __init__(self, resume_hash: str, future: Future):
+        self.resume_hash = resume_hash
+        self.started_at = time.time()
+        self._future = future
+
+    @property
+    def done(self) -> bool:
+        return self._future.done()
+
+    @property
+    def error(self) -> Optional[str]:
+        if not self.done or self._future.exception() is None:
+            return None
+        return str(self._future.exception())
+
+    @property
+    def text(self) -> Optional[str]:
+        """Extracted text once the job succeeded, otherwise None"""
+        if not self.done or self._future.exception() is not None:
+            return None
+        return self._future.result()
+
+
+# In-flight jobs by resume hash; a finished job's text lives on in the parse cache
+_jobs: Dict[str, ParseJob] = {}
+_jobs_lock = threading.Lock()
+
+
+def submit_parse(data: bytes, file_type: str, resume_hash: str) -> ParseJob:
+    """Start extracting a resume, joining the in-flight job if the same file is already being parsed"""
+    with _jobs_lock:
+        job = _jobs.get(resume_hash)
+        if job is not None:
+            return job
+        job = ParseJob(resume_hash, _executor.submit(_extract, data, file_type, resume_hash))
+        _jobs[resume_hash] = job
+    job._future.add_done_callback(lambda _: _forget(resume_hash, job))
+    return job
+
+
+def _forget(resume_hash: str, job: ParseJob) -> None:
+    with _jobs_lock:
+        if _jobs.get(resume_hash) is job:
+            del _jobs[resume_hash]
+
+
+def index_directory(directory: str = RESUMES_DIR) -> Dict[str, int]:
+    """Add every stored resume under directory to the indexes missing it; returns counts
+
+    Each resume is extracted once, and only when some index lacks it.
+    """
+    from backend.blob_store import iter_documents
+
+    stats = {"files": 0, "errors": 0, **{_index_name(index): 0 for index in INDEXES}}
+    for batch in batched(iter_documents(directory), INDEX_BATCH_SIZE):
+        stats["files"] += len(batch)
+        resume_hashes = list(dict.fromkeys(resume_hash for resume_hash, _, _ in batch))
+        missing = {index: set(resume_hashes) - index.indexed(resume_hashes) for index in INDEXES}
+        wanted = set().union(*missing.values())
+        texts = {}
+        for resume_hash, data, file_type in batch:
+            if resume_hash in wanted and resume_hash not in texts:
+                try:
+                    texts[resume_hash] = cached_extract(data, file_type, extract_text, resume_hash)
+                except Exception:
+                    stats["errors"] += 1
+        for index, hashes in missing.items():
+            stats[_index_name(index)] += index.index_documents(
+                (resume_hash, texts[resume_hash]) for resume_hash in resume_hashes
+                if resume_hash in hashes and resume_hash in texts
+            )
+    return stats
+
+
+def _index_name(index) -> str:
+    return index.__name__.rpartition(".")[2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index stored resumes for duplicate, full-text and similarity search")
+    parser.add_argument("--index-dir", default=RESUMES_DIR, help="resume store to index")
+    args = parser.parse_args()
+
+    print(json.dumps({"index": index_directory(args.index_dir)}))
+
+
+if __name__ == "__main__":
+    main()
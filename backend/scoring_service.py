@@ -0,0 +1,472 @@
+"""Headless resume scoring service over HTTP
+
+Usage: python -m backend.scoring_service [--host 127.0.0.1] [--port 8502] [--parse-workers N]
+
+Endpoints (JSON responses):
+    POST /parse      body: PDF/DOCX bytes, Content-Type application/pdf or the DOCX MIME type
+                     -> {"resume_hash", "text"}
+    POST /analyze    body: PDF/DOCX bytes, or JSON {"text": ..., "positions": [...]}
+                     ?position=P (repeatable; every position when omitted), &detail=1 for analyze_resume's
+                     full breakdown -> {"resume_hash" (documents only), "experience", "scores": {position: score}}
+    POST /rank       JSON {"position": P, "resumes": [{"id": ..., "text": ...}, ...], "limit": N}
+                     -> {"position", "ranking": [{"id", "resume_score", "experience"}, ...]} best first
+    GET  /health, GET /metrics (Prometheus text)
+
+One asyncio event loop serves HTTP/1.1 with keep-alive. Documents are
+parsed in a process pool. Scoring requests are coalesced: texts arriving
+within SERVICE_BATCH_WAIT_MS of each other (up to SERVICE_BATCH_SIZE) are
+scored together by one BatchScorer pass on a worker thread, and score
+exactly like analyze_resume. Detailed analyses (detail=1) run on the same
+thread, counted against the same limit.
+
+Backpressure: beyond SERVICE_MAX_CONNECTIONS open connections,
+SERVICE_MAX_PENDING_PARSES documents in the parse pool or
+SERVICE_MAX_PENDING_SCORES texts waiting to be scored, requests are
+refused with 503 and Retry-After instead of queueing without bound.
+Bodies over MAX_FILE_SIZE_MB are refused with 413.
+
+SIGTERM and SIGINT stop the server and shut the parse pool down.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import signal
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from backend.metrics import increment, render_prometheus, timer
+from config.settings import (
+    MAX_FILE_SIZE_MB, SERVICE_BATCH_SIZE, SERVICE_BATCH_WAIT_MS, SERVICE_HOST, SERVICE_MAX_CONNECTIONS,
+    SERVICE_MAX_PENDING_PARSES, SERVICE_MAX_PENDING_SCORES, SERVICE_MAX_RANK_RESUMES, SERVICE_PARSE_WORKERS,
+    SERVICE_PORT, SERVICE_READ_TIMEOUT_SECONDS,
+)
+
+MAX_HEADER_LINES = 100
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 408: "Request Timeout",
+    411: "Length Required", 413: "Payload Too Large", 414: "URI Too Long",
+    415: "Unsupported Media Type", 422: "Unprocessable Entity", 431: "Request Header Fields Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class ServiceError(Exception):
+    """Refuse a request with an HTTP status and a message"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Overloaded(ServiceError):
+    def __init__(self, what: str):
+        super().__init__(503, f"Too many {what} in flight, retry shortly")
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+
+# ----------------- Work done off the event loop -----------------
+
+def _parse_document(data: bytes, file_type: str) -> Tuple[str, str]:
+    """(content hash, text) of a document, through the parse cache (runs in a worker process)"""
+    from backend.analysis_engine import extract_text
+    from backend.parse_cache import cached_extract, content_hash
+
+    resume_hash = content_hash(data)
+    return resume_hash, cached_extract(data, file_type, extract_text, resume_hash)
+
+
+class _Scorer:
+    """BatchScorer for the current position config, rebuilt when positions.json changes"""
+
+    def __init__(self):
+        self._version = None
+        self._scorer = None
+
+    def score(self, texts: List[str]) -> List[Tuple[Dict[str, float], int]]:
+        """({position: score}, experience) of each text"""
+        from backend.batch_scoring import BatchScorer
+        from backend.data_manager import get_positions_snapshot
+
+        positions, version = get_positions_snapshot()
+        if version != self._version:
+            self._scorer, self._version = BatchScorer(positions), version
+        encoded = self._scorer.encode_all(texts)
+        scores = self._scorer.score(encoded)
+        names = self._scorer.position_names
+        return [
+            (dict(zip(names, row.tolist())), resume.experience)
+            for row, resume in zip(scores, encoded)
+        ]
+
+
+def _analyze_detail(text: str, positions: List[str]) -> Dict[str, Dict]:
+    from backend.analysis_engine import analyze_resume
+
+    return {position: analyze_resume(text, position) for position in positions}
+
+
+class MicroBatcher:
+    """Coalesce concurrent scoring requests into BatchScorer passes
+
+    The first text to arrive opens a batch; the batch is scored once it
+    holds max_batch texts or max_wait seconds have passed. Batches are
+    scored one at a time on a worker thread, so texts arriving meanwhile
+    form the next batch.
+    """
+
+    def __init__(self, max_batch: int, max_wait: float, max_pending: int):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_pending = max_pending
+        self.pending = 0
+        self._queue: List[Tuple[str, asyncio.Future]] = []
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self._scorer = _Scorer()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="service-score")
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def score(self, texts: List[str]) -> List[Tuple[Dict[str, float], int]]:
+        if self.pending + len(texts) > self.max_pending:
+            raise Overloaded("texts waiting to be scored")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._queue.append((text, future))
+            futures.append(future)
+        self.pending += len(texts)
+        self._ready.set()
+        if len(self._queue) >= self.max_batch:
+            self._full.set()
+        return await asyncio.gather(*futures)
+
+    async def detail(self, text: str, positions: List[str]) -> Dict[str, Dict]:
+        """analyze_resume's breakdown per position, on the scoring thread; each position counts as a pending text"""
+        if self.pending + len(positions) > self.max_pending:
+            raise Overloaded("texts waiting to be scored")
+        self.pending += len(positions)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, _analyze_detail, text, positions)
+        finally:
+            self.pending -= len(positions)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._ready.wait()
+            if len(self._queue) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+            if not self._queue:
+                self._ready.clear()
+            if len(self._queue) < self.max_batch:
+                self._full.clear()
+            increment("service_score_batches")
+            increment("service_scored_texts", len(batch))
+            try:
+                with timer("service_score_batch"):
+                    results = await loop.run_in_executor(self._executor, self._scorer.score, [t for t, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                self.pending -= len(batch)
+
+
+# ----------------- Service -----------------
+
+class ScoringService:
+    def __init__(self, parse_workers: int = SERVICE_PARSE_WORKERS):
+        self.parse_workers = parse_workers
+        self.connections = 0
+        self.parsing = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._batcher: Optional[MicroBatcher] = None
+
+    async def serve(self, host: str, port: int, ready: Optional[asyncio.Event] = None) -> None:
+        # Spawned, not forked: forked workers would inherit the listening socket and outlive a killed server
+        self._pool = ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=multiprocessing.get_context("spawn"))
+        self._batcher = MicroBatcher(SERVICE_BATCH_SIZE, SERVICE_BATCH_WAIT_MS / 1000, SERVICE_MAX_PENDING_SCORES)
+        self._batcher.start()
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            with contextlib.suppress(NotImplementedError):  # Windows: Ctrl+C still raises KeyboardInterrupt
+                loop.add_signal_handler(signum, stop.set)
+        try:
+            server = await asyncio.start_server(self._handle_connection, host, port, backlog=SERVICE_MAX_CONNECTIONS)
+            if ready is not None:
+                ready.set()
+            try:
+                await stop.wait()
+            finally:
+                server.close()
+        finally:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                with contextlib.suppress(NotImplementedError):
+                    loop.remove_signal_handler(signum)
+            self._pool.shutdown(cancel_futures=True)
+
+    # ----------------- HTTP -----------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.connections >= SERVICE_MAX_CONNECTIONS:
+            increment("service_rejected_connections")
+            writer.write(_response(503, {"error": "Too many connections"}, keep_alive=False, retry_after=True))
+            await _close(writer)
+            return
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), SERVICE_READ_TIMEOUT_SECONDS)
+                except ServiceError as e:
+                    writer.write(_response(e.status, {"error": str(e)}, keep_alive=False))
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                status, payload = await self._dispatch(request)
+                writer.write(_response(status, payload, request.keep_alive, retry_after=status == 503))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            await _close(writer)
+
+    async def _dispatch(self, request: Request) -> Tuple[int, object]:
+        routes = {
+            ("POST", "/parse"): self.parse,
+            ("POST", "/analyze"): self.analyze,
+            ("POST", "/rank"): self.rank,
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.metrics,
+        }
+        handler = routes.get((request.method, request.path))
+        if handler is None:
+            allowed = [method for method, path in routes if path == request.path]
+            return (405, {"error": f"Use {', '.join(allowed)}"}) if allowed else (404, {"error": "Not found"})
+        try:
+            with timer(f"service{request.path.replace('/', '_')}"):
+                return 200, await handler(request)
+        except ServiceError as e:
+            if e.status == 503:
+                increment("service_rejected_busy")
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            increment("service_error")
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    # ----------------- Endpoints -----------------
+
+    async def parse(self, request: Request) -> Dict:
+        resume_hash, text = await self._parse(request)
+        return {"resume_hash": resume_hash, "text": text}
+
+    async def analyze(self, request: Request) -> Dict:
+        from backend.data_manager import get_positions
+
+        result = {}
+        if _content_type(request) == "application/json":
+            body = _json_body(request)
+            text = body.get("text")
+            if not isinstance(text, str):
+                raise ServiceError(400, 'JSON body needs a "text" string')
+            wanted = request.query.get("position") or body.get("positions") or []
+        else:
+            result["resume_hash"], text = await self._parse(request)
+            wanted = request.query.get("position", [])
+
+        known = get_positions()
+        unknown = [p for p in wanted if p not in known]
+        if unknown:
+            raise ServiceError(404, f"Unknown position(s): {', '.join(unknown)}")
+        wanted = wanted or list(known)
+        if request.query.get("detail", ["0"])[0] not in ("", "0", "false"):
+            result["scores"] = await self._batcher.detail(text, wanted)
+            return result
+        [(scores, experience)] = await self._batcher.score([text])
+        result["experience"] = experience
+        result["scores"] = {position: scores[position] for position in wanted}
+        return result
+
+    async def rank(self, request: Request) -> Dict:
+        from backend.data_manager import get_positions
+
+        body = _json_body(request)
+        position, resumes = body.get("position"), body.get("resumes")
+        if position not in get_positions():
+            raise ServiceError(404, f"Unknown position: {position}")
+        if not isinstance(resumes, list) or not all(isinstance(r, dict) and isinstance(r.get("text"), str) for r in resumes):
+            raise ServiceError(400, 'JSON body needs "resumes": [{"id": ..., "text": ...}, ...]')
+        limit = body.get("limit")
+        if limit is not None and (type(limit) is not int or limit < 0):
+            raise ServiceError(400, '"limit" must be a non-negative integer')
+        if len(resumes) > SERVICE_MAX_RANK_RESUMES:
+            raise ServiceError(413, f"At most {SERVICE_MAX_RANK_RESUMES} resumes per request")
+        scored = await self._batcher.score([r["text"] for r in resumes])
+        ranking = sorted(
+            ({"id": r.get("id", i), "resume_score": scores[position], "experience": experience}
+             for i, (r, (scores, experience)) in enumerate(zip(resumes, scored))),
+            key=lambda row: (-row["resume_score"], -row["experience"]),
+        )
+        return {"position": position, "ranking": ranking if limit is None else ranking[:limit]}
+
+    async def health(self, request: Request) -> Dict:
+        return {
+            "status": "ok",
+            "connections": self.connections,
+            "parsing": self.parsing,
+            "scoring": self._batcher.pending,
+        }
+
+    async def metrics(self, request: Request) -> str:
+        return render_prometheus()
+
+    async def _parse(self, request: Request) -> Tuple[str, str]:
+        from backend.analysis_engine import DOCX_MIME, PDF_MIME
+
+        file_type = _content_type(request)
+        if file_type not in (PDF_MIME, DOCX_MIME):
+            raise ServiceError(415, f"Send the document as {PDF_MIME} or {DOCX_MIME}")
+        if not request.body:
+            raise ServiceError(400, "Empty document")
+        if self.parsing >= SERVICE_MAX_PENDING_PARSES:
+            raise Overloaded("documents being parsed")
+        self.parsing += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pool, _parse_document, request.body, file_type
+            )
+        except Exception as e:
+            raise ServiceError(422, f"Could not read the document: {type(e).__name__}: {e}")
+        finally:
+            self.parsing -= 1
+
+
+def _content_type(request: Request) -> str:
+    return request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+def _json_body(request: Request) -> Dict:
+    try:
+        body = json.loads(request.body or b"{}")
+    except ValueError:
+        raise ServiceError(400, "Body is not valid JSON")
+    if not isinstance(body, dict):
+        raise ServiceError(400, "JSON body must be an object")
+    return body
+
+
+async def _readline(reader: asyncio.StreamReader, status: int, message: str) -> bytes:
+    """One line, refused with status when it overruns the reader's buffer limit"""
+    try:
+        return await reader.readline()
+    except ValueError:  # readline's form of LimitOverrunError
+        raise ServiceError(status, message)
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Next request on the connection, or None once the client has closed it"""
+    line = await _readline(reader, 414, "Request line too long")
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise ServiceError(400, "Malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await _readline(reader, 431, "Header line too long")
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise ServiceError(400, "Too many headers")
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise ServiceError(411, "Send a Content-Length; chunked bodies are not accepted")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise ServiceError(400, "Invalid Content-Length")
+    if length > MAX_FILE_SIZE_MB * 1024 * 1024:
+        raise ServiceError(413, f"Body too large. Max size: {MAX_FILE_SIZE_MB}MB")
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    url = urlsplit(target)
+    return Request(method.upper(), url.path, parse_qs(url.query, keep_blank_values=True), headers, body, keep_alive)
+
+
+def _response(status: int, payload: object, keep_alive: bool, retry_after: bool = False) -> bytes:
+    if isinstance(payload, str):
+        body, content_type = payload.encode(), "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body, content_type = json.dumps(payload).encode(), "application/json"
+    head = [
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if retry_after:
+        head.append("Retry-After: 1")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def _close(writer: asyncio.StreamWriter) -> None:
+    try:
+        writer.close()
+        await writer.wait_closed()
+    except ConnectionError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume parse/analyze/rank HTTP service")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--parse-workers", type=int, default=SERVICE_PARSE_WORKERS)
+    args = parser.parse_args()
+
+    print(json.dumps({"service": "scoring", "host": args.host, "port": args.port}), flush=True)
+    try:
+        asyncio.run(ScoringService(max(1, args.parse_workers)).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
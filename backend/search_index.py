@@ -0,0 +1,483 @@
+"""Full-text search over every indexed resume
+
+A persistent inverted index in the results database, built incrementally
+as resumes are parsed (backend.resume_jobs) and in batch with
+``python -m backend.resume_jobs --index-dir data/resumes``.
+
+Text is lowercased and split into tokens ("c++" and "c#" stay whole,
+"node.js" becomes the phrase "node js"). A term's postings are stored per
+block of 2**BLOCK_SHIFT consecutive doc ids as numpy arrays of doc ids,
+term frequencies and token positions, so even a term found in most
+resumes is read in a few rows, and a phrase is verified from the same
+rows. Matches are ranked with BM25.
+
+A query's cost grows with the postings it reads, not with the corpus:
+at 1M resumes (benchmarks.bench_search) selective queries take 17-27 ms,
+but a phrase or OR matching over 10% of resumes takes 110-230 ms, spent
+reading and verifying every match. Millisecond latency for those would
+need precomputed phrase postings or a top-k cutoff.
+
+Query syntax: words and "quoted phrases", AND (also implied), OR, NOT
+(or a leading -), parentheses, and "N+ years" for a minimum stated
+experience, e.g. ``kubernetes AND kafka, 5+ years``.
+"""
+import argparse
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from backend.analysis_engine import EXPERIENCE_PATTERN, NON_ASCII_PATTERN
+from backend.db import (
+    get_database_path, get_engine, search_documents_table, search_postings_table, search_terms_table,
+)
+from backend.metrics import timed
+from utils.iterables import batched
+
+BLOCK_SHIFT = 10  # 1024 documents per postings block
+INDEX_BATCH_SIZE = 500
+BM25_K1 = 1.2
+BM25_B = 0.75
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+_EXPERIENCE_FILTER = re.compile(r'(\d+)\s*\+?\s*(?:years?|yrs?)\b', re.IGNORECASE)
+_QUERY_ITEM = re.compile(r'"([^"]*)"|([()])|(-?)([^\s()"]+)')
+_OPERATORS = {"AND", "OR", "NOT"}
+_EMPTY = np.zeros(0, dtype=np.int64)
+_write_lock = threading.Lock()
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _stated_experience(text: str) -> int:
+    """Years of experience as analyze_resume reads them (first "N years" mention)"""
+    match = EXPERIENCE_PATTERN.search(NON_ASCII_PATTERN.sub(' ', text))
+    return int(match.group(1)) if match else 0
+
+
+# ----------------- Indexing -----------------
+
+@timed("search_index_documents")
+def index_documents(documents: Iterable[Tuple[str, str]]) -> int:
+    """Add (resume hash, text) pairs that are not indexed yet; returns the number added"""
+    return sum(_index_batch(batch) for batch in batched(documents, INDEX_BATCH_SIZE))
+
+
+def index_resume(resume_hash: str, text: str) -> bool:
+    """Index one resume's text (once per hash); True when it was added"""
+    return index_documents([(resume_hash, text)]) == 1
+
+
+def indexed(resume_hashes: List[str]) -> Set[str]:
+    """Those of resume_hashes that are already indexed"""
+    with get_engine().connect() as conn:
+        return _known(conn, resume_hashes)
+
+
+def _known(conn, resume_hashes: List[str]) -> set:
+    documents = search_documents_table.c
+    return set(conn.execute(select(documents.resume_hash).where(documents.resume_hash.in_(resume_hashes))).scalars())
+
+
+def _index_batch(batch: List[Tuple[str, str]]) -> int:
+    """Insert the batch's documents and merge their postings into the stored blocks, in one transaction"""
+    documents = search_documents_table.c
+    postings = search_postings_table.c
+    # Ids are assigned from max(doc_id) so postings stay in ascending doc order, so writers
+    # take turns: the lock orders this process's threads, BEGIN IMMEDIATE other processes
+    with _write_lock, get_engine().begin() as conn:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        known = _known(conn, [h for h, _ in batch])
+        next_id = (conn.execute(select(func.max(documents.doc_id))).scalar() or 0) + 1
+        # (term, block) -> [(doc id, positions)], doc ids ascending
+        new_postings: Dict[Tuple[str, int], list] = defaultdict(list)
+        doc_freq: Counter = Counter()
+        new_documents = []
+        for resume_hash, text in batch:
+            if resume_hash in known:
+                continue
+            known.add(resume_hash)
+            tokens = tokenize(text)
+            doc_id = next_id + len(new_documents)
+            new_documents.append({
+                "doc_id": doc_id, "resume_hash": resume_hash, "length": len(tokens),
+                "experience": _stated_experience(text), "indexed_at": time.time(),
+            })
+            offsets = defaultdict(list)
+            for offset, token in enumerate(tokens):
+                offsets[token].append(offset)
+            block = doc_id >> BLOCK_SHIFT
+            for term, where in offsets.items():
+                new_postings[(term, block)].append((doc_id, where))
+            doc_freq.update(offsets.keys())
+        if not new_documents:
+            return 0
+        conn.execute(insert(search_documents_table), new_documents)
+
+        stored = {}
+        terms = list(doc_freq)
+        blocks = list({block for _, block in new_postings})
+        for start in range(0, len(terms), INDEX_BATCH_SIZE):
+            for row in conn.execute(
+                select(postings.term, postings.block, postings.doc_ids, postings.freqs, postings.positions)
+                .where(postings.term.in_(terms[start:start + INDEX_BATCH_SIZE]))
+                .where(postings.block.in_(blocks))
+            ):
+                stored[(row.term, row.block)] = row
+
+        rows = []
+        for (term, block), entries in new_postings.items():
+            doc_ids = np.array([doc_id for doc_id, _ in entries], dtype=np.uint32)
+            freqs = np.array([len(where) for _, where in entries], dtype=np.uint32)
+            positions = np.array([p for _, where in entries for p in where], dtype=np.uint32)
+            old = stored.get((term, block))
+            if old is not None:
+                old_ids = np.frombuffer(old.doc_ids, dtype=np.uint32)
+                if old_ids.size and old_ids[-1] >= doc_ids[0]:
+                    raise RuntimeError(f"Postings block {term!r}/{block} is out of order")
+                doc_ids = np.concatenate([old_ids, doc_ids])
+                freqs = np.concatenate([np.frombuffer(old.freqs, dtype=np.uint32), freqs])
+                positions = np.concatenate([np.frombuffer(old.positions, dtype=np.uint32), positions])
+            rows.append({
+                "term": term, "block": block, "doc_ids": doc_ids.tobytes(),
+                "freqs": freqs.tobytes(), "positions": positions.tobytes(),
+            })
+        stmt = insert(search_postings_table)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[postings.term, postings.block],
+            set_={"doc_ids": stmt.excluded.doc_ids, "freqs": stmt.excluded.freqs, "positions": stmt.excluded.positions},
+        ), rows)
+        stmt = insert(search_terms_table)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[search_terms_table.c.term],
+            set_={"doc_freq": search_terms_table.c.doc_freq + stmt.excluded.doc_freq},
+        ), [{"term": term, "doc_freq": count} for term, count in doc_freq.items()])
+        return len(new_documents)
+
+
+# ----------------- Document statistics -----------------
+
+class _DocumentTable:
+    """Per-process copy of every document's length and stated experience, indexed by doc id
+
+    Loaded once and extended with newly indexed documents before each query.
+    """
+
+    def __init__(self):
+        self.present = np.zeros(1, dtype=bool)
+        self.lengths = np.zeros(1, dtype=np.float64)
+        self.experience = np.zeros(1, dtype=np.int32)
+        self.count = 0
+        self.total_length = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, conn) -> None:
+        documents = search_documents_table.c
+        with self._lock:
+            rows = conn.execute(
+                select(documents.doc_id, documents.length, documents.experience)
+                .where(documents.doc_id >= len(self.present))
+                .order_by(documents.doc_id)
+            ).all()
+            if not rows:
+                return
+            data = np.array(rows, dtype=np.int64)
+            size = int(data[-1, 0]) + 1
+            present = np.zeros(size, dtype=bool)
+            lengths = np.zeros(size, dtype=np.float64)
+            experience = np.zeros(size, dtype=np.int32)
+            old = len(self.present)
+            present[:old], lengths[:old], experience[:old] = self.present, self.lengths, self.experience
+            present[data[:, 0]] = True
+            lengths[data[:, 0]] = data[:, 1]
+            experience[data[:, 0]] = data[:, 2]
+            self.present, self.lengths, self.experience = present, lengths, experience
+            self.count += len(rows)
+            self.total_length += float(data[:, 1].sum())
+
+    def all_ids(self) -> np.ndarray:
+        return np.flatnonzero(self.present)
+
+
+_documents: Dict[str, _DocumentTable] = {}
+
+
+def _document_table() -> _DocumentTable:
+    return _documents.setdefault(get_database_path(), _DocumentTable())
+
+
+# ----------------- Query parsing -----------------
+
+def parse_query(query: str) -> Tuple[Optional[tuple], int]:
+    """(expression tree, minimum years of experience) of a search query; raises ValueError if malformed
+
+    Tree nodes are ("phrase", terms), ("and", nodes), ("or", nodes) and ("not", node).
+    """
+    min_experience = 0
+    for match in _EXPERIENCE_FILTER.finditer(query):
+        min_experience = max(min_experience, int(match.group(1)))
+    items = []
+    for phrase, paren, negated, word in _QUERY_ITEM.findall(_EXPERIENCE_FILTER.sub(" ", query)):
+        if paren:
+            items.append(paren)
+        elif word in _OPERATORS:
+            items.append(word)
+        else:
+            terms = tuple(tokenize(phrase or word))
+            if terms:
+                items += ["NOT", ("phrase", terms)] if negated else [("phrase", terms)]
+    if not items:
+        return None, min_experience
+
+    position = 0
+
+    def peek():
+        return items[position] if position < len(items) else None
+
+    def advance():
+        nonlocal position
+        position += 1
+        return items[position - 1]
+
+    def parse_or():
+        nodes = [parse_and()]
+        while peek() == "OR":
+            advance()
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and():
+        nodes = [parse_unary()]
+        while peek() not in (None, ")", "OR"):
+            if peek() == "AND":
+                advance()
+            nodes.append(parse_unary())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_unary():
+        if peek() == "NOT":
+            advance()
+            return ("not", parse_unary())
+        return parse_primary()
+
+    def parse_primary():
+        item = advance() if peek() is not None else None
+        if item == "(":
+            node = parse_or()
+            if peek() != ")":
+                raise ValueError("Unbalanced parentheses in query")
+            advance()
+            return node
+        if isinstance(item, tuple):
+            return item
+        raise ValueError(f"Unexpected {item or 'end of query'!r} in query")
+
+    tree = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Unexpected {peek()!r} in query")
+    return tree, min_experience
+
+
+def _positive_terms(node: tuple) -> List[str]:
+    """Terms that contribute to ranking (every term not under a NOT)"""
+    if node[0] == "phrase":
+        return list(node[1])
+    if node[0] == "not":
+        return []
+    return [term for child in node[1] for term in _positive_terms(child)]
+
+
+def _all_terms(node: tuple) -> List[str]:
+    if node[0] == "phrase":
+        return list(node[1])
+    if node[0] == "not":
+        return _all_terms(node[1])
+    return [term for child in node[1] for term in _all_terms(child)]
+
+
+# ----------------- Query evaluation -----------------
+
+def _members(values: np.ndarray, pool: np.ndarray) -> np.ndarray:
+    """Mask of the values found in pool (both sorted ascending), without re-sorting either"""
+    if not pool.size:
+        return np.zeros(len(values), dtype=bool)
+    index = np.minimum(np.searchsorted(pool, values), len(pool) - 1)
+    return pool[index] == values
+
+
+def _sorted_unique(a: np.ndarray) -> np.ndarray:
+    return a[np.concatenate(([True], a[1:] != a[:-1]))] if a.size else a
+
+
+def _intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersection of two sorted unique arrays, probing the larger with the smaller"""
+    small, large = (a, b) if len(a) <= len(b) else (b, a)
+    return small[_members(small, large)]
+
+
+class _Reader:
+    """Postings access for one query, reading only the blocks that can still match"""
+
+    def __init__(self, conn, documents: _DocumentTable, doc_freq: Dict[str, int]):
+        self.conn = conn
+        self.documents = documents
+        self.doc_freq = doc_freq
+        self._cache: Dict[Tuple[str, bool], tuple] = {}
+
+    def postings(self, term: str, within: Optional[np.ndarray] = None, positions: bool = False) -> tuple:
+        """(doc ids, freqs[, positions]) of a term, limited to the blocks of within when given"""
+        if not self.doc_freq.get(term):
+            return (_EMPTY, _EMPTY, _EMPTY) if positions else (_EMPTY, _EMPTY)
+        blocks = None if within is None else set(_sorted_unique(within >> BLOCK_SHIFT).tolist())
+        for key in ((term, True), (term, False)) if not positions else ((term, True),):
+            cached = self._cache.get(key)
+            if cached is not None and (cached[0] is None or (blocks is not None and blocks <= cached[0])):
+                return cached[1] if positions else cached[1][:2]
+
+        columns = search_postings_table.c
+        selected = [columns.doc_ids, columns.freqs] + ([columns.positions] if positions else [])
+        query = select(*selected).where(columns.term == term).order_by(columns.block)
+        if blocks is not None:
+            query = query.where(columns.block.in_(sorted(blocks)))
+        rows = self.conn.execute(query).all()
+        arrays = tuple(
+            np.concatenate([np.frombuffer(row[i], dtype=np.uint32) for row in rows]).astype(np.int64)
+            if rows else _EMPTY
+            for i in range(len(selected))
+        )
+        self._cache[(term, positions)] = (blocks, arrays)
+        return arrays
+
+    def phrase(self, terms: Sequence[str], within: Optional[np.ndarray] = None) -> np.ndarray:
+        ids = within
+        for term in sorted(set(terms), key=lambda t: self.doc_freq.get(t, 0)):  # rarest first
+            term_ids = self.postings(term, ids)[0]
+            ids = term_ids if ids is None else _intersect(ids, term_ids)
+            if not ids.size:
+                return _EMPTY
+        if len(terms) > 1:
+            ids = self._verify_phrase(terms, ids)
+        return ids
+
+    def _verify_phrase(self, terms: Sequence[str], ids: np.ndarray) -> np.ndarray:
+        """Documents among ids where the terms occur at consecutive positions"""
+        keys = None
+        for offset, term in enumerate(terms):
+            term_ids, freqs, positions = self.postings(term, ids, positions=True)
+            owners = np.repeat(term_ids, freqs)
+            # (doc id, phrase start) packed into one integer, ascending like the postings;
+            # starts are shifted to stay non-negative
+            term_keys = (owners << 32) | (positions + len(terms) - offset)
+            keys = term_keys[_members(owners, ids)] if keys is None else keys[_members(keys, term_keys)]
+            if not keys.size:
+                return _EMPTY
+        return _sorted_unique(keys >> 32)
+
+    def evaluate(self, node: tuple, within: Optional[np.ndarray] = None) -> np.ndarray:
+        kind = node[0]
+        if kind == "phrase":
+            return self.phrase(node[1], within)
+        if kind == "or":
+            ids = _EMPTY
+            for child in node[1]:
+                ids = np.union1d(ids, self.evaluate(child, within))
+            return ids
+        if kind == "not":
+            base = self.documents.all_ids() if within is None else within
+            return base[~_members(base, self.evaluate(node[1], base))]
+
+        children = [child for child in node[1] if child[0] != "not"]
+        negated = [child for child in node[1] if child[0] == "not"]
+        # Most selective clauses first, so later ones only read blocks that can still match
+        children.sort(key=lambda child: min((self.doc_freq.get(t, 0) for t in _all_terms(child)), default=0))
+        ids = within
+        for child in children:
+            ids = self.evaluate(child, ids)
+            if not ids.size:
+                return _EMPTY
+        if ids is None:
+            ids = self.documents.all_ids()
+        for child in negated:
+            ids = self.evaluate(child, ids)
+        return ids
+
+    def bm25(self, ids: np.ndarray, terms: Sequence[str]) -> np.ndarray:
+        documents = self.documents
+        average_length = documents.total_length / documents.count if documents.count else 1.0
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * documents.lengths[ids] / average_length)
+        scores = np.zeros(len(ids))
+        for term in set(terms):
+            term_ids, freqs = self.postings(term, ids)
+            if not term_ids.size:
+                continue
+            index = np.minimum(np.searchsorted(term_ids, ids), len(term_ids) - 1)
+            tf = np.where(term_ids[index] == ids, freqs[index], 0)
+            df = self.doc_freq[term]
+            idf = math.log(1 + (documents.count - df + 0.5) / (df + 0.5))
+            scores += idf * tf * (BM25_K1 + 1) / (tf + norms)
+        return scores
+
+
+@timed("search_query")
+def search(query: str, limit: int = 20, offset: int = 0) -> Dict:
+    """Run a query; returns {"total": matches, "hits": [{"resume_hash", "score", "experience"}]} best first"""
+    tree, min_experience = parse_query(query)
+    documents = _document_table()
+    with get_engine().connect() as conn:
+        documents.refresh(conn)
+        if tree is None and not min_experience:
+            return {"total": 0, "hits": []}
+        terms = list(set(_all_terms(tree))) if tree is not None else []
+        doc_freq = dict(conn.execute(
+            select(search_terms_table.c.term, search_terms_table.c.doc_freq)
+            .where(search_terms_table.c.term.in_(terms))
+        ).all()) if terms else {}
+        reader = _Reader(conn, documents, doc_freq)
+
+        ids = reader.evaluate(tree) if tree is not None else documents.all_ids()
+        if min_experience:
+            ids = ids[documents.experience[ids] >= min_experience]
+        scores = reader.bm25(ids, _positive_terms(tree)) if tree is not None else np.zeros(len(ids))
+
+        # best score first, then oldest document; only the requested page is fully sorted
+        wanted = min(len(ids), offset + limit)
+        if wanted < len(ids):
+            top = np.argpartition(-scores, wanted - 1)[:wanted]
+        else:
+            top = np.arange(len(ids))
+        top = top[np.lexsort((ids[top], -scores[top]))][offset:offset + limit]
+        page = ids[top].tolist()
+        hashes = dict(conn.execute(
+            select(search_documents_table.c.doc_id, search_documents_table.c.resume_hash)
+            .where(search_documents_table.c.doc_id.in_(page))
+        ).all()) if page else {}
+
+    return {
+        "total": int(len(ids)),
+        "hits": [
+            {"resume_hash": hashes[doc_id], "score": round(float(score), 4),
+             "experience": int(documents.experience[doc_id])}
+            for doc_id, score in zip(page, scores[top].tolist())
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the indexed resumes")
+    parser.add_argument("query", help='e.g. \'kubernetes AND kafka, 5+ years\' or \'"machine learning" -java\'')
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps(search(args.query, args.limit), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,519 @@
+"""TF-IDF similarity search over stored resumes
+
+Each indexed resume is a sparse row of sublinear term frequencies
+(1 + log tf) over an append-only vocabulary. Rows are stored on disk in
+immutable segments of .npy files that are memory-mapped, never loaded
+whole. Each segment holds its rows both by row (CSR) and by term (CSC).
+Adding resumes writes a new segment and merges equally sized tail
+segments, so there are O(log n) segments and each row is rewritten
+O(log n) times. Writers (the app, the CLI) take turns under a file lock
+and reload the manifest first; segments a crashed writer left behind are
+removed by the next one.
+
+IDF weights are applied at query time from the document frequencies,
+which are the per-term entry counts of the segments, so adding resumes
+never rewrites earlier rows or any vocabulary-sized file. Scores are the
+cosine of the TF-IDF vectors; with SIMILARITY_MAX_DF below 1, terms found
+in more than that share of a corpus of at least
+SIMILARITY_MAX_DF_MIN_DOCUMENTS resumes carry no weight. Row norms depend
+on the IDF, so they are computed per segment in chunks of
+SIMILARITY_CHUNK_NNZ entries. They are cached until the corpus has grown
+by SIMILARITY_IDF_REFRESH.
+
+A query reads only the by-term entries of its own terms. Queries are
+scored SIMILARITY_BATCH_SIZE at a time, so the batch shares each pass
+over a term's entries. Everything runs on numpy and the CPU.
+
+Two kinds of query are supported:
+- candidates similar to a stored resume (similar_candidates);
+- candidates matching a position's job description (match_position).
+
+Uploads are indexed as they are parsed (backend.resume_jobs); stored
+resumes are indexed in batch with
+``python -m backend.resume_jobs --index-dir data/resumes``.
+"""
+import argparse
+import json
+import math
+import os
+import shutil
+import threading
+import uuid
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from backend.file_lock import file_lock
+from backend.metrics import timed
+from backend.search_index import tokenize
+from config.settings import (
+    SIMILARITY_BATCH_SIZE, SIMILARITY_CHUNK_NNZ, SIMILARITY_DIR, SIMILARITY_IDF_REFRESH,
+    SIMILARITY_MAX_DF, SIMILARITY_MAX_DF_MIN_DOCUMENTS,
+)
+from utils.iterables import batched
+
+MANIFEST_FILE = "manifest.json"
+TERMS_FILE = "terms.txt"
+LOCK_FILE = "write.lock"
+SEGMENT_PREFIX = "seg-"
+INDEX_BATCH_SIZE = 5000
+LOAD_ATTEMPTS = 5
+
+Query = Tuple[np.ndarray, np.ndarray]  # (term ids, 1 + log tf)
+
+
+def _key_bytes(resume_hash: str) -> np.ndarray:
+    key = bytes.fromhex(resume_hash)
+    if len(key) != 32:
+        raise ValueError(f"Not a SHA-256 content hash: {resume_hash!r}")
+    return np.frombuffer(key, dtype=np.uint8)
+
+
+def _term_weights(tokens: List[str], terms: Dict[str, int]) -> Query:
+    """Sublinear tf of the tokens' terms that are in the vocabulary, by ascending term id"""
+    known = sorted((terms[term], count) for term, count in Counter(tokens).items() if term in terms)
+    ids = np.fromiter((term_id for term_id, _ in known), dtype=np.int32, count=len(known))
+    weights = np.fromiter((1 + math.log(count) for _, count in known), dtype=np.float32, count=len(known))
+    return ids, weights
+
+
+class _Segment:
+    """One immutable block of rows, memory-mapped from its directory
+
+    Stored twice: by row (CSR) to read a resume's vector and compute row
+    norms, and by term (CSC) so a query reads only its own terms' entries.
+    """
+
+    FILES = ("indptr", "indices", "weights", "keys", "term_indptr", "term_rows", "term_weights")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        for name in self.FILES:
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+        self.rows = len(self.keys)
+
+    @property
+    def doc_freq(self) -> np.ndarray:
+        """Rows holding each term id (up to the segment's highest term)"""
+        return np.diff(self.term_indptr)
+
+    @classmethod
+    def write(cls, path: str, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, keys: np.ndarray) -> None:
+        indices = np.asarray(indices, dtype=np.int32)
+        by_term = np.argsort(indices, kind="stable")  # rows stay ascending within a term
+        entry_rows = np.repeat(np.arange(len(keys), dtype=np.int32), np.diff(indptr))
+        term_indptr = np.zeros((int(indices.max()) + 2) if indices.size else 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=len(term_indptr) - 1), out=term_indptr[1:])
+        arrays = {
+            "indptr": np.asarray(indptr, dtype=np.int64),
+            "indices": indices,
+            "weights": np.asarray(weights, dtype=np.float32),
+            "keys": np.asarray(keys, dtype=np.uint8).reshape(-1, 32),
+            "term_indptr": term_indptr,
+            "term_rows": entry_rows[by_term],
+            "term_weights": np.asarray(weights, dtype=np.float32)[by_term],
+        }
+        tmp_path = path + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for name in cls.FILES:
+            np.save(os.path.join(tmp_path, f"{name}.npy"), arrays[name])
+        os.replace(tmp_path, path)
+
+    def row(self, index: int) -> Query:
+        start, end = int(self.indptr[index]), int(self.indptr[index + 1])
+        return np.array(self.indices[start:end]), np.array(self.weights[start:end])
+
+    def find(self, key: np.ndarray) -> Optional[int]:
+        matches = np.flatnonzero((self.keys == key).all(axis=1))
+        return int(matches[0]) if len(matches) else None
+
+    def chunks(self) -> Iterable[Tuple[int, int]]:
+        """Row ranges holding at most SIMILARITY_CHUNK_NNZ entries each (or a single longer row)"""
+        start = 0
+        while start < self.rows:
+            limit = self.indptr[start] + SIMILARITY_CHUNK_NNZ
+            end = max(start + 1, int(np.searchsorted(self.indptr, limit, side="right")) - 1)
+            end = min(end, self.rows)
+            yield start, end
+            start = end
+
+
+class SimilarityIndex:
+    """Vocabulary, document frequencies and CSR segments of one index directory
+
+    Reloaded whenever the manifest changes on disk, so a batch index run in
+    another process is picked up by the app.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.terms: Dict[str, int] = {}
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.documents = 0
+        self.segments: List[_Segment] = []
+        self._key_prefixes = np.zeros(0, dtype=np.uint64)  # sorted first 8 bytes of every key
+        self._generation = 0  # bumped by every save, so writers notice changes the file stamp misses
+        self._terms_bytes = 0
+        self._stamp = None
+        self._idf: Optional[np.ndarray] = None
+        self._idf_documents = 0
+        self._idf_generation = 0  # bumped whenever the IDF is recomputed
+        self._norms: Dict[Tuple[int, str], np.ndarray] = {}  # (IDF generation, segment name) -> row norms
+        self._lock = threading.Lock()
+
+    # ----------------- Persistence -----------------
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_FILE)
+
+    def _read_manifest(self) -> Optional[Dict]:
+        try:
+            with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _manifest_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self._manifest_path())
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def refresh(self) -> None:
+        """Reload the index if another process (or nothing yet) has loaded it since the last call"""
+        stamp = self._manifest_stamp()
+        if stamp == self._stamp:
+            return
+        with self._lock:
+            if stamp is not None and stamp != self._stamp:
+                self._load()
+
+    def _load(self) -> None:
+        # A writer may retire a segment between our reading the manifest and opening it: read again
+        for attempt in range(LOAD_ATTEMPTS):
+            stamp = self._manifest_stamp()
+            manifest = self._read_manifest()
+            try:
+                segments = [_Segment(os.path.join(self.directory, name)) for name in manifest["segments"]]
+                break
+            except FileNotFoundError:
+                if attempt == LOAD_ATTEMPTS - 1:
+                    raise
+        with open(os.path.join(self.directory, TERMS_FILE), "r", encoding="utf-8") as f:
+            terms = [line.rstrip("\n") for _, line in zip(range(manifest["terms"]), f)]
+        self.terms = {term: term_id for term_id, term in enumerate(terms)}
+        doc_freq = np.zeros(len(terms), dtype=np.int64)
+        for segment in segments:
+            counts = segment.doc_freq
+            doc_freq[:len(counts)] += counts
+        self.doc_freq = doc_freq
+        self.documents = manifest["documents"]
+        self._generation = manifest.get("generation", 0)
+        self._terms_bytes = manifest["terms_bytes"]
+        self.segments = segments
+        self._key_prefixes = np.sort(np.concatenate(
+            [np.ascontiguousarray(s.keys[:, :8]).view(np.uint64).ravel() for s in self.segments]
+            or [np.zeros(0, dtype=np.uint64)]
+        ))
+        self._norms = {key: norms for key, norms in self._norms.items() if key[1] in manifest["segments"]}
+        self._stamp = stamp
+
+    def _sync_for_write(self) -> None:
+        """Under the write lock: load what other writers saved and remove what crashed writers left"""
+        manifest = self._read_manifest()
+        if manifest is not None and manifest.get("generation", 0) != self._generation:
+            self._load()
+        current = {segment.name for segment in self.segments}
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name not in current:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _save(self, new_terms: List[str]) -> None:
+        """Append new terms, then write the manifest that makes them and the new segments current"""
+        # Lines past the last manifest's end are left from an interrupted save: overwrite them
+        path = os.path.join(self.directory, TERMS_FILE)
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.seek(self._terms_bytes)
+            f.truncate()
+            f.write("".join(f"{term}\n" for term in new_terms).encode("utf-8"))
+            self._terms_bytes = f.tell()
+        self._generation += 1
+        manifest = {
+            "generation": self._generation,
+            "terms": len(self.terms),
+            "terms_bytes": self._terms_bytes,
+            "documents": self.documents,
+            "segments": [segment.name for segment in self.segments],
+        }
+        tmp_path = self._manifest_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path())
+        self._stamp = self._manifest_stamp()
+
+    def _new_segment_path(self) -> str:
+        # Unique, so a name is never reused after a crash left a segment the manifest does not list
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{uuid.uuid4().hex}")
+
+    # ----------------- Indexing -----------------
+
+    def contains(self, resume_hash: str) -> bool:
+        prefix = _key_bytes(resume_hash)[:8].view(np.uint64)[0]
+        position = np.searchsorted(self._key_prefixes, prefix)
+        if position == len(self._key_prefixes) or self._key_prefixes[position] != prefix:
+            return False
+        return self.locate(resume_hash) is not None
+
+    def locate(self, resume_hash: str) -> Optional[Tuple[_Segment, int]]:
+        try:
+            key = _key_bytes(resume_hash)
+        except ValueError:
+            return None
+        for segment in self.segments:
+            row = segment.find(key)
+            if row is not None:
+                return segment, row
+        return None
+
+    def add(self, documents: List[Tuple[str, str]]) -> int:
+        """Write the documents that are not indexed yet as a new segment; returns the number added"""
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(os.path.join(self.directory, LOCK_FILE)), self._lock:
+            self._sync_for_write()
+            seen = set()
+            new_terms: List[str] = []
+            rows: List[Query] = []
+            keys = []
+            for resume_hash, text in documents:
+                if resume_hash in seen or self.contains(resume_hash):
+                    continue
+                seen.add(resume_hash)
+                tokens = tokenize(text)
+                for term in dict.fromkeys(tokens):
+                    if term not in self.terms:
+                        self.terms[term] = len(self.terms)
+                        new_terms.append(term)
+                rows.append(_term_weights(tokens, self.terms))
+                keys.append(_key_bytes(resume_hash))
+            if not rows:
+                return 0
+
+            indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+            np.cumsum([len(ids) for ids, _ in rows], out=indptr[1:])
+            indices = np.concatenate([ids for ids, _ in rows])
+            weights = np.concatenate([w for _, w in rows])
+            path = self._new_segment_path()
+            _Segment.write(path, indptr, indices, weights, np.stack(keys))
+
+            doc_freq = np.zeros(len(self.terms), dtype=np.int64)
+            doc_freq[:len(self.doc_freq)] = self.doc_freq
+            np.add.at(doc_freq, indices, 1)
+            self.doc_freq = doc_freq
+            self.documents += len(rows)
+            self.segments.append(_Segment(path))
+            self._key_prefixes = np.sort(np.concatenate([
+                self._key_prefixes, np.ascontiguousarray(np.stack(keys)[:, :8]).view(np.uint64).ravel(),
+            ]))
+            retired = self._merge_tail()
+            self._save(new_terms)
+            for segment in retired:
+                shutil.rmtree(segment.path, ignore_errors=True)
+            return len(rows)
+
+    def _merge_tail(self) -> List[_Segment]:
+        """Merge the last two segments while the older one is no larger; returns the replaced segments"""
+        retired = []
+        while len(self.segments) >= 2 and self.segments[-2].rows <= self.segments[-1].rows:
+            older, newer = self.segments[-2], self.segments[-1]
+            path = self._new_segment_path()
+            _Segment.write(
+                path,
+                np.concatenate([older.indptr, newer.indptr[1:] + older.indptr[-1]]),
+                np.concatenate([older.indices, newer.indices]),
+                np.concatenate([older.weights, newer.weights]),
+                np.concatenate([older.keys, newer.keys]),
+            )
+            self.segments[-2:] = [_Segment(path)]
+            retired += [older, newer]
+        return retired
+
+    # ----------------- Scoring -----------------
+
+    def _snapshot(self) -> Tuple[np.ndarray, int, List[_Segment]]:
+        """IDF (refreshed once the corpus has grown by SIMILARITY_IDF_REFRESH), its generation and the segments it covers"""
+        with self._lock:
+            stale = self._idf is None or abs(self.documents - self._idf_documents) > self._idf_documents * SIMILARITY_IDF_REFRESH
+            if stale:
+                self._idf = self._idf_for(self.doc_freq)
+                self._idf_documents = self.documents
+                self._idf_generation += 1
+                self._norms = {}
+            elif len(self._idf) < len(self.doc_freq):
+                # terms new since the snapshot get the IDF they have now; existing rows' norms are unchanged
+                self._idf = np.concatenate([self._idf, self._idf_for(self.doc_freq[len(self._idf):])])
+            return self._idf, self._idf_generation, list(self.segments)
+
+    def _idf_for(self, doc_freq: np.ndarray) -> np.ndarray:
+        idf = (np.log((1 + self.documents) / (1 + doc_freq)) + 1).astype(np.float32)
+        if SIMILARITY_MAX_DF < 1 and self.documents >= SIMILARITY_MAX_DF_MIN_DOCUMENTS:
+            idf[doc_freq > SIMILARITY_MAX_DF * self.documents] = 0
+        return idf
+
+    def _segment_norms(self, segment: _Segment, idf: np.ndarray, generation: int) -> np.ndarray:
+        # Keyed by IDF generation, so norms still being computed from a replaced IDF are never served
+        key = (generation, segment.name)
+        norms = self._norms.get(key)
+        if norms is None:
+            norms = np.zeros(segment.rows, dtype=np.float32)
+            for start, end in segment.chunks():
+                squares = np.square(segment.weights[segment.indptr[start]:segment.indptr[end]] *
+                                    idf[segment.indices[segment.indptr[start]:segment.indptr[end]]])
+                norms[start:end] = np.sqrt(_row_sums(squares, segment.indptr[start:end + 1]))
+            norms[norms == 0] = np.inf  # empty rows score 0
+            self._norms[key] = norms
+        return norms
+
+    def nearest(self, queries: Sequence[Query], limit: int,
+                exclude: Sequence[Optional[str]] = ()) -> List[List[Tuple[str, float]]]:
+        """Top (resume hash, cosine) of each query, best first, scoring SIMILARITY_BATCH_SIZE queries per pass"""
+        self.refresh()
+        idf, generation, segments = self._snapshot()
+        exclude = list(exclude) + [None] * (len(queries) - len(exclude))
+        results = []
+        for start in range(0, len(queries), SIMILARITY_BATCH_SIZE):
+            batch = queries[start:start + SIMILARITY_BATCH_SIZE]
+            results += self._nearest_batch(batch, limit, exclude[start:start + len(batch)], idf, generation, segments)
+        return results
+
+    def _nearest_batch(self, batch: Sequence[Query], limit: int, exclude: Sequence[Optional[str]],
+                       idf: np.ndarray, generation: int, segments: List[_Segment]) -> List[List[Tuple[str, float]]]:
+        # Normalized query TF-IDF weights, (batch terms x batch): sized by the queries, not the vocabulary
+        columns = []
+        for ids, weights in batch:
+            known = ids < len(idf)  # terms added after this query was vectorized
+            ids, values = ids[known], weights[known] * idf[ids[known]]
+            norm = np.linalg.norm(values)
+            columns.append((ids, values / norm if norm else np.zeros_like(values)))
+        active = np.unique(np.concatenate([ids for ids, _ in columns] + [np.zeros(0, dtype=np.int32)]))
+        matrix = np.zeros((len(active), len(batch)), dtype=np.float32)
+        for column, (ids, values) in enumerate(columns):
+            matrix[np.searchsorted(active, ids), column] = values
+        weighted = matrix.any(axis=1)  # terms with weight in at least one query
+        active, matrix = active[weighted], matrix[weighted]
+        wanted = limit + 1  # room for the excluded resume itself
+        candidates: List[List[Tuple[float, str]]] = [[] for _ in batch]
+        for segment in segments:
+            norms = self._segment_norms(segment, idf, generation)
+            scores = np.zeros((len(batch), segment.rows), dtype=np.float32)
+            for slot in np.flatnonzero(active < len(segment.term_indptr) - 1).tolist():
+                term = active[slot]
+                start, end = segment.term_indptr[term], segment.term_indptr[term + 1]
+                if start == end:
+                    continue
+                rows = np.asarray(segment.term_rows[start:end])
+                values = np.asarray(segment.term_weights[start:end]) * idf[term]
+                for column in np.flatnonzero(matrix[slot]).tolist():
+                    scores[column, rows] += values * matrix[slot, column]
+            scores /= norms
+            for column, column_scores in enumerate(scores):
+                top = np.argpartition(-column_scores, wanted - 1)[:wanted] if segment.rows > wanted else np.arange(segment.rows)
+                candidates[column] += [
+                    (float(column_scores[row]), bytes(segment.keys[row]).hex()) for row in top if column_scores[row] > 0
+                ]
+        return [
+            [(resume_hash, round(score, 4)) for score, resume_hash in sorted(found, key=lambda c: (-c[0], c[1]))
+             if resume_hash != excluded][:limit]
+            for found, excluded in zip(candidates, exclude)
+        ]
+
+
+def _row_sums(values: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+    """Per-row sums of CSR values (rows x ... like values' trailing shape), rows given by indptr"""
+    lengths = np.diff(indptr)
+    sums = np.zeros((len(lengths),) + values.shape[1:], dtype=np.float32)
+    nonempty = lengths > 0
+    if values.size:
+        sums[nonempty] = np.add.reduceat(values, (indptr[:-1] - indptr[0])[nonempty], axis=0)
+    return sums
+
+
+_index = SimilarityIndex(SIMILARITY_DIR)
+
+
+def get_similarity_index() -> SimilarityIndex:
+    return _index
+
+
+@timed("similarity_index_documents")
+def index_documents(documents: Iterable[Tuple[str, str]]) -> int:
+    """Add (resume hash, text) pairs that are not indexed yet; returns the number added"""
+    return sum(_index.add(batch) for batch in batched(documents, INDEX_BATCH_SIZE))
+
+
+def index_resume(resume_hash: str, text: str) -> bool:
+    """Index one resume's text (once per hash); True when it was added"""
+    return index_documents([(resume_hash, text)]) == 1
+
+
+def indexed(resume_hashes: List[str]) -> Set[str]:
+    """Those of resume_hashes that are already indexed"""
+    _index.refresh()
+    return {h for h in resume_hashes if _index.contains(h)}
+
+
+def count_indexed() -> int:
+    _index.refresh()
+    return _index.documents
+
+
+@timed("similarity_similar_candidates")
+def similar_candidates(resume_hashes: List[str], limit: int = 10) -> Dict[str, List[Tuple[str, float]]]:
+    """Most similar other indexed resumes for each of resume_hashes; unindexed hashes map to []"""
+    _index.refresh()
+    located = {h: _index.locate(h) for h in resume_hashes}
+    known = [h for h, where in located.items() if where is not None]
+    queries = [located[h][0].row(located[h][1]) for h in known]
+    found = dict(zip(known, _index.nearest(queries, limit, exclude=known)))
+    return {h: found.get(h, []) for h in resume_hashes}
+
+
+@timed("similarity_match_texts")
+def match_texts(texts: List[str], limit: int = 10) -> List[List[Tuple[str, float]]]:
+    """Indexed resumes most similar to each free text (e.g. a job description), best first"""
+    _index.refresh()
+    queries = [_term_weights(tokenize(text), _index.terms) for text in texts]
+    return _index.nearest(queries, limit)
+
+
+def match_position(position: str, limit: int = 10) -> List[Tuple[str, float]]:
+    """Indexed resumes best matching the job description attached to a position"""
+    from backend.data_manager import get_positions
+
+    description = get_positions().get(position, {}).get("description", "").strip()
+    if not description:
+        raise ValueError(f"Position '{position}' has no job description")
+    return match_texts([description], limit)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find similar candidates")
+    parser.add_argument("--like", nargs="+", default=[], help="resume hashes to find similar candidates for")
+    parser.add_argument("--position", help="match the job description of this position")
+    parser.add_argument("--text", help="match this free text")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.like:
+        print(json.dumps(similar_candidates(args.like, args.limit), indent=2))
+    if args.position:
+        print(json.dumps(match_position(args.position, args.limit), indent=2))
+    if args.text:
+        print(json.dumps(match_texts([args.text], args.limit)[0], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import re
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from backend.data_manager import get_positions_snapshot
+
+_WORD_RUN = re.compile(r'\w+')
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class SkillMatcher:
+    """Precompiled multi-skill matcher for one position
+
+    Reproduces ``re.findall(r'\\b(skill1|skill2|...)\\b', text, re.IGNORECASE)``
+    without the per-position alternation: skills are indexed by their first
+    word, so the text is tokenized once and each word costs a dict lookup no
+    matter how many skills the position lists. Ties at the same offset go to
+    the skill listed first, exactly like regex alternation.
+    """
+
+    def __init__(self, required_skills: List[str], preferred_skills: List[str]):
+        self.required_skills = list(required_skills)
+        self.preferred_skills = list(preferred_skills)
+        self.skills = [s for s in self.required_skills + self.preferred_skills if s]
+        self.normalized = [s.strip().title() for s in self.skills]
+
+        required = set(self.required_skills)
+        preferred = set(self.preferred_skills)
+        self.is_required = [n in required for n in self.normalized]
+        self.is_preferred = [n in preferred for n in self.normalized]
+
+        # first word of the skill -> [(skill index, lowered skill)] in alternation order
+        self._by_first_word: Dict[str, list] = defaultdict(list)
+        # skills starting with punctuation (".NET") -> keyed by their first character
+        self._by_first_char: Dict[str, list] = defaultdict(list)
+        seen = set()
+        for index, skill in enumerate(self.skills):
+            lowered = skill.lower()
+            if lowered in seen:
+                continue
+            seen.add(lowered)
+            if _is_word(lowered[0]):
+                first_word = _WORD_RUN.match(lowered).group()
+                self._by_first_word[first_word].append((index, lowered))
+            else:
+                self._by_first_char[lowered[0]].append((index, lowered))
+        self.max_length = max((len(s) for s in seen), default=0)
+
+    def match_at(self, text: str, start: int, candidates: list):
+        for index, skill in candidates:
+            end = start + len(skill)
+            if not text.startswith(skill, start):
+                continue
+            # trailing \b: word-ness must change between the last matched char and the next one
+            if _is_word(skill[-1]) != (end < len(text) and _is_word(text[end])):
+                return index, end
+        return None
+
+    def occurrences(self, text: str) -> List[Tuple[int, int, int]]:
+        """Every boundary-valid (start, end, skill index) occurrence in lowered text, overlaps included"""
+        found = []
+        for run in _WORD_RUN.finditer(text):
+            for start, candidates in ((run.start(), self._by_first_word.get(run.group())),
+                                      (run.end(), self._by_first_char.get(text[run.end():run.end() + 1]))):
+                for index, skill in candidates or ():
+                    end = start + len(skill)
+                    if text.startswith(skill, start) and \
+                            _is_word(skill[-1]) != (end < len(text) and _is_word(text[end])):
+                        found.append((start, end, index))
+        return found
+
+    def scanner(self) -> "SkillScan":
+        """Incremental scan over text arriving in chunks (e.g. PDF pages)"""
+        return SkillScan(self)
+
+    def find(self, text: str) -> List[int]:
+        """Indices (into ``self.skills``) of every non-overlapping skill match, in text order"""
+        scan = self.scanner()
+        scan.feed(text)
+        scan.finish()
+        return scan.matches
+
+
+class SkillScan:
+    """Streaming state of one SkillMatcher pass
+
+    Chunks are buffered only until every skill that could start in them is
+    decided, so matches spanning chunk boundaries are found exactly as if
+    the chunks had been concatenated.
+    """
+
+    def __init__(self, matcher: SkillMatcher):
+        self.matcher = matcher
+        self.matches: List[int] = []
+        self.required_hits = 0
+        self.preferred_hits = 0
+        self._buffer = ""
+        self._cursor = 0  # end of the last match, relative to the buffer
+        self._start_done = False  # the first buffered word was already checked as a skill start
+
+    def feed(self, chunk: str) -> None:
+        self._buffer += chunk.lower()
+        self._consume(final=False)
+
+    def finish(self) -> None:
+        self._consume(final=True)
+        self._buffer = ""
+
+    def _record(self, hit) -> None:
+        self.matches.append(hit[0])
+        self.required_hits += self.matcher.is_required[hit[0]]
+        self.preferred_hits += self.matcher.is_preferred[hit[0]]
+        self._cursor = hit[1]
+
+    def _consume(self, final: bool) -> None:
+        matcher = self.matcher
+        text = self._buffer
+        # offsets past this point may still be extended by the next chunk
+        limit = len(text) if final else len(text) - matcher.max_length - 1
+        resume_at = len(text)
+        for run in _WORD_RUN.finditer(text):
+            start = run.start()
+            if start > limit:
+                resume_at = start
+                break
+            if self._start_done:
+                self._start_done = False
+            elif start >= self._cursor:
+                candidates = matcher._by_first_word.get(run.group())
+                if candidates:
+                    hit = matcher.match_at(text, start, candidates)
+                    if hit:
+                        self._record(hit)
+
+            end = run.end()
+            if end > limit:
+                # the word may continue in the next chunk: keep it buffered
+                resume_at = start
+                self._start_done = True
+                break
+            if matcher._by_first_char and end >= self._cursor and end < len(text):
+                candidates = matcher._by_first_char.get(text[end])
+                if candidates:
+                    hit = matcher.match_at(text, end, candidates)
+                    if hit:
+                        self._record(hit)
+
+        self._buffer = text[resume_at:]
+        self._cursor = max(0, self._cursor - resume_at)
+
+
+# (position, config version) -> matcher; stale versions are dropped on the next build
+_matchers: Dict[Tuple[str, int], SkillMatcher] = {}
+_matchers_lock = Lock()
+
+
+def get_skill_matcher(position: str) -> SkillMatcher:
+    """Cached matcher for a position, rebuilt once per position config version"""
+    positions, version = get_positions_snapshot()
+    key = (position, version)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        config = positions[position]
+        matcher = SkillMatcher(config["required_skills"], config["preferred_skills"])
+        with _matchers_lock:
+            for stale in [k for k in _matchers if k[1] != version]:
+                del _matchers[stale]
+            _matchers[key] = matcher
+    return matcher
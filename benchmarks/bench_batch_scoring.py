@@ -0,0 +1,96 @@
+"""Batch scoring: analyze_resume per (resume, position) vs the vectorized BatchScorer
+
+Usage: python -m benchmarks.bench_batch_scoring [--resumes 10000] [--positions 200] [--skills 2000]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from backend import data_manager
+from backend.analysis_engine import analyze_resume
+from backend.batch_scoring import BatchScorer
+from benchmarks.bench_skill_matcher import make_resume, make_vocabulary
+
+# Overlapping names exercise the exact fix-up path ("Machine Learning" vs "Learning")
+OVERLAPPING = ["Machine", "Machine Learning", "Learning", "Deep Learning", "Learning Systems"]
+
+
+def make_positions(count: int, vocabulary: list, rng: random.Random) -> dict:
+    positions = {}
+    for p in range(count):
+        skills = rng.sample(vocabulary, rng.randint(4, 16)) + rng.sample(OVERLAPPING, rng.randint(0, 3))
+        rng.shuffle(skills)
+        split = rng.randint(1, len(skills))
+        positions[f"Position {p}"] = {
+            "required_skills": skills[:split],
+            # an occasional lower-case entry keeps the .title() membership quirk covered
+            "preferred_skills": [s.lower() if rng.random() < 0.1 else s for s in skills[split:]],
+            "technical": [], "behavioral": [], "situational": [],
+        }
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--positions", type=int, default=200)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--resume-kb", type=int, default=4)
+    parser.add_argument("--verify", type=int, default=200, help="resumes checked against analyze_resume")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    vocabulary = make_vocabulary(args.skills, rng)
+    positions = make_positions(args.positions, vocabulary, rng)
+    texts = [make_resume(vocabulary + OVERLAPPING, args.resume_kb, rng) for _ in range(args.resumes)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        data_manager.POSITIONS_FILE = os.path.join(directory, "positions.json")
+        data_manager.save_positions(positions)
+
+        start = time.perf_counter()
+        scorer = BatchScorer()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        encoded = scorer.encode_all(texts)
+        encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = scorer.score(encoded)
+        score = time.perf_counter() - start
+
+        sample = texts[:args.verify]
+        start = time.perf_counter()
+        expected = np.array([
+            [analyze_resume(text, name)["resume_score"] for name in scorer.position_names] for text in sample
+        ])
+        scalar = time.perf_counter() - start
+        mismatches = int(np.count_nonzero(expected != scores[:len(sample)]))
+        assert mismatches == 0, f"{mismatches} scores differ from analyze_resume"
+
+    pairs = args.resumes * args.positions
+    scalar_per_pair = scalar / max(1, len(sample) * args.positions)
+    print(json.dumps({
+        "benchmark": "batch_scoring",
+        "resumes": args.resumes,
+        "positions": args.positions,
+        "vocabulary": len(scorer.vocabulary),
+        "overlapping_resumes": sum(1 for e in encoded if e.overlapping_pairs),
+        "build_ms": round(build * 1000, 3),
+        "encode_s": round(encode, 3),
+        "score_s": round(score, 3),
+        "pairs_per_sec": round(pairs / (encode + score)),
+        "scalar_pairs_per_sec": round(1 / scalar_per_pair),
+        "speedup": round(scalar_per_pair * pairs / (encode + score), 2),
+        "verified_pairs": len(sample) * args.positions,
+    }))
+
+
+if __name__ == "__main__":
+    main()
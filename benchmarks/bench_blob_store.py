@@ -0,0 +1,69 @@
+"""Resume blob store: write, dedup and read latency, counting, and garbage collection as the store grows
+
+Blobs are small synthetic PDFs. count_index is the index-file count the
+admin panel shows, count_listing walks every shard instead. The garbage
+collection pass scans the whole store but removes nothing, since every
+blob is younger than the grace period.
+
+Usage: python -m benchmarks.bench_blob_store [--sizes 10000 100000 1000000] [--repeat 200]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from backend import blob_store, results_store
+from benchmarks.corpus import make_pdf, make_resume_text
+from benchmarks.run_suite import stats, time_calls
+from config.settings import RESULTS_DB
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    # A trailing PDF comment makes each blob distinct without rendering a new document
+    template = make_pdf(make_resume_text(rng, 1))
+    with tempfile.TemporaryDirectory() as tmp:
+        results_store.use_database(os.path.join(tmp, "results.db"))
+        store = blob_store.BlobStore(os.path.join(tmp, "resumes"))
+        filled = 0
+        for size in sorted(args.sizes):
+            start = time.perf_counter()
+            for i in range(filled, size):
+                store.put(template + f"% {i}\n".encode())
+            fill_rate = round((size - filled) / (time.perf_counter() - start))
+            filled = size
+
+            new = [(template + f"% new {size} {i}\n".encode(),) for i in range(args.repeat)]
+            timings = {
+                "put_new": time_calls(store.put, new),
+                "put_duplicate": time_calls(store.put, new),
+                "get": time_calls(store.get, [(store.put(data),) for data, in new]),
+                "count_index": time_calls(store.stats, [() for _ in range(args.repeat)]),
+                "count_listing": time_calls(lambda: sum(1 for _ in store.keys()), [()]),
+            }
+            start = time.perf_counter()
+            collected = store.collect_garbage()
+            gc_seconds = time.perf_counter() - start
+
+            footprint = store.stats()
+            for operation, calls in timings.items():
+                print(json.dumps({
+                    "benchmark": "blob_store", "blobs": footprint["blobs"], "operation": operation, **stats(calls),
+                }), flush=True)
+            print(json.dumps({
+                "benchmark": "blob_store", "blobs": footprint["blobs"], "operation": "fill_and_gc",
+                "fill_per_s": fill_rate, "gc_s": round(gc_seconds, 2), "gc_scanned": collected["scanned"],
+                "compression_ratio": round(footprint["stored_bytes"] / footprint["bytes"], 3),
+            }), flush=True)
+        results_store.use_database(RESULTS_DB)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Cold-start import cost of the app: main.py alone, each page's first visit, and every page eagerly
+
+Each measurement runs in a fresh interpreter. "eager" imports every page
+module, as main.py did before pages were loaded on demand.
+
+Usage: python -m benchmarks.bench_import_time [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from main import PAGES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("pandas", "numpy", "sqlalchemy", "PyPDF2", "docx", "smtplib")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import main
+{extra}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def measure(modules: list, runs: int) -> dict:
+    extra = "\n".join(f"import {module}" for module in modules)
+    code = PROBE.format(extra=extra, heavy=HEAVY)
+    timings, loaded = [], ""
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(out[0]))
+        loaded = out[1] if len(out) > 1 else ""
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 1),
+        "min_ms": round(min(timings) * 1000, 1),
+        "heavy_modules": loaded.split(",") if loaded else [],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    modules = list(dict.fromkeys(module for module, _ in PAGES.values()))
+    scenarios = [("startup", [])]
+    scenarios += [(f"first visit: {menu}", [module]) for menu, (module, _) in PAGES.items()]
+    scenarios.append(("eager (all pages)", modules))
+    for name, imported in scenarios:
+        print(json.dumps({"benchmark": "import_time", "scenario": name, **measure(imported, args.runs)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Leaderboard (top-K per position) latency at increasing results-store sizes
+
+Usage: python -m benchmarks.bench_leaderboard [--sizes 10000 100000 1000000]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from backend import results_store
+from benchmarks.corpus import populate_results
+from config.settings import RESULTS_DB
+
+POSITION = "Software Engineer"
+
+
+def query_plan() -> str:
+    """SQLite plan for the leaderboard query, to confirm no temp B-tree sort is needed"""
+    with results_store.get_engine().connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM results WHERE position = 'x' "
+            "ORDER BY resume_score DESC, experience DESC, timestamp, id LIMIT 50"
+        )).fetchall()
+    return "; ".join(row[-1] for row in plan)
+
+
+def measure(limit: int, offset: int, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page = results_store.top_candidates(POSITION, limit=limit, offset=offset)
+        timings.append(time.perf_counter() - start)
+    scores = list(page["Resume Score"])
+    assert scores == sorted(scores, reverse=True)
+    timings.sort()
+    return {"p50_ms": timings[len(timings) // 2] * 1000, "p99_ms": timings[int(len(timings) * 0.99) - 1] * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            results_store.use_database(os.path.join(tmp, f"results_{size}.db"))
+            populate_results(size)
+            for page in (1, 20):
+                stats = measure(args.limit, (page - 1) * args.limit, args.repeat)
+                print(json.dumps({
+                    "benchmark": "leaderboard",
+                    "rows": size,
+                    "page": page,
+                    "limit": args.limit,
+                    "candidates": results_store.count_candidates(POSITION),
+                    "plan": query_plan(),
+                    **{k: round(v, 4) for k, v in stats.items()},
+                }))
+        results_store.use_database(RESULTS_DB)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Candidate Portal lookup latency at increasing results-store sizes
+
+Usage: python -m benchmarks.bench_portal_lookup [--sizes 10000 100000 1000000]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from backend import results_store
+from benchmarks.corpus import populate_results
+from config.settings import RESULTS_DB
+
+def query_plan() -> str:
+    """SQLite plan for the portal query, to confirm it is index-served"""
+    with results_store.get_engine().connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM results WHERE interview_id = 'x' AND email = 'y'"
+        )).fetchall()
+    return "; ".join(row[-1] for row in plan)
+
+
+def measure(probes: list, lookups: int, seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    timings = []
+    for _ in range(lookups):
+        email, interview_id = rng.choice(probes)
+        start = time.perf_counter()
+        found = results_store.find_results(email, interview_id)
+        timings.append(time.perf_counter() - start)
+        assert len(found) == 1
+    timings.sort()
+    return {
+        "p50_ms": timings[len(timings) // 2] * 1000,
+        "p99_ms": timings[int(len(timings) * 0.99) - 1] * 1000,
+        "mean_ms": sum(timings) / len(timings) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            results_store.use_database(os.path.join(tmp, f"results_{size}.db"))
+            build_start = time.perf_counter()
+            probes = populate_results(size)
+            build_seconds = time.perf_counter() - build_start
+            stats = measure(probes, args.lookups)
+            print(json.dumps({
+                "benchmark": "portal_lookup",
+                "rows": size,
+                "populate_s": round(build_seconds, 2),
+                "plan": query_plan(),
+                **{k: round(v, 4) for k, v in stats.items()},
+            }))
+        results_store.use_database(RESULTS_DB)
+
+
+if __name__ == "__main__":
+    main()
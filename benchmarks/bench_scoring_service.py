@@ -0,0 +1,171 @@
+"""Scoring service throughput and latency under concurrent load on localhost
+
+Starts python -m backend.scoring_service on a free port, then keeps
+--concurrency keep-alive connections busy for --duration seconds with a
+mix of requests: /analyze with resume text (micro-batched scoring),
+/analyze with a PDF upload (parse pool, then scoring) and /rank over
+--rank-size resume texts. Reports requests/s and latency percentiles per
+endpoint and overall; 503s are counted as shed load, not errors.
+
+Usage: python -m benchmarks.bench_scoring_service [--concurrency 8 64 256] [--duration 10] [--mix text=8,pdf=1,rank=1]
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+from urllib.parse import urlencode
+
+from backend.analysis_engine import PDF_MIME
+from backend.data_manager import get_positions
+from benchmarks.corpus import make_pdf, make_resume_text
+from benchmarks.run_suite import stats
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def build_requests(rng: random.Random, rank_size: int) -> Dict[str, List[Tuple[str, str, bytes]]]:
+    """(target, content type, body) samples per request kind"""
+    positions = list(get_positions())
+    texts = [make_resume_text(rng, 1) for _ in range(200)]
+    return {
+        "text": [
+            ("/analyze", "application/json", json.dumps({"text": text}).encode())
+            for text in texts
+        ],
+        "pdf": [
+            (f"/analyze?{urlencode({'position': rng.choice(positions)})}", PDF_MIME, make_pdf(text))
+            for text in texts[:20]
+        ],
+        "rank": [
+            ("/rank", "application/json", json.dumps({
+                "position": rng.choice(positions), "limit": 10,
+                "resumes": [{"id": i, "text": rng.choice(texts)} for i in range(rank_size)],
+            }).encode())
+            for _ in range(10)
+        ],
+    }
+
+
+async def request(reader, writer, target: str, content_type: str, body: bytes) -> Tuple[int, bool]:
+    """(status, whether the server keeps the connection open)"""
+    writer.write(
+        f"POST {target} HTTP/1.1\r\nHost: localhost\r\nContent-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("server closed the connection")
+    status = int(status_line.split()[1])
+    length, keep_alive = 0, True
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "connection":
+            keep_alive = value.strip().lower() != "close"
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def client(port: int, deadline: float, kinds: List[str], samples, rng, timings, counts) -> None:
+    writer = None
+    while time.perf_counter() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        kind = rng.choice(kinds)
+        start = time.perf_counter()
+        try:
+            status, keep_alive = await request(reader, writer, *rng.choice(samples[kind]))
+        except ConnectionError:
+            status, keep_alive = None, False
+        if status == 200:
+            timings[kind].append(time.perf_counter() - start)
+        else:
+            counts["rejected" if status == 503 else "errors"] += 1
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(port: int, concurrency: int, duration: float, kinds: List[str], samples, seed: int):
+    timings = {kind: [] for kind in set(kinds)}
+    counts = {"rejected": 0, "errors": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, start + duration, kinds, samples, random.Random(seed + i), timings, counts)
+        for i in range(concurrency)
+    ))
+    return timings, counts, time.perf_counter() - start
+
+
+def wait_for_health(port: int, timeout: float = 30) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as s:
+                s.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+                if s.recv(64).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("scoring service did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 64, 256])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--mix", default="text=8,pdf=1,rank=1")
+    parser.add_argument("--rank-size", type=int, default=50)
+    parser.add_argument("--parse-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    kinds = []
+    for part in args.mix.split(","):
+        kind, _, weight = part.partition("=")
+        kinds += [kind] * int(weight or 1)
+    samples = build_requests(random.Random(11), args.rank_size)
+
+    port = free_port()
+    command = [sys.executable, "-m", "backend.scoring_service", "--port", str(port)]
+    if args.parse_workers:
+        command += ["--parse-workers", str(args.parse_workers)]
+    service = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_health(port)
+        asyncio.run(run_load(port, 4, 1, kinds, samples, 0))  # warm up workers and the scorer
+        for concurrency in args.concurrency:
+            timings, counts, elapsed = asyncio.run(run_load(port, concurrency, args.duration, kinds, samples, concurrency))
+            every = [t for kind in timings.values() for t in kind]
+            for kind, calls in sorted(timings.items()):
+                if calls:
+                    print(json.dumps({
+                        "benchmark": "scoring_service", "concurrency": concurrency, "endpoint": kind,
+                        "requests_per_s": round(len(calls) / elapsed, 1), **stats(calls),
+                    }), flush=True)
+            print(json.dumps({
+                "benchmark": "scoring_service", "concurrency": concurrency, "endpoint": "all",
+                "requests_per_s": round(len(every) / elapsed, 1), **counts, **(stats(every) if every else {}),
+            }), flush=True)
+    finally:
+        service.terminate()
+        service.wait()
+
+
+if __name__ == "__main__":
+    main()
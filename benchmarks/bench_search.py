@@ -0,0 +1,90 @@
+"""Resume search latency at increasing corpus sizes
+
+Indexes synthetic resumes in batches, then times boolean, phrase,
+negated and experience-filtered queries against the full index. Each
+resume mentions a few skills drawn with Zipf-like weights from a wider
+technology vocabulary, so common and rare terms both occur.
+
+Usage: python -m benchmarks.bench_search [--sizes 10000 100000 1000000] [--pages 1]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from backend import results_store, search_index
+from benchmarks.corpus import all_skills, make_resume_text
+from config.settings import RESULTS_DB
+
+TECHNOLOGIES = all_skills() + [
+    "Kafka", "Spark", "Airflow", "Terraform", "Go", "Rust", "Scala", "React", "Node.js", "C++", "C#",
+    "Tableau", "Snowflake", "Redis", "PostgreSQL", "MongoDB", "GraphQL", "Ansible", "Jenkins", "Hadoop",
+    "Deep Learning", "NLP", "Computer Vision", "Pandas", "Flask", "Django", "Linux", "Git", "Azure", "GCP",
+]
+SKILLS_PER_RESUME = 6
+QUERIES = [
+    "python",
+    "kubernetes AND kafka",
+    "kubernetes AND kafka, 5+ years",
+    '"machine learning"',
+    "sql OR tableau",
+    "aws -java",
+    '("deep learning" OR pytorch) AND statistics, 10+ years',
+]
+
+
+def make_document(rng: random.Random, pages: int) -> str:
+    weights = [1 / rank for rank in range(1, len(TECHNOLOGIES) + 1)]
+    skills = sorted(set(rng.choices(TECHNOLOGIES, weights, k=SKILLS_PER_RESUME)))
+    return make_resume_text(rng, pages, skills)
+
+
+def measure(query: str, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = search_index.search(query, limit=20)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "matches": result["total"],
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 3),
+        "p99_ms": round(timings[max(0, int(len(timings) * 0.99) - 1)] * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results_store.use_database(os.path.join(tmp, "search.db"))
+        rng = random.Random(13)
+        indexed = 0
+        index_seconds = 0.0
+        for size in sorted(args.sizes):
+            start = time.perf_counter()
+            indexed += search_index.index_documents(
+                (f"doc{i}", make_document(rng, args.pages)) for i in range(indexed, size)
+            )
+            index_seconds += time.perf_counter() - start
+            search_index.search("warmup")  # loads the per-process document table
+            for query in QUERIES:
+                print(json.dumps({
+                    "benchmark": "search",
+                    "documents": indexed,
+                    "docs_per_s": round(indexed / index_seconds),
+                    "db_mb": round(os.path.getsize(os.path.join(tmp, "search.db")) / 2 ** 20, 1),
+                    "query": query,
+                    **measure(query, args.repeat),
+                }))
+        results_store.use_database(RESULTS_DB)
+
+
+if __name__ == "__main__":
+    main()
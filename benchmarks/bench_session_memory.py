@@ -0,0 +1,130 @@
+"""Per-session memory of the interview state: legacy dict-based state vs the slotted InterviewState
+
+Usage: python -m benchmarks.bench_session_memory [--sessions 2000] [--answer-chars 80 2000]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from backend import data_manager, results_store
+from backend.question_pool import get_question_pool
+from config.settings import RESULTS_DB
+from utils.session_manager import InterviewState
+
+ANSWERED = 5
+
+
+class LegacyInterviewState:
+    """The InterviewState this package shipped before the compact rewrite"""
+
+    def __init__(self):
+        self.stage = "registration"
+        self.questions = []
+        self.answers = []
+        self.current_qindex = 0
+        self.position = ""
+        self.user_info = {
+            "name": "", "email": "", "phone": "", "experience": 0,
+            "resume_path": "", "resume_hash": "", "skills": [], "resume_score": 0,
+            "experience_mismatch": False, "interview_id": str(uuid.uuid4()),
+        }
+        self.question_start_time = datetime.now()
+        self.validation_errors = []
+        self.auth_token = ""
+        self.results_saved = False
+
+
+def make_answer(rng: random.Random, chars: int) -> str:
+    words = ["model", "data", "pipeline", "latency", "tradeoff", "because", "we", "measured", "the"]
+    answer, length = [], 0
+    while length < chars:
+        answer.append(rng.choice(words))
+        length += len(answer[-1]) + 1
+    return " ".join(answer)
+
+
+def legacy_session(i: int, position: str, config_json: str, rng: random.Random, chars: int):
+    # Every script run re-read positions.json, so each session held its own question copies
+    config = json.loads(config_json)[position]
+    state = LegacyInterviewState()
+    state.position = position
+    state.user_info.update({
+        "name": f"Candidate {i}", "email": f"candidate{i}@example.com", "phone": "+15550100",
+        "experience": 5, "resume_path": f"data/resumes/candidate{i}.pdf", "resume_hash": uuid.uuid4().hex * 2,
+        "skills": ["Python", "Sql", "Statistics"], "resume_score": 72.5,
+        "required_matches": ["Python", "Statistics"], "preferred_matches": ["Pytorch"],
+    })
+    state.questions = random.sample(config["technical"] + config["behavioral"], ANSWERED)
+    for question, _ in state.questions:
+        state.answers.append((question, make_answer(rng, chars)))
+        state.current_qindex += 1
+    return state
+
+
+def compact_session(i: int, position: str, rng: random.Random, chars: int):
+    state = InterviewState()
+    state.position = position
+    info = state.user_info
+    info.name, info.email, info.phone = f"Candidate {i}", f"candidate{i}@example.com", "+15550100"
+    info.experience, info.resume_path, info.resume_hash = 5, f"data/resumes/candidate{i}.pdf", uuid.uuid4().hex * 2
+    info.skills, info.resume_score = ("Python", "Sql", "Statistics"), 72.5
+    version, pool = get_question_pool(position)
+    state.set_questions(version, random.sample(range(len(pool)), ANSWERED))
+    for _ in range(ANSWERED):
+        state.record_answer(make_answer(rng, chars))
+        state.current_qindex += 1
+    return state
+
+
+def measure(factory, sessions: int) -> dict:
+    factory(-1)  # warm caches (question pool, statement cache) outside the measurement
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    kept = [factory(i) for i in range(sessions)]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return {"bytes_per_session": round(used / sessions), "ms_per_session": round(elapsed / sessions * 1000, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--answer-chars", type=int, nargs="+", default=[80, 2000])
+    args = parser.parse_args()
+
+    position = "Data Scientist"
+    positions = data_manager.default_positions()
+    config_json = json.dumps(positions)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager.POSITIONS_FILE = os.path.join(tmp, "positions.json")
+        data_manager.save_positions(positions)
+        results_store.use_database(os.path.join(tmp, "results.db"))
+        for chars in args.answer_chars:
+            rng = random.Random(5)
+            legacy = measure(lambda i: legacy_session(i, position, config_json, rng, chars), args.sessions)
+            compact = measure(lambda i: compact_session(i, position, rng, chars), args.sessions)
+            print(json.dumps({
+                "benchmark": "session_memory",
+                "sessions": args.sessions,
+                "answer_chars": chars,
+                "legacy": legacy,
+                "compact": compact,
+                "reduction": round(legacy["bytes_per_session"] / max(1, compact["bytes_per_session"]), 2),
+            }))
+        results_store.use_database(RESULTS_DB)
+
+
+if __name__ == "__main__":
+    main()
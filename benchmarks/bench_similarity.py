@@ -0,0 +1,86 @@
+"""TF-IDF similarity search latency at increasing corpus sizes
+
+Indexes synthetic resumes (the bench_search corpus) in batches, then
+times "find candidates like this one" and job-description matching, one
+query at a time and SIMILARITY_BATCH_SIZE queries per pass, plus adding a
+single resume to the full index.
+
+Usage: python -m benchmarks.bench_similarity [--sizes 10000 100000 1000000] [--repeat 20]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+
+from backend import similarity
+from benchmarks.bench_search import make_document
+from benchmarks.run_suite import stats, time_calls
+from config.settings import SIMILARITY_BATCH_SIZE
+
+DESCRIPTIONS = [
+    "Data engineer to build streaming pipelines with Kafka, Spark and Airflow; strong SQL and Python",
+    "Machine learning engineer with deep learning, PyTorch and NLP experience, deploying models on AWS",
+    "Frontend developer: React, GraphQL, Node.js, testing and accessibility",
+    "Platform engineer running Kubernetes and Terraform on GCP, Linux and Jenkins CI",
+]
+
+
+def document_hash(i: int) -> str:
+    return hashlib.sha256(f"similarity-{i}".encode()).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(17)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = similarity.SimilarityIndex(os.path.join(tmp, "similarity"))
+        default_index, similarity._index = similarity._index, index
+        indexed = 0
+        index_seconds = 0.0
+        for size in sorted(args.sizes):
+            start = time.perf_counter()
+            similarity.index_documents(
+                (document_hash(i), make_document(rng, args.pages)) for i in range(indexed, size)
+            )
+            index_seconds += time.perf_counter() - start
+            indexed = size
+            similarity.similar_candidates([document_hash(0)])  # IDF snapshot and row norms
+
+            probes = [document_hash(rng.randrange(indexed)) for _ in range(max(args.repeat, SIMILARITY_BATCH_SIZE))]
+            texts = [rng.choice(DESCRIPTIONS) for _ in range(len(probes))]
+            batches = [probes[i:i + SIMILARITY_BATCH_SIZE] for i in range(0, len(probes), SIMILARITY_BATCH_SIZE)]
+            text_batches = [texts[i:i + SIMILARITY_BATCH_SIZE] for i in range(0, len(texts), SIMILARITY_BATCH_SIZE)]
+            timings = {
+                "similar_single": time_calls(similarity.similar_candidates, [([h],) for h in probes[:args.repeat]]),
+                "similar_batch": time_calls(similarity.similar_candidates, [(batch,) for batch in batches]),
+                "match_text_single": time_calls(similarity.match_texts, [([t],) for t in texts[:args.repeat]]),
+                "match_text_batch": time_calls(similarity.match_texts, [(batch,) for batch in text_batches]),
+                "add_one": time_calls(similarity.index_resume, [
+                    (document_hash(indexed + i), make_document(rng, args.pages)) for i in range(args.repeat)
+                ]),
+            }
+            indexed += args.repeat
+            footprint = sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, files in os.walk(index.directory) for name in files
+            )
+            for operation, calls in timings.items():
+                batch = SIMILARITY_BATCH_SIZE if operation.endswith("_batch") else 1
+                print(json.dumps({
+                    "benchmark": "similarity", "documents": indexed, "operation": operation,
+                    "queries_per_call": batch, "docs_per_s": round(size / index_seconds),
+                    "segments": len(index.segments), "disk_mb": round(footprint / 2 ** 20, 1), **stats(calls),
+                }), flush=True)
+        similarity._index = default_index
+
+
+if __name__ == "__main__":
+    main()
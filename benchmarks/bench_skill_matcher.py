@@ -0,0 +1,99 @@
+"""Skill matching: per-call alternation regex vs the cached SkillMatcher
+
+Usage: python -m benchmarks.bench_skill_matcher [--skills 500 1000] [--resume-kb 50 500]
+"""
+import argparse
+import json
+import random
+import re
+import string
+import time
+
+from backend.skill_matcher import SkillMatcher
+
+SEPARATORS = [" ", " ", " ", ", ", ". ", "\n", " - ", "/"]
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list:
+    """Distinct skill names: single words, multi-word phrases and punctuated names"""
+    skills = set()
+    while len(skills) < size:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9))).title()
+        kind = rng.random()
+        if kind < 0.25:
+            word += " " + "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+        elif kind < 0.3:
+            word += rng.choice(["++", "#", ".js", "-ops"])
+        skills.add(word)
+    return sorted(skills, key=lambda _: rng.random())
+
+
+def make_resume(vocabulary: list, size_kb: int, rng: random.Random) -> str:
+    filler = ["experience", "team", "project", "delivered", "built", "years", "with", "and", "the"]
+    parts, length = [], 0
+    while length < size_kb * 1024:
+        token = rng.choice(vocabulary) if rng.random() < 0.1 else rng.choice(filler)
+        if rng.random() < 0.2:
+            token = token.upper()
+        parts.append(token + rng.choice(SEPARATORS))
+        length += len(parts[-1])
+    return "".join(parts)
+
+
+def legacy_match(text: str, required: list, preferred: list) -> list:
+    """The original analyze_resume matching: a fresh alternation regex per call"""
+    valid_skills = required + preferred
+    found = re.findall(
+        r'\b(' + '|'.join(re.escape(skill) for skill in valid_skills) + r')\b',
+        text,
+        re.IGNORECASE
+    )
+    return [skill.strip().title() for skill in found]
+
+
+def cached_match(matcher: SkillMatcher, text: str) -> list:
+    return [matcher.normalized[i] for i in matcher.find(text)]
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--resume-kb", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    for vocabulary_size in args.skills:
+        vocabulary = make_vocabulary(vocabulary_size, rng)
+        split = max(1, vocabulary_size * 2 // 3)
+        required, preferred = vocabulary[:split], vocabulary[split:]
+        for size_kb in args.resume_kb:
+            text = make_resume(vocabulary, size_kb, rng)
+            matcher = SkillMatcher(required, preferred)
+            assert cached_match(matcher, text) == legacy_match(text, required, preferred)
+
+            legacy = best_of(lambda: legacy_match(text, required, preferred), args.repeat)
+            cached = best_of(lambda: cached_match(matcher, text), args.repeat)
+            build = best_of(lambda: SkillMatcher(required, preferred), args.repeat)
+            print(json.dumps({
+                "benchmark": "skill_matcher",
+                "skills": vocabulary_size,
+                "resume_kb": size_kb,
+                "legacy_ms": round(legacy * 1000, 3),
+                "cached_ms": round(cached * 1000, 3),
+                "matcher_build_ms": round(build * 1000, 3),
+                "speedup": round(legacy / cached, 2),
+            }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Synthetic, seeded benchmark corpora: resume documents and interview result histories"""
+import io
+import random
+import uuid
+from typing import Dict, List, Tuple
+
+import docx
+from sqlalchemy import insert
+
+from backend import analytics, results_store
+from backend.data_manager import default_positions
+
+FILLER = [
+    "delivered", "designed", "built", "led", "team", "project", "production", "customers",
+    "improved", "pipeline", "reporting", "stakeholders", "quarterly", "platform", "the", "and", "with",
+]
+LINES_PER_PAGE = 50
+POPULATE_BATCH_SIZE = 20000
+
+
+def all_skills(positions: Dict = None) -> List[str]:
+    positions = positions or default_positions()
+    return sorted({s for config in positions.values() for s in config["required_skills"] + config["preferred_skills"]})
+
+
+def make_resume_text(rng: random.Random, pages: int = 2, skills: List[str] = None) -> str:
+    """Plain resume text of about `pages` pages mentioning skills and years of experience"""
+    skills = skills or all_skills()
+    lines = [f"Candidate {rng.randint(1, 10 ** 6)}", f"{rng.randint(0, 20)} years of experience"]
+    while len(lines) < pages * LINES_PER_PAGE:
+        words = [rng.choice(skills) if rng.random() < 0.12 else rng.choice(FILLER) for _ in range(rng.randint(6, 12))]
+        lines.append(" ".join(words).capitalize() + ".")
+    return "\n".join(lines)
+
+
+def make_docx(text: str) -> bytes:
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str) -> bytes:
+    """Minimal multi-page PDF (Helvetica text objects) that PyPDF2 can extract"""
+    lines = text.split("\n")
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 12 TL 50 800 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page_lines) + " ET"
+        stream = stream.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+class SyntheticUpload(io.BytesIO):
+    """Stand-in for a Streamlit UploadedFile (a BytesIO with name, type and size)"""
+
+    def __init__(self, data: bytes, name: str, file_type: str):
+        super().__init__(data)
+        self.name = name
+        self.type = file_type
+        self.size = len(data)
+
+
+def make_result(i: int, rng: random.Random, positions: Dict) -> Dict:
+    position = rng.choice(list(positions))
+    config = positions[position]
+    skills = rng.sample(config["required_skills"] + config["preferred_skills"], rng.randint(0, 5))
+    return {
+        "name": f"Candidate {i}",
+        "email": f"candidate{i}@example.com",
+        "position": position,
+        "experience": rng.randint(0, 20),
+        "resume_score": round(rng.uniform(0, 100), 1),
+        "skills": ", ".join(s.title() for s in skills),
+        "timestamp": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+        "responses": "Q: question\nA: answer",
+        "interview_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "resume_hash": "%064x" % rng.getrandbits(256),
+    }
+
+
+def populate_results(size: int, seed: int = 7, positions: Dict = None) -> List[Tuple[str, str]]:
+    """Fill the active results store with a seeded history (aggregates included); returns (email, id) probes"""
+    positions = positions or default_positions()
+    rng = random.Random(seed)
+    probes = []
+    with results_store.get_engine().begin() as conn:
+        rows = []
+        for i in range(size):
+            row = make_result(i, rng, positions)
+            rows.append(row)
+            if rng.random() < 0.01 or len(probes) < 100:
+                probes.append((row["email"], row["interview_id"]))
+            if len(rows) >= POPULATE_BATCH_SIZE:
+                conn.execute(insert(results_store.results_table), rows)
+                rows = []
+        if rows:
+            conn.execute(insert(results_store.results_table), rows)
+    analytics.rebuild_aggregates()
+    return probes
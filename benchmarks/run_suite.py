@@ -0,0 +1,182 @@
+"""End-to-end benchmark suite over synthetic resumes and result histories
+
+Measures resume parsing (cold and cached), resume analysis, dashboard
+aggregation, Candidate Portal lookup and interview-completion writes,
+the last three at every history size. Each measurement is printed as one
+JSON line; --output also writes the whole run (with the git revision and
+platform) to a JSON file, and --compare reports operations whose p50
+regressed against such a file from an earlier release.
+
+Usage: python -m benchmarks.run_suite [--sizes 1000 10000 100000 1000000] [--output run.json]
+                                      [--compare baseline.json] [--threshold 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from backend import analytics, data_manager, results_store
+from backend.analysis_engine import DOCX_MIME, PDF_MIME, analyze_resume, parse_resume
+from backend.parse_cache import get_parse_cache
+from benchmarks.corpus import SyntheticUpload, make_docx, make_pdf, make_resume_text, make_result, populate_results
+from config.settings import RESULTS_DB
+
+FORMATS = {"pdf": (PDF_MIME, make_pdf), "docx": (DOCX_MIME, make_docx)}
+
+
+def stats(timings: list) -> dict:
+    timings = sorted(timings)
+    return {
+        "calls": len(timings),
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 4),
+        "p99_ms": round(timings[max(0, int(len(timings) * 0.99) - 1)] * 1000, 4),
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 4),
+    }
+
+
+def time_calls(func, args_list: list) -> list:
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_documents(documents: int, pages: int, positions: list) -> list:
+    rng = random.Random(3)
+    texts = [make_resume_text(rng, pages) for _ in range(documents)]
+    records = []
+    for fmt, (file_type, render) in FORMATS.items():
+        uploads = [SyntheticUpload(render(text), f"resume{i}.{fmt}", file_type) for i, text in enumerate(texts)]
+        get_parse_cache().clear()
+        cold = time_calls(parse_resume, [(upload,) for upload in uploads])
+        warm = time_calls(parse_resume, [(upload,) for upload in uploads])
+        records.append({"benchmark": "parse_resume", "format": fmt, "pages": pages, "cache": "cold", **stats(cold)})
+        records.append({"benchmark": "parse_resume", "format": fmt, "pages": pages, "cache": "warm", **stats(warm)})
+
+    analyze_resume(texts[0], positions[0])  # build the skill matchers outside the measurement
+    timings = time_calls(analyze_resume, [(text, rng.choice(positions)) for text in texts])
+    records.append({"benchmark": "analyze_resume", "pages": pages, **stats(timings)})
+    return records
+
+
+def bench_history(size: int, repeat: int, positions: dict) -> list:
+    build_start = time.perf_counter()
+    probes = populate_results(size)
+    build_seconds = round(time.perf_counter() - build_start, 2)
+    rng = random.Random(11)
+    records = []
+
+    timings = time_calls(analytics.load_summary, [() for _ in range(repeat)])
+    records.append({"benchmark": "dashboard_summary", "rows": size, **stats(timings)})
+
+    timings = time_calls(results_store.find_results, [rng.choice(probes) for _ in range(repeat)])
+    records.append({"benchmark": "portal_lookup", "rows": size, **stats(timings)})
+
+    completions = []
+    for i in range(size, size + repeat):
+        row = make_result(i, rng, positions)
+        completions.append(({label: row[column] for label, column in results_store.COLUMN_LABELS.items()},))
+    timings = time_calls(results_store.append_result, completions)
+    records.append({"benchmark": "completion_write", "rows": size, **stats(timings)})
+
+    for record in records:
+        record["populate_s"] = build_seconds
+    return records
+
+
+def record_key(record: dict) -> tuple:
+    """Identity of a measurement across runs: every field that is not a timing"""
+    return tuple(sorted(
+        (k, v) for k, v in record.items() if k not in ("calls", "p50_ms", "p99_ms", "mean_ms", "populate_s")
+    ))
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> list:
+    """Measurements whose p50 grew by more than threshold (a fraction) over the baseline run"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {record_key(r): r for r in json.load(f)["results"]}
+    regressions = []
+    for record in results:
+        before = baseline.get(record_key(record))
+        if before and before["p50_ms"] and record["p50_ms"] > before["p50_ms"] * (1 + threshold):
+            regressions.append({
+                **dict(record_key(record)),
+                "baseline_p50_ms": before["p50_ms"],
+                "p50_ms": record["p50_ms"],
+                "change": round(record["p50_ms"] / before["p50_ms"] - 1, 3),
+            })
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="write the run to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p50 slowdown reported as a regression")
+    args = parser.parse_args()
+
+    started = datetime.now().isoformat(timespec="seconds")
+    positions = data_manager.default_positions()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager.POSITIONS_FILE = os.path.join(tmp, "positions.json")
+        data_manager.save_positions(positions)
+        cache = get_parse_cache()
+        cache_dir, cache.directory = cache.directory, os.path.join(tmp, "cache")
+
+        for pages in args.pages:
+            for record in bench_documents(args.documents, pages, list(positions)):
+                print(json.dumps(record), flush=True)
+                results.append(record)
+        for size in args.sizes:
+            results_store.use_database(os.path.join(tmp, f"results_{size}.db"))
+            for record in bench_history(size, args.repeat, positions):
+                print(json.dumps(record), flush=True)
+                results.append(record)
+
+        cache.clear()
+        cache.directory = cache_dir
+        results_store.use_database(RESULTS_DB)
+
+    run = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started": started,
+        "args": vars(args),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(json.dumps({"benchmark": "regression", **regression}))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,74 @@ import os
 # ----------------- Configuration -----------------
 RESUMES_DIR = "data/resumes"
 POSITIONS_FILE = "data/positions/positions.json"
+RESULTS_DB = os.environ.get("RESULTS_DB", "data/results.db")
+LEGACY_RESULTS_FILE = "results.xlsx"
+EXPORT_DIR = "data/exports"
+EXPORT_CHUNK_SIZE = 5000
+PARSE_CACHE_DIR = "data/cache/text"
+PARSE_CACHE_MAX_MB = 256
+PARSE_CACHE_MEMORY_ITEMS = 128
+RESCORE_WORKERS = os.cpu_count() or 1
+RESCORE_CHUNK_SIZE = 256
+PARSE_WORKERS = 2
+PARSE_POLL_SECONDS = 0.5
+ANSWER_INLINE_CHARS = 256  # longer answers are kept in the results store, not the session
+MINHASH_PERMUTATIONS = 128
+MINHASH_BANDS = 16  # 8 rows per band: resumes ~70% similar or more usually share a bucket
+SHINGLE_WORDS = 5
+DUPLICATE_THRESHOLD = 0.9  # estimated Jaccard similarity of word shingles
+RESCORE_REUSE_DUPLICATES = False  # re-score one resume per near-duplicate group and copy its score
+SIMILARITY_DIR = "data/similarity"
+SIMILARITY_BATCH_SIZE = 16  # queries scored together, sharing each read of a term's entries
+SIMILARITY_CHUNK_NNZ = 1 << 20  # stored entries read at a time when computing row norms
+SIMILARITY_MAX_DF = 1.0  # terms in more resumes than this share carry no weight (1.0: keep every term)
+SIMILARITY_MAX_DF_MIN_DOCUMENTS = 1000  # smaller corpora keep every term whatever SIMILARITY_MAX_DF is
+SIMILARITY_IDF_REFRESH = 0.05  # recompute IDF and row norms after the corpus grows by this share
+BLOB_COMPRESS_LEVEL = 6
+BLOB_GC_GRACE_HOURS = 24  # unreferenced uploads younger than this may still become an interview
 os.makedirs(RESUMES_DIR, exist_ok=True)
 
 # Security Configuration
 PEPPER = os.environ.get("PEPPER", "default-secret-pepper")
 
 # Email Configuration
-SMTP_SERVER = "smtp.example.com"
-SMTP_PORT = 587
-EMAIL_ADDRESS = "your_email@example.com"
-EMAIL_PASSWORD = "your_password"
-ADMIN_EMAIL = "admin@example.com"
+SMTP_SERVER = os.environ.get("SMTP_SERVER", "smtp.example.com")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", 587))
+SMTP_USE_TLS = os.environ.get("SMTP_USE_TLS", "1") != "0"
+EMAIL_ADDRESS = os.environ.get("EMAIL_ADDRESS", "your_email@example.com")
+EMAIL_PASSWORD = os.environ.get("EMAIL_PASSWORD", "your_password")
+ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "admin@example.com")
+
+# Outbound email queue
+EMAIL_BATCH_SIZE = 50
+EMAIL_MAX_ATTEMPTS = 6
+EMAIL_RETRY_BASE_SECONDS = 30
+EMAIL_POLL_SECONDS = 5
+EMAIL_CONNECTION_IDLE_SECONDS = 60
+EMAIL_CONNECTION_PROBE_SECONDS = 5  # NOOP-check a reused connection only after it sat idle this long
+
+# Instrumentation
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")  # 0.0.0.0 to let a remote Prometheus scrape
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 0))  # serve /metrics on this port when non-zero
+METRICS_FILE = "data/metrics.prom"
+
+# Scoring service (python -m backend.scoring_service)
+SERVICE_HOST = os.environ.get("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("SERVICE_PORT", 8502))
+SERVICE_PARSE_WORKERS = os.cpu_count() or 1
+SERVICE_BATCH_SIZE = 64  # texts scored together in one pass
+SERVICE_BATCH_WAIT_MS = 2  # how long the first text of a batch waits for company
+SERVICE_MAX_CONNECTIONS = 256
+SERVICE_MAX_PENDING_PARSES = 4 * SERVICE_PARSE_WORKERS  # documents in the parse pool before 503
+SERVICE_MAX_PENDING_SCORES = 1024  # texts waiting to be scored before 503
+SERVICE_MAX_RANK_RESUMES = 1000  # resumes per /rank request
+SERVICE_READ_TIMEOUT_SECONDS = 30  # idle keep-alive connections are closed after this
 
 # Validation Constants
 MIN_NAME_LENGTH = 3  # Ensure this is defined
 MAX_EXPERIENCE = 20  # Ensure this is defined
 VALID_PHONE_REGEX = r'^\+?[1-9]\d{1,14}$'  # Ensure this is defined
-MAX_FILE_SIZE_MB = 5
\ No newline at end of file
+MAX_FILE_SIZE_MB = 5
+MAX_RESUME_PAGES = 50
+MAX_RESUME_CHARS = 200000
\ No newline at end of file
@@ -1,8 +1,42 @@
 import os
-import streamlit as st
-from backend.data_manager import load_positions, save_positions
 import pandas as pd
-from config.settings import RESUMES_DIR
+import streamlit as st
+from backend import metrics, search_index, similarity
+from backend.blob_store import get_blob_store
+from backend.data_manager import load_positions, save_positions, get_positions_version
+from backend.results_store import (
+    load_results_page, count_results, purge_results, import_excel, top_candidates, count_candidates,
+    find_results_by_email, find_results_by_resume_hashes,
+)
+from backend.export import export_filename, export_results
+from backend.analytics import rebuild_aggregates
+from backend.rescoring import get_rescore_jobs
+from backend.answer_scoring import get_answer_rescore_jobs
+from backend.near_duplicates import count_indexed, duplicate_groups
+from backend.resume_jobs import index_directory
+from config.settings import RESUMES_DIR, LEGACY_RESULTS_FILE, METRICS_ENABLED, METRICS_FILE
+
+def parse_synonyms(text: str) -> dict:
+    """'keyword: synonym1, synonym2' lines -> {keyword: [synonyms]}"""
+    synonyms = {}
+    for line in text.split('\n'):
+        if ':' in line:
+            keyword, values = line.split(':', 1)
+            values = [v.strip() for v in values.split(',') if v.strip()]
+            if keyword.strip() and values:
+                synonyms[keyword.strip()] = values
+    return synonyms
+
+def with_candidates(hits: pd.DataFrame) -> pd.DataFrame:
+    """Add the names, emails, positions and best score of the candidates behind each hit's resume"""
+    records = find_results_by_resume_hashes(hits["resume_hash"].tolist())
+    candidates = records.groupby("Resume Hash").agg({
+        "Name": lambda names: ", ".join(sorted(set(names))),
+        "Email": lambda emails: ", ".join(sorted(set(emails))),
+        "Position": lambda positions: ", ".join(sorted(set(positions))),
+        "Resume Score": "max",
+    })
+    return hits.join(candidates, on="resume_hash")
 
 def render_admin_panel():
     """Enhanced admin panel with position management"""
@@ -34,6 +68,20 @@ def render_admin_panel():
                 key="behave_q_create"
             )
             
+            st.subheader("Keyword Synonyms")
+            synonyms_q = st.text_area(
+                "Format: 'keyword: synonym1, synonym2' (one per line)",
+                height=100,
+                key="synonyms_create"
+            )
+            
+            st.subheader("Job Description")
+            description = st.text_area(
+                "Used to find matching candidates by resume similarity",
+                height=150,
+                key="description_create"
+            )
+            
             exp_threshold = st.number_input("Experience Threshold*", min_value=0, key="new_exp_thresh")
             
             if st.button("Create Position", key="create_pos_btn"):
@@ -68,6 +116,8 @@ def render_admin_panel():
                         "preferred_skills": [s.strip() for s in new_preferred.split(',')] if new_preferred else [],
                         "technical": technical,
                         "behavioral": behavioral,
+                        "keyword_synonyms": parse_synonyms(synonyms_q),
+                        "description": description.strip(),
                         "experience_threshold": exp_threshold
                     }
                     save_positions(POSITION_CONFIG)
@@ -107,6 +157,23 @@ def render_admin_panel():
                 key=f"behave_edit_{position}"
             )
             
+            st.subheader("Keyword Synonyms")
+            synonyms_q = '\n'.join([f"{k}: {', '.join(v)}" for k, v in config.get("keyword_synonyms", {}).items()])
+            updated_synonyms = st.text_area(
+                "Format: 'keyword: synonym1, synonym2' (one per line)",
+                value=synonyms_q,
+                height=100,
+                key=f"synonyms_edit_{position}"
+            )
+            
+            st.subheader("Job Description")
+            updated_description = st.text_area(
+                "Used to find matching candidates by resume similarity",
+                value=config.get("description", ""),
+                height=150,
+                key=f"description_edit_{position}"
+            )
+            
             new_exp = st.number_input(
                 "Experience Threshold",
                 value=config["experience_threshold"],
@@ -133,41 +200,241 @@ def render_admin_panel():
                     "preferred_skills": [s.strip() for s in new_preferred.split(',')] if new_preferred else [],
                     "technical": technical,
                     "behavioral": behavioral,
+                    "keyword_synonyms": parse_synonyms(updated_synonyms),
+                    "description": updated_description.strip(),
                     "experience_threshold": new_exp
                 }
                 save_positions(POSITION_CONFIG)
                 st.success("Position updated successfully!")
+        
+        jobs = get_rescore_jobs()
+        if jobs:
+            st.subheader("Candidate Re-scoring")
+            for job_position, job in jobs.items():
+                label = f"{job_position}: {job.status} ({job.done}/{job.total} resumes, {job.updated} scores updated)"
+                st.progress(min(job.progress, 1.0), text=label)
+                if job.missing_text:
+                    st.caption(f"{job.missing_text} records skipped: resume text not cached")
+                if job.reused:
+                    st.caption(f"{job.reused} near-duplicate resumes took the score of their group")
+                if job.error:
+                    st.error(f"Re-scoring failed: {job.error}")
+        
+        answer_jobs = get_answer_rescore_jobs()
+        if answer_jobs:
+            st.subheader("Answer Keyword Re-scoring")
+            for job_position, job in answer_jobs.items():
+                label = f"{job_position}: {job.status} ({job.done}/{job.total} answers, {job.updated} coverage scores updated)"
+                st.progress(min(job.progress, 1.0), text=label)
+                if job.error:
+                    st.error(f"Answer re-scoring failed: {job.error}")
     
     with st.expander("📊 Database Management"):
-        if os.path.exists("results.xlsx"):
-            df = pd.read_excel("results.xlsx")
+        if os.path.exists(LEGACY_RESULTS_FILE) and st.button("Import results.xlsx", key="import_legacy"):
+            try:
+                st.success(f"Imported {import_excel(LEGACY_RESULTS_FILE)} records")
+            except Exception as e:
+                st.error(f"Error importing records: {str(e)}")
+        
+        col1, col2, col3 = st.columns(3)
+        record_position = col1.selectbox("Position", ["All"] + list(POSITION_CONFIG.keys()), key="records_position")
+        date_range = col2.date_input("Completed between", value=(), key="records_dates")
+        min_score = col3.slider("Minimum Resume Score", 0, 100, 0, key="records_min_score")
+        filters = {
+            "position": None if record_position == "All" else record_position,
+            "since": date_range[0].isoformat() if len(date_range) > 0 else None,
+            "until": date_range[-1].isoformat() if len(date_range) > 0 else None,
+            "min_score": min_score or None,
+        }
+        
+        total = count_results(**filters)
+        if total:
             st.subheader("Candidate Records")
-            st.dataframe(df)
+            col1, col2 = st.columns(2)
+            page_size = col1.selectbox("Records per page", [25, 50, 100, 250], index=1, key="records_page_size")
+            pages = max(1, -(-total // page_size))
+            page = col2.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="records_page")
+            st.dataframe(load_results_page(page_size, (page - 1) * page_size, **filters))
+            st.caption(f"{total} matching records")
             
-            cols = st.columns(3)
+            cols = st.columns(4)
             if cols[0].button("Refresh Data", key="refresh_data"):
                 st.rerun()
             
-            if cols[1].button("Download Full Data", key="download_data"):
-                st.download_button(
-                    label="Download CSV",
-                    data=df.to_csv(index=False),
-                    file_name="candidate_records.csv"
-                )
+            export_format = cols[1].radio("Export format", ["csv", "parquet"], horizontal=True, key="export_format")
+            if cols[1].button("Export Matching Records", key="download_data"):
+                try:
+                    export_path = export_filename(export_format, filters)
+                    export_results(export_path, export_format, **filters)
+                    with open(export_path, "rb") as f:
+                        st.download_button(
+                            label=f"Download {export_format.upper()}",
+                            data=f,
+                            file_name=os.path.basename(export_path)
+                        )
+                except Exception as e:
+                    st.error(f"Error exporting records: {str(e)}")
             
             if cols[2].button("Purge All Data", key="purge_data"):
                 try:
-                    os.remove("results.xlsx")
+                    purge_results()
                     st.success("Database cleared successfully!")
                 except Exception as e:
                     st.error(f"Error clearing database: {str(e)}")
+            
+            if cols[3].button("Rebuild Analytics", key="rebuild_analytics"):
+                drift = rebuild_aggregates()
+                st.success("Analytics rebuilt. Corrected entries: " + ", ".join(f"{k}={v}" for k, v in drift.items()))
         else:
             st.warning("No candidate records found")
     
+    with st.expander("🏆 Candidate Leaderboard"):
+        col1, col2, col3 = st.columns(3)
+        board_position = col1.selectbox("Position", list(POSITION_CONFIG.keys()), key="board_position")
+        page_size = col2.selectbox("Candidates per page", [25, 50, 100], index=1, key="board_page_size")
+        total = count_candidates(board_position)
+        pages = max(1, -(-total // page_size))
+        page = col3.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="board_page")
+        
+        board = top_candidates(board_position, limit=page_size, offset=(page - 1) * page_size)
+        if board.empty:
+            st.warning("No candidates for this position yet")
+        else:
+            st.caption(f"Ranks {board['Rank'].iloc[0]}-{board['Rank'].iloc[-1]} of {total}")
+            st.dataframe(board.drop(columns=["Position", "Responses"]).set_index("Rank"))
+    
+    with st.expander("🔎 Resume Search"):
+        col1, col2 = st.columns([3, 1])
+        query = col1.text_input("Search all resumes", placeholder="kubernetes AND kafka, 5+ years", key="search_query")
+        limit = col2.selectbox("Results", [20, 50, 100], key="search_limit")
+        st.caption('Words and "quoted phrases", AND / OR / NOT (or -word), parentheses, and "N+ years" of stated experience')
+        if query.strip():
+            try:
+                found = search_index.search(query, limit=limit)
+            except ValueError as e:
+                st.error(str(e))
+                found = None
+            if found is not None and not found["hits"]:
+                st.warning("No resumes match this query")
+            elif found is not None:
+                hits = pd.DataFrame(found["hits"])
+                hits.insert(0, "Rank", range(1, len(hits) + 1))
+                hits = with_candidates(hits).rename(columns={
+                    "score": "Relevance", "experience": "Stated Experience", "resume_hash": "Resume Hash",
+                })
+                st.dataframe(hits.set_index("Rank"))
+                st.caption(f"Top {len(hits)} of {found['total']} matching resumes")
+    
+    with st.expander("🧭 Similar Candidates"):
+        st.caption(f"{similarity.count_indexed()} resumes in the similarity index")
+        mode = st.radio("Find", ["Like a candidate", "For a job description"], horizontal=True, key="similar_mode")
+        col1, col2 = st.columns([3, 1])
+        limit = col2.selectbox("Results", [10, 25, 50], key="similar_limit")
+        matches = None
+        if mode == "Like a candidate":
+            email = col1.text_input("Candidate email", key="similar_email")
+            if email.strip():
+                records = find_results_by_email(email.strip())
+                resume_hashes = [h for h in records["Resume Hash"] if h] if not records.empty else []
+                if not resume_hashes:
+                    st.warning("No interview record with a resume for this email")
+                else:
+                    resume_hash = resume_hashes[-1]  # the most recent interview's resume
+                    matches = similarity.similar_candidates([resume_hash], limit)[resume_hash]
+                    if not matches:
+                        st.info("This resume is not in the similarity index yet")
+        else:
+            position = col1.selectbox("Position", list(POSITION_CONFIG.keys()), key="similar_position")
+            description = st.text_area(
+                "Job description",
+                value=POSITION_CONFIG[position].get("description", ""),
+                height=120,
+                key=f"similar_description_{position}"
+            )
+            if description.strip():
+                matches = similarity.match_texts([description], limit)[0]
+                if not matches:
+                    st.warning("No indexed resume shares terms with this description")
+            else:
+                st.info("Enter a job description, or attach one to the position under Position Management")
+        if matches:
+            hits = pd.DataFrame(matches, columns=["resume_hash", "Similarity"])
+            hits.insert(0, "Rank", range(1, len(hits) + 1))
+            st.dataframe(with_candidates(hits).rename(columns={"resume_hash": "Resume Hash"}).set_index("Rank"))
+    
+    with st.expander("🧬 Duplicate Resumes"):
+        st.caption(f"{count_indexed()} resumes indexed for near-duplicate search")
+        
+        if st.checkbox("Show duplicate candidates", key="show_duplicates"):
+            groups = duplicate_groups()
+            group_of = {resume_hash: number for number, group in enumerate(groups, start=1) for resume_hash in group}
+            records = find_results_by_resume_hashes(list(group_of))
+            if records.empty:
+                st.info("No completed interviews share a near-duplicate resume")
+            else:
+                records.insert(0, "Group", records["Resume Hash"].map(group_of))
+                if st.checkbox("Collapse duplicate candidates", value=True, key="collapse_duplicates"):
+                    # records arrive best score first, so each group keeps its best-scored candidate
+                    grouped = records.groupby("Group")
+                    collapsed = grouped.first()
+                    collapsed["Copies"] = grouped.size()
+                    collapsed["Emails"] = grouped["Email"].agg(lambda emails: ", ".join(sorted(set(emails))))
+                    collapsed["Positions"] = grouped["Position"].agg(lambda positions: ", ".join(sorted(set(positions))))
+                    st.dataframe(collapsed[["Name", "Email", "Resume Score", "Copies", "Emails", "Positions"]])
+                else:
+                    st.dataframe(records.drop(columns=["Responses"]).sort_values("Group", kind="stable").set_index("Group"))
+                st.caption(f"{len(records)} records in {records['Group'].nunique()} groups of near-duplicate resumes")
+    
     with st.expander("🔐 System Controls"):
         st.subheader("Server Monitoring")
-        st.write(f"Resumes Directory: {len(os.listdir(RESUMES_DIR))} files")
-        st.write(f"Positions Configured: {len(POSITION_CONFIG)}")
+        store = get_blob_store()
+        stored = store.stats()
+        st.write(
+            f"Resume Store: {stored['blobs']} resumes, {stored['bytes'] / 2 ** 20:.1f} MB "
+            f"({stored['stored_bytes'] / 2 ** 20:.1f} MB compressed)"
+        )
+        if st.button("Remove Unreferenced Resumes", key="collect_resumes"):
+            with st.spinner("Collecting unreferenced resumes..."):
+                collected = store.collect_garbage()
+            st.success(
+                f"Removed {collected['removed']} of {collected['scanned']} stored resumes "
+                f"({collected['freed_bytes'] / 2 ** 20:.1f} MB freed)"
+            )
+            if collected["pinned"]:
+                st.info(f"{collected['pinned']} migrated resumes from before resume hashing are kept permanently")
+        if st.button("Index Resume Folder", key="index_resumes"):
+            with st.spinner("Indexing resumes..."):
+                indexed = index_directory(RESUMES_DIR)
+            st.success(
+                f"Indexed {indexed['files']} files ({indexed['errors']} unreadable): "
+                f"{indexed['search_index']} new for search, {indexed['similarity']} for similar candidates, "
+                f"{indexed['near_duplicates']} for duplicates"
+            )
+        st.write(f"Positions Configured: {len(POSITION_CONFIG)} (config version {get_positions_version()})")
+        
+        st.subheader("Performance Metrics")
+        if not METRICS_ENABLED:
+            st.info("Instrumentation is disabled (METRICS_ENABLED=0)")
+        else:
+            timings = metrics.summary()
+            if timings:
+                st.dataframe(pd.DataFrame(timings).set_index("Operation"))
+            else:
+                st.caption("No instrumented operations recorded yet")
+            events = metrics.counters()
+            if events:
+                st.write(", ".join(f"{event}: {count}" for event, count in events.items()))
+            
+            cols = st.columns(2)
+            cols[0].download_button(
+                "Download Prometheus Metrics",
+                data=metrics.render_prometheus(),
+                file_name="metrics.prom",
+                key="download_metrics"
+            )
+            if cols[1].button("Write Metrics File", key="write_metrics"):
+                metrics.write_prometheus(METRICS_FILE)
+                st.success(f"Metrics written to {METRICS_FILE}")
         
         if st.button("Restart Service", key="restart_service"):
             st.rerun()  
\ No newline at end of file
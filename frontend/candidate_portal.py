@@ -1,6 +1,5 @@
 import streamlit as st
-import pandas as pd
-import os
+from backend.results_store import find_results, has_results
 
 def candidate_portal():
     """Candidate self-service portal"""
@@ -11,17 +10,13 @@ def candidate_portal():
         interview_id = st.text_input("Enter interview ID")
         
         if st.form_submit_button("View History"):
-            if os.path.exists("results.xlsx"):
-                df = pd.read_excel("results.xlsx")
-                if 'Interview ID' in df.columns and 'Email' in df.columns:
-                    filtered = df[(df["Email"] == email) & (df["Interview ID"] == interview_id)]
-                    
-                    if not filtered.empty:
-                        st.success("Authentication successful!")
-                        st.dataframe(filtered)
-                    else:
-                        st.error("No records found")
+            if has_results():
+                filtered = find_results(email.strip(), interview_id.strip())
+                
+                if not filtered.empty:
+                    st.success("Authentication successful!")
+                    st.dataframe(filtered)
                 else:
-                    st.error("Required columns missing in data")
+                    st.error("No records found")
             else:
                 st.warning("No interview data available")
\ No newline at end of file
@@ -1,54 +1,70 @@
 import streamlit as st
-from backend.data_manager import load_positions
-from backend.analysis_engine import parse_resume, analyze_resume
-from backend.email_service import send_email
+from backend.data_manager import get_positions
+from backend.parse_cache import upload_hash
+from backend.question_pool import get_question_pool
 from backend.security import hash_data, generate_auth_token
 from utils.validators import validate_candidate_info
-from utils.session_manager import initialize_session  # Import from utils
-import uuid
-import os
+from utils.session_manager import initialize_session, restore_session  # Import from utils
 import random
+import time
 from datetime import datetime
-from backend.data_manager import load_positions
-from config.settings import RESUMES_DIR
+from config.settings import ADMIN_EMAIL, MAX_FILE_SIZE_MB, PARSE_POLL_SECONDS
 
 
-# Load positions configuration
-POSITION_CONFIG = load_positions()
-
 def render_registration():
     """Enhanced registration form with validation"""
     state = initialize_session()
+    POSITION_CONFIG = get_positions()  # Cached; picks up admin edits without a restart
     
     with st.form("reg_form", clear_on_submit=False):
         st.header("📝 Candidate Registration")
         
         col1, col2 = st.columns(2)
-        state.user_info["name"] = col1.text_input("Full Name*", value=state.user_info["name"])
-        state.user_info["email"] = col2.text_input("Email*", value=state.user_info["email"])
-        state.user_info["phone"] = st.text_input("Phone Number*", value=state.user_info["phone"])
+        state.user_info.name = col1.text_input("Full Name*", value=state.user_info.name)
+        state.user_info.email = col2.text_input("Email*", value=state.user_info.email)
+        state.user_info.phone = st.text_input("Phone Number*", value=state.user_info.phone)
         
         col1, col2 = st.columns(2)
         state.position = col1.selectbox("Position*", list(POSITION_CONFIG.keys()))
-        state.user_info["experience"] = col2.number_input(
+        state.user_info.experience = col2.number_input(
             "Experience (Years)*", 
             min_value=0,
-            value=state.user_info["experience"]
+            value=state.user_info.experience
         )
         
         resume = st.file_uploader("Upload Resume (PDF/DOCX)", type=["pdf", "docx"])
         if resume:
-            state.user_info["resume_path"] = f"{RESUMES_DIR}/{state.user_info['name']}_{uuid.uuid4().hex[:6]}.{resume.type.split('/')[-1]}"
-            with open(state.user_info["resume_path"], "wb") as f:
-                f.write(resume.getbuffer())
+            # PyPDF2/python-docx load with the first upload, not with the page
+            from backend.analysis_engine import analyze_resume
+            from backend.resume_jobs import submit_parse
+            from backend.blob_store import get_blob_store
+            # Reruns re-submit the same upload; only a new file is written and parsed again
+            resume_hash = upload_hash(resume)
+            if resume_hash != state.user_info.resume_hash:
+                state.user_info.resume_hash = resume_hash
+                state.user_info.resume_path = ""
+                state.parse_job = None
+                if resume.size > MAX_FILE_SIZE_MB * 1024 * 1024:
+                    st.error(f"File too large. Max size: {MAX_FILE_SIZE_MB}MB")
+                else:
+                    # Stored under its content hash, so a file several candidates upload is kept once
+                    store = get_blob_store()
+                    store.put(resume.getbuffer(), resume_hash)
+                    state.user_info.resume_path = store.path(resume_hash)
+                    state.parse_job = submit_parse(bytes(resume.getbuffer()), resume.type, resume_hash)
             
-            resume_text = parse_resume(resume)
-            if resume_text:
-                resume_data = analyze_resume(resume_text, state.position)
-                state.user_info.update(resume_data)
+            job = state.parse_job
+            if job is not None and not job.done:
+                st.info("⏳ Analyzing resume...")
+            elif job is not None and job.error:
+                st.error(job.error)
+            elif job is not None and job.text:
+                resume_data = analyze_resume(job.text, state.position)
+                state.user_info.skills = tuple(resume_data["skills"])
+                state.user_info.resume_score = resume_data["resume_score"]
                 
-                exp_diff = abs(state.user_info["experience"] - resume_data["experience"])
-                state.user_info["experience_mismatch"] = exp_diff > 0
+                exp_diff = abs(state.user_info.experience - resume_data["experience"])
+                state.user_info.experience_mismatch = exp_diff > 0
                 
                 st.subheader("📄 Resume Analysis")
                 
@@ -64,38 +80,39 @@ def render_registration():
                     st.write(", ".join(resume_data["preferred_matches"]) or "None")
                     st.write(f"**Resume Experience:** {resume_data['experience']} years")
                     
-                    if state.user_info["experience_mismatch"]:
-                        st.warning(f"⚠️ Experience mismatch: Resume shows {resume_data['experience']} years vs entered {state.user_info['experience']} years")
+                    if state.user_info.experience_mismatch:
+                        st.warning(f"⚠️ Experience mismatch: Resume shows {resume_data['experience']} years vs entered {state.user_info.experience} years")
                 
                 st.progress(min(resume_data["resume_score"] / 100, 1.0))
 
         submitted = st.form_submit_button("Start Interview")
         if submitted:
             state.validation_errors = validate_candidate_info(state.user_info)
+            if state.parse_job is not None and not state.parse_job.done:
+                state.validation_errors.append("Resume analysis is still running, please wait a moment")
             
             if not state.validation_errors:
-                if state.user_info["experience"] < POSITION_CONFIG[state.position]["experience_threshold"]:
+                if state.user_info.experience < POSITION_CONFIG[state.position]["experience_threshold"]:
                     state.validation_errors.append(
                         f"Minimum experience required: {POSITION_CONFIG[state.position]['experience_threshold']} years"
                     )
             
             if not state.validation_errors:
-                tech_q = POSITION_CONFIG[state.position]["technical"]
-                behave_q = POSITION_CONFIG[state.position]["behavioral"]
-                combined_questions = tech_q + behave_q
-                sample_size = min(5, len(combined_questions))
+                version, question_pool = get_question_pool(state.position)
+                sample_size = min(5, len(question_pool))
                 
-                if len(combined_questions) == 0:
+                if len(question_pool) == 0:
                     state.validation_errors.append("No interview questions configured for this position")
                 else:
-                    state.questions = random.sample(combined_questions, k=sample_size)
-                    state.stage = "interview"
+                    from backend.email_service import send_email
+                    state.begin_interview(version, random.sample(range(len(question_pool)), k=sample_size))
                     
                     html_content = create_resume_scorecard(state.user_info, state.position)
                     send_email(
-                        state.user_info["email"],
+                        state.user_info.email,
                         "Interview Started",
-                        f"Hi {state.user_info['name']},\n\nYour {state.position} interview has begun!",
+                        f"Hi {state.user_info.name},\n\nYour {state.position} interview has begun!\n\n"
+                        f"If you are disconnected, resume it with interview ID {state.user_info.interview_id}.",
                         html_content
                     )
                     st.rerun()
@@ -104,27 +121,57 @@ def render_registration():
         st.error("Please fix the following issues:")
         for error in state.validation_errors:
             st.write(f"- {error}")
+    
+    # Poll the background parse; the page stays usable while it runs
+    if state.parse_job is not None and not state.parse_job.done:
+        time.sleep(PARSE_POLL_SECONDS)
+        st.rerun()
+
+def render_resume_interview():
+    """Pick an unfinished interview back up after a disconnect or server restart"""
+    with st.form("resume_form"):
+        st.subheader("Resume an Interview")
+        email = st.text_input("Email")
+        interview_id = st.text_input("Interview ID")
+        
+        if st.form_submit_button("Resume Interview"):
+            restored = restore_session(email.strip(), interview_id.strip())
+            if restored is None:
+                st.error("No unfinished interview found for this email and interview ID")
+            else:
+                st.session_state.state = restored
+                st.rerun()
+
+def render_interview_page():
+    """Interview menu entry: the running interview, or the form to resume one"""
+    state = initialize_session()
+    if state.stage == "interview":
+        render_interview()
+    else:
+        st.info("Please complete registration first")
+        render_resume_interview()
 
 def render_interview():
     """Enhanced interview interface with time management"""
     state = initialize_session()
     
-    st.title(f"🔍 {state.position} Interview - {state.user_info['name']}")
-    st.markdown(f"**Interview ID:** `{state.user_info['interview_id']}`")
+    st.title(f"🔍 {state.position} Interview - {state.user_info.name}")
+    st.markdown(f"**Interview ID:** `{state.user_info.interview_id}`")
     
-    elapsed_time = datetime.now() - state.question_start_time
-    time_left = max(120 - elapsed_time.total_seconds(), 0)
+    elapsed_seconds = time.time() - state.question_start_time
+    time_left = max(120 - elapsed_seconds, 0)
     mins, secs = divmod(int(time_left), 60)
     
     col1, col2 = st.columns(2)
     with col1:
         st.markdown(f"**Time Remaining:** {mins:02d}:{secs:02d}")
     with col2:
-        progress = state.current_qindex / len(state.questions)
-        st.progress(min(progress, 1.0), text=f"Question {state.current_qindex+1}/{len(state.questions)}")
+        progress = state.current_qindex / len(state.question_indices)
+        st.progress(min(progress, 1.0), text=f"Question {state.current_qindex+1}/{len(state.question_indices)}")
 
-    if state.current_qindex < len(state.questions):
-        question, keywords = state.questions[state.current_qindex]
+    questions = state.questions
+    if state.current_qindex < len(questions):
+        question, keywords = questions[state.current_qindex]
         
         with st.form(f"q_{state.current_qindex}"):
             st.subheader("Current Question")
@@ -134,12 +181,9 @@ def render_interview():
             answer = st.text_area("Your Answer", height=200, key=f"ans_{state.current_qindex}")
             
             if st.form_submit_button("Submit Answer"):
-                found_keywords = [kw for kw in keywords if kw.lower() in answer.lower()]
-                missing_keywords = [kw for kw in keywords if kw.lower() not in answer.lower()]
-                
-                state.answers.append((question, answer))
+                found_keywords, missing_keywords, _ = state.record_answer(answer)
                 state.current_qindex += 1
-                state.question_start_time = datetime.now()
+                state.question_start_time = time.time()
                 
                 if found_keywords:
                     st.success(f"✅ Covered keywords: {', '.join(found_keywords)}")
@@ -150,30 +194,35 @@ def render_interview():
     else:
         st.balloons()
         st.success("🎉 Interview Completed!")
+        import pandas as pd
+        from backend.email_service import send_email
+        from backend.results_store import append_result
         
         report_data = {
-            "Name": state.user_info["name"],
-            "Email": state.user_info["email"],
+            "Name": state.user_info.name,
+            "Email": state.user_info.email,
             "Position": state.position,
-            "Experience": state.user_info["experience"],
-            "Resume Score": state.user_info["resume_score"],
-            "Skills": ", ".join(state.user_info["skills"]) if state.user_info["skills"] else "",
+            "Experience": state.user_info.experience,
+            "Resume Score": state.user_info.resume_score,
+            "Skills": ", ".join(state.user_info.skills) if state.user_info.skills else "",
             "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "Responses": "\n\n".join([f"Q: {q}\nA: {a}" for q, a in state.answers]),
-            "Interview ID": state.user_info["interview_id"]
+            "Responses": "\n\n".join([f"Q: {q}\nA: {a}" for q, a in state.answer_pairs()]),
+            "Interview ID": state.user_info.interview_id,
+            "Resume Hash": state.user_info.resume_hash
         }
         
         df = pd.DataFrame([report_data])
-        if os.path.exists("results.xlsx"):
-            existing_df = pd.read_excel("results.xlsx")
-            df = pd.concat([existing_df, df], ignore_index=True)
-        df.to_excel("results.xlsx", index=False)
         
-        send_email(
-            ADMIN_EMAIL,
-            "New Interview Completed",
-            f"Interview results for {state.user_info['name']} ({state.position})"
-        )
+        # Reruns (e.g. the download button) must not append the interview twice
+        if not state.results_saved:
+            append_result(report_data)
+            state.results_saved = True
+            
+            send_email(
+                ADMIN_EMAIL,
+                "New Interview Completed",
+                f"Interview results for {state.user_info.name} ({state.position})"
+            )
         
         col1, col2 = st.columns(2)
         col1.download_button(
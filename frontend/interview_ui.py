@@ -1,8 +1,6 @@
 import os
-import uuid
 import pandas as pd
 import streamlit as st
-from datetime import datetime, timedelta
 import PyPDF2
 import docx
 import re
@@ -14,9 +12,10 @@ from io import BytesIO
 import hashlib
 import json
 
-RESUMES_DIR = "resumes"
+from backend.question_pool import get_question_pool
+from utils.session_manager import InterviewState
+
 POSITIONS_FILE = "positions.json"
-os.makedirs(RESUMES_DIR, exist_ok=True)
 
 PEPPER = os.environ.get("PEPPER", "default-secret-pepper")
 SMTP_SERVER = "smtp.example.com"
@@ -25,22 +24,6 @@ EMAIL_ADDRESS = "your_email@example.com"
 EMAIL_PASSWORD = "your_password"
 ADMIN_EMAIL = "admin@example.com"
 
-class InterviewState:
-    def __init__(self):
-        self.stage = "registration"
-        self.questions = []
-        self.answers = []
-        self.current_qindex = 0
-        self.position = ""
-        self.user_info = {
-            "name": "", "email": "", "phone": "", "experience": 0,
-            "resume_path": "", "skills": [], "resume_score": 0,
-            "experience_mismatch": False, "interview_id": str(uuid.uuid4())
-        }
-        self.question_start_time = datetime.now()
-        self.validation_errors = []
-        self.auth_token = ""
-
 def load_positions():
     if not os.path.exists(POSITIONS_FILE):
         with open(POSITIONS_FILE, 'w') as f:
@@ -108,20 +91,21 @@ def render_registration():
     state = st.session_state.state
     with st.form("reg_form"):
         st.header("Candidate Registration")
-        state.user_info["name"] = st.text_input("Full Name")
-        state.user_info["email"] = st.text_input("Email")
-        state.user_info["phone"] = st.text_input("Phone Number")
+        state.user_info.name = st.text_input("Full Name")
+        state.user_info.email = st.text_input("Email")
+        state.user_info.phone = st.text_input("Phone Number")
         state.position = st.selectbox("Position", list(POSITION_CONFIG.keys()))
-        state.user_info["experience"] = st.number_input("Experience (Years)", min_value=0)
+        state.user_info.experience = st.number_input("Experience (Years)", min_value=0)
         
         resume = st.file_uploader("Upload Resume (PDF/DOCX)")
         if resume:
-            state.user_info["resume_path"] = f"{RESUMES_DIR}/{state.user_info['name']}_{uuid.uuid4().hex[:6]}.{resume.type.split('/')[-1]}"
-            with open(state.user_info["resume_path"], "wb") as f:
-                f.write(resume.getbuffer())
+            from backend.blob_store import get_blob_store
+            store = get_blob_store()
+            state.user_info.resume_path = store.path(store.put(resume.getbuffer()))
             
             resume_data = analyze_resume(parse_resume(resume), state.position)
-            state.user_info.update(resume_data)
+            state.user_info.skills = tuple(resume_data["skills"])
+            state.user_info.resume_score = resume_data["resume_score"]
             st.subheader("Resume Analysis")
             cols = st.columns(3)
             cols[0].metric("Score", f"{resume_data['resume_score']}%")
@@ -129,16 +113,14 @@ def render_registration():
             cols[2].metric("Preferred Skills", len(resume_data['preferred_matches']))
         
         if st.form_submit_button("Start Interview"):
-            state.stage = "interview"
-            tech_q = POSITION_CONFIG[state.position]["technical"]
-            behave_q = POSITION_CONFIG[state.position]["behavioral"]
-            state.questions = random.sample(tech_q + behave_q, min(5, len(tech_q + behave_q)))
+            version, question_pool = get_question_pool(state.position)
+            state.begin_interview(version, random.sample(range(len(question_pool)), min(5, len(question_pool))))
             st.rerun()
 
 def render_interview():
     state = st.session_state.state
     st.title(f"{state.position} Interview")
-    st.markdown(f"Interview ID: {state.user_info['interview_id']}")
+    st.markdown(f"Interview ID: {state.user_info.interview_id}")
     
     if state.current_qindex < len(state.questions):
         question, keywords = state.questions[state.current_qindex]
@@ -146,19 +128,19 @@ def render_interview():
             st.subheader(question)
             answer = st.text_area("Your Answer")
             if st.form_submit_button("Submit"):
-                state.answers.append((question, answer))
+                state.record_answer(answer)
                 state.current_qindex += 1
                 st.rerun()
     else:
         st.balloons()
         st.success("Interview Completed!")
         report_data = {
-            "Name": state.user_info["name"],
-            "Email": state.user_info["email"],
+            "Name": state.user_info.name,
+            "Email": state.user_info.email,
             "Position": state.position,
-            "Experience": state.user_info["experience"],
-            "Resume Score": state.user_info["resume_score"],
-            "Interview ID": state.user_info["interview_id"]
+            "Experience": state.user_info.experience,
+            "Resume Score": state.user_info.resume_score,
+            "Interview ID": state.user_info.interview_id
         }
         pd.DataFrame([report_data]).to_excel("results.xlsx", index=False, mode='a')
 
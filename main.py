@@ -1,9 +1,21 @@
-from frontend.candidate_ui import render_registration, render_interview
-from frontend.dashboard import analytics_dashboard
-from frontend.candidate_portal import candidate_portal
-from frontend.admin_controls import render_admin_panel
+import importlib
 import streamlit as st
-from utils.session_manager import initialize_session  # Import initialize_session
+from backend.metrics import start_exporter
+
+# Menu entry -> (module, render function). Page modules and their heavy
+# dependencies (pandas, SQLAlchemy, PyPDF2, python-docx, smtplib) are
+# imported on the first visit to the page, then reused from sys.modules.
+PAGES = {
+    "Registration": ("frontend.candidate_ui", "render_registration"),
+    "Interview": ("frontend.candidate_ui", "render_interview_page"),
+    "Dashboard": ("frontend.dashboard", "analytics_dashboard"),
+    "Candidate Portal": ("frontend.candidate_portal", "candidate_portal"),
+    "Admin": ("frontend.admin_controls", "render_admin_panel"),
+}
+
+def load_page(menu: str):
+    module, function = PAGES[menu]
+    return getattr(importlib.import_module(module), function)
 
 def main():
     """Main application controller"""
@@ -14,29 +26,12 @@ def main():
         initial_sidebar_state="expanded"
     )
     
+    start_exporter()  # /metrics on METRICS_PORT, once per process
+    
     st.sidebar.title("Navigation")
-    menu = st.sidebar.radio("Menu", [
-        "Registration", 
-        "Interview", 
-        "Dashboard", 
-        "Candidate Portal", 
-        "Admin"
-    ], key="main_nav")
+    menu = st.sidebar.radio("Menu", list(PAGES), key="main_nav")
     
-    if menu == "Registration":
-        render_registration()
-    elif menu == "Interview":
-        state = initialize_session()
-        if state.stage == "interview":
-            render_interview()
-        else:
-            st.info("Please complete registration first")
-    elif menu == "Dashboard":
-        analytics_dashboard()
-    elif menu == "Candidate Portal":
-        candidate_portal()
-    elif menu == "Admin":
-        render_admin_panel()
+    load_page(menu)()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
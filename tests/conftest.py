@@ -0,0 +1,24 @@
+import pytest
+
+from backend import db
+from config.settings import RESULTS_DB
+
+
+@pytest.fixture
+def results_db(tmp_path):
+    """A fresh, empty results database for the duration of one test"""
+    path = str(tmp_path / "results.db")
+    db.use_database(path)
+    yield path
+    db.use_database(RESULTS_DB)
+
+
+@pytest.fixture
+def positions_file(tmp_path, monkeypatch):
+    """Point the position config at a temporary positions.json (created with the defaults on first read)"""
+    from backend import data_manager
+
+    path = str(tmp_path / "positions" / "positions.json")
+    monkeypatch.setattr(data_manager, "POSITIONS_FILE", path)
+    monkeypatch.setattr(data_manager, "_cached_stamp", None)
+    return path
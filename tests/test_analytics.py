@@ -0,0 +1,50 @@
+import threading
+
+from backend import analytics, results_store
+from backend.db import get_engine, position_stats_table
+
+
+def record(n: int, position: str = "Data Scientist", score: float = 80.0) -> dict:
+    return {
+        "Name": f"Candidate {n}", "Email": f"c{n}@example.com", "Position": position,
+        "Experience": 3, "Resume Score": score, "Skills": "Python, SQL",
+        "Timestamp": f"2024-01-01 {n % 24:02d}:00:00", "Interview ID": f"iv-{n}",
+    }
+
+
+def test_summary_is_maintained_on_append(results_db):
+    results_store.append_result(record(1, score=90))
+    results_store.append_result(record(2, score=50))
+    results_store.append_result(record(3, position="Software Engineer", score=70))
+
+    summary = analytics.load_summary()
+    assert summary["candidates"] == 3
+    assert summary["average_score"] == 70.0
+    assert round(summary["success_rate"], 1) == 66.7
+    assert summary["top_skills"] == {"Python": 3, "SQL": 3}
+    assert summary["hours"] == {1: 1, 2: 1, 3: 1}
+    assert analytics.rebuild_aggregates() == {"positions": 0, "hours": 0, "skills": 0}
+
+
+def test_rebuild_corrects_drift(results_db):
+    results_store.append_result(record(1))
+    with get_engine().begin() as conn:
+        conn.execute(position_stats_table.update().values(candidates=5))
+    assert analytics.rebuild_aggregates()["positions"] == 1
+    assert analytics.load_summary()["candidates"] == 1
+
+
+def test_result_appended_during_a_rebuild_is_kept(results_db, monkeypatch):
+    results_store.append_result(record(1))
+    clear = analytics.clear_aggregates
+    appender = threading.Thread(target=results_store.append_result, args=(record(2),))
+
+    def clear_after_a_concurrent_append(conn):
+        appender.start()
+        appender.join(0.5)  # with the rebuild holding the write lock, the append waits for it
+        clear(conn)
+
+    monkeypatch.setattr(analytics, "clear_aggregates", clear_after_a_concurrent_append)
+    analytics.rebuild_aggregates()
+    appender.join()
+    assert analytics.load_summary()["candidates"] == 2
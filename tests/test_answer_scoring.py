@@ -0,0 +1,43 @@
+import pytest
+
+from backend.answer_scoring import KeywordScorer, stem, stem_phrase
+
+
+@pytest.mark.parametrize("keyword, answer", [
+    ("process", "We start processing the data"),
+    ("process", "I processed it"),
+    ("process", "Three processes run"),
+    ("access", "accessing the warehouse"),
+    ("stress", "I was stressed"),
+    ("run", "running the jobs"),
+    ("add", "adding features"),
+    ("models", "modeling churn"),
+    ("imputing", "imputation of missing values"),
+    ("k fold", "k-fold cross validation"),
+])
+def test_keyword_matches_inflected_forms(keyword, answer):
+    assert KeywordScorer([keyword]).score(answer) == ([keyword], [], 100.0)
+
+
+@pytest.mark.parametrize("word", ["process", "access", "stress", "ball"])
+def test_doubled_consonant_stems_match_their_suffixed_forms(word):
+    assert stem(word) == stem(word + "ing") == stem(word + "ed") == stem(word + "es" if word.endswith("s") else word + "s")
+
+
+def test_keywords_are_whole_words():
+    assert KeywordScorer(["sql"]).score("I used mysqlclient") == ([], ["sql"], 0.0)
+
+
+def test_synonyms_cover_their_keyword():
+    scorer = KeywordScorer(["regularization", "pandas"], {"Regularization": ["L1 penalty"]})
+    assert scorer.score("We add an l1 penalty") == (["regularization"], ["pandas"], 50.0)
+
+
+def test_multiword_keyword_needs_consecutive_words():
+    scorer = KeywordScorer(["feature engineering"])
+    assert scorer.score("engineered features") == ([], ["feature engineering"], 0.0)
+    assert stem_phrase("Feature-Engineering") == stem_phrase("feature engineering")
+
+
+def test_empty_keywords_score_zero():
+    assert KeywordScorer(["", "  "]).score("anything") == ([], [], 0.0)
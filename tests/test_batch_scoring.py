@@ -0,0 +1,44 @@
+import random
+
+import numpy as np
+
+from backend.analysis_engine import analyze_resume
+from backend.batch_scoring import BatchScorer, round_half_even
+from backend.data_manager import get_positions, save_positions
+from benchmarks.corpus import make_resume_text
+
+
+def _scalar_scores(texts, positions):
+    return np.array([[analyze_resume(text, position)["resume_score"] for position in positions] for text in texts])
+
+
+def test_matches_analyze_resume(positions_file):
+    rng = random.Random(3)
+    texts = [make_resume_text(rng, pages=1) for _ in range(40)] + ["", "no skills here"]
+    scorer = BatchScorer()
+
+    scores = scorer.score_texts(texts)
+
+    assert scores.shape == (len(texts), len(get_positions()))
+    np.testing.assert_array_equal(scores, _scalar_scores(texts, scorer.position_names))
+
+
+def test_overlapping_skills_follow_the_scalar_rule(positions_file):
+    save_positions({
+        "ML Engineer": {"required_skills": ["Machine Learning", "Python"], "preferred_skills": ["Learning"]},
+        "Teacher": {"required_skills": ["Learning", "Machine"], "preferred_skills": []},
+        "Empty": {"required_skills": [], "preferred_skills": []},
+    })
+    texts = ["Machine Learning with Python", "learning machine learning", "Machine  Learning", "learning"]
+    scorer = BatchScorer()
+
+    encoded = scorer.encode_all(texts)
+
+    assert encoded[0].overlapping_pairs
+    np.testing.assert_array_equal(scorer.score(encoded), _scalar_scores(texts, scorer.position_names))
+
+
+def test_round_half_even_matches_round():
+    values = np.array([0.05, 0.15, 0.25, 12.345, 66.65, 99.95])
+
+    assert round_half_even(values).tolist() == [round(float(v), 1) for v in values]
@@ -0,0 +1,65 @@
+import random
+import zipfile
+
+import pytest
+
+from backend import batch_screening
+from benchmarks.corpus import make_pdf, make_resume_text
+
+
+def _never_read(task):
+    raise AssertionError(f"{task} was read")
+
+
+def test_screens_a_resume(tmp_path, positions_file):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(make_pdf(make_resume_text(random.Random(1))))
+
+    record = batch_screening.screen_resume((None, str(path)), ["Data Scientist"], early_stop=True)
+
+    assert record["error"] is None
+    assert 0 <= record["scores"]["Data Scientist"]["resume_score"] <= 100
+
+
+def test_oversized_file_is_rejected_before_reading(tmp_path, monkeypatch):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"x" * 2048)
+    monkeypatch.setattr(batch_screening, "MAX_FILE_SIZE_MB", 1 / 1024)
+    monkeypatch.setattr(batch_screening, "_read", _never_read)
+
+    record = batch_screening.screen_resume((None, str(path)), ["Data Scientist"])
+
+    assert record["error"].startswith("File too large")
+
+
+def test_oversized_archive_member_is_rejected_before_reading(tmp_path, monkeypatch):
+    archive = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("big.pdf", b"x" * 2048)
+    monkeypatch.setattr(batch_screening, "MAX_FILE_SIZE_MB", 1 / 1024)
+    monkeypatch.setattr(batch_screening, "_read", _never_read)
+
+    record = batch_screening.screen_resume((str(archive), "big.pdf"), ["Data Scientist"])
+
+    assert record["error"].startswith("File too large")
+
+
+def test_unknown_position_fails_before_the_pool_starts(tmp_path, positions_file, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("pool started")
+
+    monkeypatch.setattr(batch_screening, "ProcessPoolExecutor", no_pool)
+
+    with pytest.raises(ValueError, match="Data Scientits"):
+        batch_screening.run_batch(str(tmp_path), ["Data Scientist", "Data Scientits"], writer=None, workers=1)
+
+
+def test_main_rejects_unknown_position(tmp_path, positions_file, capsys):
+    output = tmp_path / "scored.jsonl"
+
+    with pytest.raises(SystemExit) as exc:
+        batch_screening.main([str(tmp_path), "--position", "Nope", "--output", str(output)])
+
+    assert exc.value.code == 2
+    assert "Unknown position(s): Nope" in capsys.readouterr().err
+    assert not output.exists()
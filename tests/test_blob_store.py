@@ -0,0 +1,81 @@
+import os
+import time
+
+import pytest
+
+from backend import blob_store, results_store
+from backend.parse_cache import content_hash
+
+PDF = b"%PDF-1.4 resume one"
+DOCX = b"PK\x03\x04 resume two"
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = blob_store.BlobStore(str(tmp_path / "resumes"))
+    monkeypatch.setattr(blob_store, "_store", store)
+    return store
+
+
+def _age(store, key, hours):
+    then = time.time() - hours * 3600
+    os.utime(store.path(key), (then, then))
+
+
+def test_put_dedupes_by_content(store):
+    key = store.put(PDF)
+
+    assert key == content_hash(PDF)
+    assert store.put(PDF) == key
+    assert store.get(key) == PDF
+    assert store.get("0" * 64) is None
+    assert store.path(key).startswith(os.path.join(store.directory, key[:2], key[2:4]))
+    assert store.stats()["blobs"] == 1
+
+
+def test_stats_track_puts_and_survive_a_lost_index(store):
+    store.put(PDF)
+    store.put(DOCX)
+    stats = store.stats()
+    assert stats["blobs"] == 2
+    assert stats["bytes"] == len(PDF) + len(DOCX)
+
+    os.remove(os.path.join(store.directory, blob_store.INDEX_FILE))
+    assert store.stats() == stats
+    assert sorted(store.keys()) == sorted([content_hash(PDF), content_hash(DOCX)])
+
+
+def test_gc_keeps_referenced_pinned_and_fresh_blobs(store, results_db):
+    referenced, pinned, fresh, orphan = (store.put(f"%PDF {name}".encode()) for name in ("a", "b", "c", "d"))
+    results_store.append_result({"Interview ID": "iv-1", "Position": "Data Scientist", "Resume Hash": referenced})
+    store.pin([pinned])
+    for key in (referenced, pinned, orphan):
+        _age(store, key, 48)
+
+    assert store.collect_garbage(grace_hours=24, dry_run=True)["removed"] == 1
+    assert store.exists(orphan)
+
+    result = store.collect_garbage(grace_hours=24)
+    assert (result["scanned"], result["removed"], result["pinned"]) == (4, 1, 1)
+    assert not store.exists(orphan)
+    assert all(store.exists(key) for key in (referenced, pinned, fresh))
+    assert store.stats()["blobs"] == 3
+
+
+def test_migrate_moves_loose_files_and_pins_them(store, results_db):
+    os.makedirs(store.directory)
+    loose = os.path.join(store.directory, "resume.pdf")
+    with open(loose, "wb") as f:
+        f.write(PDF)
+    with open(os.path.join(store.directory, "notes.txt"), "wb") as f:
+        f.write(b"not a resume")
+    results_store.start_interview({"interview_id": "iv-1", "resume_path": loose, "status": "in_progress"}, [])
+
+    assert [key for key, _, _ in blob_store.iter_documents(store.directory)] == [content_hash(PDF)]
+    assert blob_store.migrate_directory(store.directory) == {"files": 1, "stored": 1, "duplicates": 0}
+
+    key = content_hash(PDF)
+    assert not os.path.exists(loose)
+    assert store.get(key) == PDF
+    assert store.pinned() == {key}
+    assert results_store.find_interview("", "iv-1")["resume_path"] == store.path(key)
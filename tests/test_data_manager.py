@@ -0,0 +1,60 @@
+import json
+import os
+import threading
+
+from backend import data_manager
+
+
+def test_missing_file_is_created_with_the_defaults(positions_file):
+    assert data_manager.get_positions() == data_manager.default_positions()
+    assert os.path.exists(positions_file)
+
+
+def test_version_changes_only_when_the_config_does(positions_file):
+    version = data_manager.get_positions_version()
+    assert data_manager.get_positions_version() == version
+
+    positions = data_manager.load_positions()
+    positions["Analyst"] = {"required_skills": ["SQL"]}
+    data_manager.save_positions(positions)
+    assert data_manager.get_positions_version() == version + 1
+    assert "Analyst" in data_manager.get_positions()
+
+    # An edit by another process is picked up by its new mtime/size
+    with open(positions_file, "w") as f:
+        json.dump({"Only": {}}, f)
+    assert list(data_manager.get_positions()) == ["Only"]
+    assert data_manager.get_positions_version() == version + 2
+
+
+def test_save_listeners_get_previous_and_new_config(positions_file, monkeypatch):
+    calls = []
+    monkeypatch.setattr(data_manager, "_save_listeners", [])
+    data_manager.on_positions_saved(lambda previous, saved: calls.append((list(previous), list(saved))))
+    before = list(data_manager.get_positions())
+    data_manager.save_positions({"New": {}})
+    assert calls == [(before, ["New"])]
+
+
+def test_snapshot_never_pairs_a_config_with_another_version(positions_file):
+    data_manager.get_positions()
+    seen = {}
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            positions, version = data_manager.get_positions_snapshot()
+            marker = next(iter(positions))
+            if seen.setdefault(version, marker) != marker:
+                errors.append((version, marker, seen[version]))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for n in range(200):
+        data_manager.save_positions({f"config {n}": {}})
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assert errors == []
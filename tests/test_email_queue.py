@@ -0,0 +1,148 @@
+import contextlib
+import smtplib
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, update
+
+from backend import email_queue
+from backend.db import email_outbox_table, get_engine
+
+
+class StubSMTP:
+    """Stands in for smtplib.SMTP; the first `failures` sends drop the connection"""
+
+    failures = 0
+    sent = []
+    opened = 0
+
+    def __init__(self, host, port, timeout=None):
+        StubSMTP.opened += 1
+
+    def noop(self):
+        return 250, b"OK"
+
+    def send_message(self, msg):
+        if StubSMTP.failures:
+            StubSMTP.failures -= 1
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        StubSMTP.sent.append(msg["To"])
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def outbox(results_db, monkeypatch):
+    monkeypatch.setattr(StubSMTP, "failures", 0)
+    monkeypatch.setattr(StubSMTP, "sent", [])
+    monkeypatch.setattr(StubSMTP, "opened", 0)
+    monkeypatch.setattr(email_queue.smtplib, "SMTP", StubSMTP)
+    monkeypatch.setattr(email_queue, "get_worker", lambda: SimpleNamespace(wake=lambda: None))
+    return email_queue.SMTPConnection(host="localhost", port=8025, use_tls=False, password="")
+
+
+def _row(message_id):
+    with get_engine().connect() as conn:
+        return conn.execute(select(email_outbox_table).where(email_outbox_table.c.id == message_id)).one()
+
+
+def _make_due(message_id):
+    with get_engine().begin() as conn:
+        conn.execute(update(email_outbox_table).where(email_outbox_table.c.id == message_id).values(next_attempt_at=0))
+
+
+def test_delivers_over_one_connection(outbox):
+    for i in range(3):
+        email_queue.enqueue_email(f"c{i}@example.com", "Hello", "Body")
+
+    assert email_queue.deliver_pending(outbox) == {"sent": 3, "retried": 0, "failed": 0}
+    assert StubSMTP.sent == ["c0@example.com", "c1@example.com", "c2@example.com"]
+    assert StubSMTP.opened == 1
+    assert email_queue.outbox_status() == {"sent": 3}
+
+
+def test_failed_send_is_retried_with_backoff(outbox):
+    StubSMTP.failures = 1
+    message_id = email_queue.enqueue_email("c@example.com", "Hello", "Body")
+
+    before = time.time()
+    assert email_queue.deliver_pending(outbox) == {"sent": 0, "retried": 1, "failed": 0}
+    row = _row(message_id)
+    assert (row.status, row.attempts) == ("pending", 1)
+    assert "SMTPServerDisconnected" in row.last_error
+    assert row.next_attempt_at >= before + email_queue.retry_delay(1)
+
+    # not due yet
+    assert email_queue.deliver_pending(outbox) == {"sent": 0, "retried": 0, "failed": 0}
+
+    _make_due(message_id)
+    assert email_queue.deliver_pending(outbox) == {"sent": 1, "retried": 0, "failed": 0}
+    assert _row(message_id).attempts == 2
+    assert StubSMTP.opened == 2  # the dropped connection was replaced
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    delays = [email_queue.retry_delay(attempts) for attempts in range(1, 30)]
+
+    assert delays[1] == 2 * delays[0]
+    assert max(delays) == email_queue.MAX_RETRY_DELAY_SECONDS
+
+
+def test_message_fails_after_max_attempts(outbox, monkeypatch):
+    monkeypatch.setattr(email_queue, "EMAIL_MAX_ATTEMPTS", 2)
+    StubSMTP.failures = 10
+    message_id = email_queue.enqueue_email("c@example.com", "Hello", "Body")
+
+    assert email_queue.deliver_pending(outbox)["retried"] == 1
+    _make_due(message_id)
+    assert email_queue.deliver_pending(outbox)["failed"] == 1
+
+    row = _row(message_id)
+    assert (row.status, row.attempts) == ("failed", 2)
+    _make_due(message_id)
+    assert email_queue.deliver_pending(outbox) == {"sent": 0, "retried": 0, "failed": 0}
+
+
+def test_claimed_message_is_leased_until_it_expires(outbox):
+    message_id = email_queue.enqueue_email("c@example.com", "Hello", "Body")
+
+    with get_engine().begin() as conn:
+        assert [row.id for row in email_queue._claim_due(conn, 10)] == [message_id]
+    with get_engine().begin() as conn:
+        assert email_queue._claim_due(conn, 10) == []  # another sender holds the lease
+    assert _row(message_id).next_attempt_at > time.time() + email_queue.CLAIM_LEASE_SECONDS - 60
+
+    _make_due(message_id)  # the lease ran out without the sender recording an outcome
+    assert email_queue.deliver_pending(outbox)["sent"] == 1
+
+
+class _Stop(BaseException):
+    pass
+
+
+def test_wake_during_delivery_is_not_lost(monkeypatch):
+    monkeypatch.setattr(email_queue, "EMAIL_POLL_SECONDS", 30)
+    worker = email_queue.OutboxWorker()
+    calls = []
+
+    def deliver(connection):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            worker.wake()  # a message enqueued while the batch was being sent
+            return {}
+        raise _Stop
+
+    monkeypatch.setattr(email_queue, "deliver_pending", deliver)
+
+    def run():
+        with contextlib.suppress(_Stop):
+            worker.run()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(5)
+
+    assert len(calls) == 2
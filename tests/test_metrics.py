@@ -0,0 +1,49 @@
+import threading
+
+from backend import metrics
+
+
+def test_timer_and_counter_are_rendered():
+    with metrics.timer("test_block"):
+        pass
+    metrics.increment("test_event", 2)
+    text = metrics.render_prometheus()
+    assert 'recruiter_operation_seconds_count{operation="test_block"} 1' in text
+    assert 'recruiter_events_total{event="test_event"} 2' in text
+    assert any(row["Operation"] == "test_block" for row in metrics.summary())
+
+
+def test_quantile_stays_within_the_observed_range():
+    histogram = metrics.Histogram()
+    for seconds in (0.001, 0.002, 0.003, 0.2):
+        histogram.observe(seconds)
+    assert 0.001 <= histogram.quantile(0.5) <= 0.0025
+    assert histogram.quantile(1.0) == 0.2
+
+
+def test_rendering_while_operations_are_registered():
+    stop = threading.Event()
+    errors = []
+
+    def register():
+        for n in range(5000):
+            metrics.get_histogram(f"test_registered_{n}").observe(0.001)
+        stop.set()
+
+    def render():
+        while not stop.is_set():
+            try:
+                metrics.render_prometheus()
+                metrics.summary()
+            except RuntimeError as e:  # dictionary changed size during iteration
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=register), threading.Thread(target=render)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for n in range(5000):
+        metrics._histograms.pop(f"test_registered_{n}", None)
+    assert errors == []
@@ -0,0 +1,65 @@
+import random
+
+from backend import near_duplicates
+
+
+def _text(seed: int, words: int = 1000) -> str:
+    rng = random.Random(seed)
+    return " ".join(f"w{rng.randint(0, 5000)}" for _ in range(words))
+
+
+def _edited(text: str, position: int) -> str:
+    words = text.split()
+    words[position] = "edited"
+    return " ".join(words)
+
+
+def test_similarity_estimates_jaccard():
+    a = _text(1)
+
+    assert near_duplicates.similarity(near_duplicates.minhash(a), near_duplicates.minhash(a)) == 1.0
+    assert near_duplicates.similarity(near_duplicates.minhash(a), near_duplicates.minhash(_edited(a, 500))) > 0.95
+    assert near_duplicates.similarity(near_duplicates.minhash(a), near_duplicates.minhash(_text(2))) < 0.1
+
+
+def test_index_resume_reports_near_duplicates(results_db):
+    original = _text(1)
+
+    assert near_duplicates.index_resume("a", original) == []
+    assert near_duplicates.index_resume("b", _text(2)) == []
+    assert [h for h, _ in near_duplicates.index_resume("c", _edited(original, 10))] == ["a"]
+    assert near_duplicates.count_indexed() == 3
+    assert near_duplicates.indexed(["a", "c", "z"]) == {"a", "c"}
+
+
+def test_groups_and_representatives(results_db):
+    first, second = _text(1), _text(2)
+    added = near_duplicates.index_documents([
+        ("a1", first), ("a2", _edited(first, 100)), ("a3", _edited(first, 900)),
+        ("b1", second), ("b2", _edited(second, 500)), ("unique", _text(3)),
+    ])
+    assert added == 6
+    assert near_duplicates.index_documents([("a1", first)]) == 0
+
+    assert near_duplicates.duplicate_groups() == [["a1", "a2", "a3"], ["b1", "b2"]]
+    assert near_duplicates.duplicate_groups(resume_hashes=["a1", "b1", "b2"]) == [["b1", "b2"]]
+
+    mapping = near_duplicates.representatives(["a1", "a2", "a3", "b2", "unique"])
+    assert len({mapping["a1"], mapping["a2"], mapping["a3"]}) == 1
+    assert mapping["b2"] == "b2"  # its duplicate b1 is not among the hashes asked about
+    assert mapping["unique"] == "unique"
+
+
+def test_representative_stands_in_only_for_direct_duplicates(results_db):
+    # a chain a - b - c where a and c are too far apart to be near-duplicates of each other
+    base = _text(1)
+    middle = " ".join(base.split()[:950] + ["x"] * 50)
+    far = " ".join(base.split()[:900] + ["x"] * 100)
+    near_duplicates.index_documents([("a", base), ("b", middle), ("c", far)])
+    sig = {h: near_duplicates.get_signature(h) for h in "abc"}
+    threshold = near_duplicates.similarity(sig["a"], sig["c"]) + 0.01
+    assert min(near_duplicates.similarity(sig["a"], sig["b"]), near_duplicates.similarity(sig["b"], sig["c"])) >= threshold
+
+    mapping = near_duplicates.representatives("abc", threshold=threshold)
+
+    assert mapping == {"a": "b", "b": "b", "c": "b"}
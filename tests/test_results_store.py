@@ -0,0 +1,84 @@
+import pandas as pd
+
+from backend import results_store
+
+
+def record(n: int, position: str = "Data Scientist", score: float = 80.0, **extra) -> dict:
+    return {
+        "Name": f"Candidate {n}", "Email": f"c{n}@example.com", "Position": position,
+        "Experience": n, "Resume Score": score, "Skills": "Python, SQL",
+        "Timestamp": f"2024-01-{n % 28 + 1:02d} 10:00:00", "Interview ID": f"iv-{n}", **extra,
+    }
+
+
+def test_append_and_find(results_db):
+    assert not results_store.has_results()
+    results_store.append_result(record(1))
+    results_store.append_result(record(2, position="Software Engineer"))
+
+    assert results_store.has_results()
+    assert results_store.find_results("c1@example.com", "iv-1")["Name"].tolist() == ["Candidate 1"]
+    assert results_store.find_results("c2@example.com", "iv-1").empty
+    assert results_store.find_results_by_email("c2@example.com")["Position"].tolist() == ["Software Engineer"]
+    assert results_store.load_results("Data Scientist")["Interview ID"].tolist() == ["iv-1"]
+
+
+def test_pages_and_filters(results_db):
+    for n in range(10):
+        results_store.append_result(record(n, score=n * 10))
+
+    page = results_store.load_results_page(limit=3, offset=2)
+    assert page["Interview ID"].tolist() == ["iv-7", "iv-6", "iv-5"]
+    assert results_store.count_results(min_score=50) == 5
+    assert results_store.count_results(since="2024-01-03", until="2024-01-04") == 2
+
+    chunks = list(results_store.iter_results(chunk_size=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert pd.concat(chunks)["Interview ID"].tolist() == [f"iv-{n}" for n in range(10)]
+
+
+def test_leaderboard_ranking(results_db):
+    results_store.append_result(record(1, score=70))
+    results_store.append_result(record(2, score=90))
+    results_store.append_result(record(3, score=70))  # same score, more experience than 1
+    results_store.append_result(record(4, position="Software Engineer", score=99))
+
+    board = results_store.top_candidates("Data Scientist", limit=2, offset=1)
+    assert board["Rank"].tolist() == [2, 3]
+    assert board["Interview ID"].tolist() == ["iv-3", "iv-1"]
+    assert results_store.count_candidates("Data Scientist") == 3
+
+
+def test_interview_resume_and_answers(results_db):
+    interview = {"interview_id": "iv-1", "email": "c1@example.com", "position": "Data Scientist",
+                 "resume_hash": "h1", "status": "in_progress"}
+    results_store.start_interview(interview, [["What is SQL?", ["sql"]]])
+    results_store.save_answer("iv-1", 0, "first")
+    results_store.save_answer("iv-1", 0, "second")
+
+    found = results_store.find_interview("c1@example.com", "iv-1")
+    assert found["questions"] == [["What is SQL?", ["sql"]]]
+    assert results_store.load_answers("iv-1") == {0: "second"}
+
+    results_store.append_result(record(1, **{"Resume Hash": "h2"}))
+    assert results_store.find_interview("c1@example.com", "iv-1") is None  # completed
+    assert results_store.referenced_resume_hashes() == {"h1", "h2"}
+
+
+def test_import_excel_skips_known_interviews(results_db, tmp_path):
+    path = str(tmp_path / "results.xlsx")
+    pd.DataFrame([record(1), record(2)]).to_excel(path, index=False)
+    results_store.append_result(record(1))
+
+    assert results_store.import_excel(path) == 1
+    assert results_store.import_excel(path) == 0
+    assert results_store.count_results() == 2
+    assert results_store.import_excel(str(tmp_path / "missing.xlsx")) == 0
+
+
+def test_purge_clears_aggregates(results_db):
+    results_store.append_result(record(1))
+    results_store.purge_results()
+
+    assert not results_store.has_results()
+    assert results_store.count_candidates("Data Scientist") == 0
@@ -0,0 +1,74 @@
+import random
+import threading
+import types
+
+from backend import blob_store, parse_cache, resume_jobs, search_index, similarity
+from benchmarks.corpus import make_pdf, make_resume_text
+
+
+def _blocking_index(release: threading.Event, indexed: list):
+    def index_resume(resume_hash, text):
+        release.wait(5)
+        indexed.append(resume_hash)
+    return types.SimpleNamespace(__name__="blocking", index_resume=index_resume)
+
+
+def _failing_index():
+    def index_resume(resume_hash, text):
+        raise RuntimeError("index unavailable")
+    return types.SimpleNamespace(__name__="failing", index_resume=index_resume)
+
+
+def test_parse_finishes_without_waiting_for_indexing(monkeypatch):
+    release, indexed = threading.Event(), []
+    monkeypatch.setattr(resume_jobs, "cached_extract", lambda data, file_type, extract, resume_hash: "resume text")
+    monkeypatch.setattr(resume_jobs, "INDEXES", (_failing_index(), _blocking_index(release, indexed)))
+
+    job = resume_jobs.submit_parse(b"data", "application/pdf", "a" * 64)
+    job._future.result(timeout=5)
+    assert job.text == "resume text" and job.error is None
+    assert indexed == []  # still blocked, yet the parse is done
+
+    release.set()
+    resume_jobs._index_executor.submit(lambda: None).result(timeout=5)
+    assert indexed == ["a" * 64]  # a failing index does not stop the others
+
+
+def test_parse_errors_are_reported_on_the_job(monkeypatch):
+    def fail(data, file_type, extract, resume_hash):
+        raise OSError("truncated")
+    monkeypatch.setattr(resume_jobs, "cached_extract", fail)
+
+    job = resume_jobs.submit_parse(b"data", "application/pdf", "b" * 64)
+    job._future.exception(timeout=5)
+    assert job.text is None
+    assert job.error == "Resume parsing error: truncated"
+
+
+def test_index_directory_fills_only_missing_indexes(tmp_path, results_db, monkeypatch):
+    monkeypatch.setattr(parse_cache, "_cache", parse_cache.ParseCache(str(tmp_path / "cache"), 1 << 20, 16))
+    monkeypatch.setattr(similarity, "_index", similarity.SimilarityIndex(str(tmp_path / "similarity")))
+    store = blob_store.BlobStore(str(tmp_path / "resumes"))
+    rng = random.Random(2)
+    keys = [store.put(make_pdf(make_resume_text(rng, pages=1))) for _ in range(3)]
+    store.put(b"%PDF-1.4 truncated")
+    extracted = []
+    extract = resume_jobs.extract_text
+
+    def counting_extract(data, file_type):
+        extracted.append(file_type)
+        return extract(data, file_type)
+
+    monkeypatch.setattr(resume_jobs, "extract_text", counting_extract)
+    search_index.index_resume(keys[0], "already indexed")
+
+    stats = resume_jobs.index_directory(store.directory)
+
+    assert stats == {"files": 4, "errors": 1, "near_duplicates": 3, "search_index": 2, "similarity": 3}
+    assert len(extracted) == 4
+    assert search_index.indexed(keys) == set(keys)
+
+    extracted.clear()
+    stats = resume_jobs.index_directory(store.directory)
+    assert stats == {"files": 4, "errors": 1, "near_duplicates": 0, "search_index": 0, "similarity": 0}
+    assert len(extracted) == 1  # only the unreadable resume is tried again
@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+import pytest
+
+from backend import scoring_service
+from config.settings import SERVICE_MAX_PENDING_SCORES
+
+
+async def _exchange(raw: bytes, batcher: bool = False):
+    """Send raw bytes to a fresh service; returns (status, JSON body) of its reply"""
+    service = scoring_service.ScoringService(parse_workers=1)
+    if batcher:
+        service._batcher = scoring_service.MicroBatcher(8, 0.001, SERVICE_MAX_PENDING_SCORES)
+        service._batcher.start()
+    server = await asyncio.start_server(service._handle_connection, "127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(raw)
+        await writer.drain()
+        reply = await asyncio.wait_for(reader.read(), 10)
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+        if batcher:
+            service._batcher._task.cancel()
+            service._batcher._executor.shutdown()
+    head, _, body = reply.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def _post(path: str, payload: dict) -> bytes:
+    body = json.dumps(payload).encode()
+    return (
+        f"POST {path} HTTP/1.1\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    ).encode() + body
+
+
+def test_oversized_header_line_is_refused():
+    raw = b"GET /health HTTP/1.1\r\nX-Padding: " + b"a" * (2 ** 17) + b"\r\n\r\n"
+
+    status, body = asyncio.run(_exchange(raw))
+
+    assert status == 431
+    assert body == {"error": "Header line too long"}
+
+
+def test_oversized_request_line_is_refused():
+    status, _ = asyncio.run(_exchange(b"GET /" + b"a" * (2 ** 17) + b" HTTP/1.1\r\n\r\n"))
+
+    assert status == 414
+
+
+@pytest.mark.parametrize("limit", [-1, "2", 1.5, True])
+def test_rank_rejects_invalid_limit(positions_file, limit):
+    payload = {"position": "Data Scientist", "resumes": [{"id": 1, "text": "python"}], "limit": limit}
+
+    status, body = asyncio.run(_exchange(_post("/rank", payload)))
+
+    assert status == 400
+    assert "limit" in body["error"]
+
+
+def test_rank_applies_limit(positions_file):
+    resumes = [{"id": i, "text": "python sql " * i} for i in range(3)]
+    payload = {"position": "Data Scientist", "resumes": resumes, "limit": 2}
+
+    status, body = asyncio.run(_exchange(_post("/rank", payload), batcher=True))
+
+    assert status == 200
+    assert len(body["ranking"]) == 2
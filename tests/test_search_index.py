@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from backend import search_index
+
+DOCUMENTS = {
+    "r1": "Senior engineer, 7 years of experience. Kubernetes and Kafka in production; machine learning pipelines.",
+    "r2": "Data scientist with 3 years of experience in machine learning, Python and C++.",
+    "r3": "Java developer, 10 years of experience. Learning machine vision; Kafka streams.",
+    "r4": "Frontend developer using Node.js and C#.",
+}
+
+
+@pytest.fixture
+def corpus(results_db):
+    search_index.index_documents(DOCUMENTS.items())
+
+
+def _hashes(query, **kwargs):
+    return sorted(hit["resume_hash"] for hit in search_index.search(query, **kwargs)["hits"])
+
+
+def test_tokenize_keeps_language_names():
+    assert search_index.tokenize("C++, C# and Node.js") == ["c++", "c#", "and", "node", "js"]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("kafka", ["r1", "r3"]),
+    ("kafka AND kubernetes", ["r1"]),
+    ("kafka kubernetes", ["r1"]),
+    ("kubernetes OR python", ["r1", "r2"]),
+    ("kafka -java", ["r1"]),
+    ("kafka NOT java", ["r1"]),
+    ('"machine learning"', ["r1", "r2"]),
+    ("machine learning", ["r1", "r2", "r3"]),
+    ('"node.js" OR c++', ["r2", "r4"]),
+    ("(java OR python) AND NOT c++", ["r3"]),
+    ("kafka, 8+ years", ["r3"]),
+    ("5+ years", ["r1", "r3"]),
+    ("cobol", []),
+])
+def test_queries(corpus, query, expected):
+    assert _hashes(query) == expected
+
+
+@pytest.mark.parametrize("query", ["(kafka", "kafka AND", "OR kafka"])
+def test_malformed_queries_are_rejected(query):
+    with pytest.raises(ValueError):
+        search_index.parse_query(query)
+
+
+def test_ranking_and_pages(corpus):
+    result = search_index.search('"machine learning" OR kafka', limit=2, offset=1)
+
+    assert result["total"] == 3
+    assert len(result["hits"]) == 2
+    scores = [hit["score"] for hit in search_index.search('"machine learning" OR kafka')["hits"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_indexing_is_incremental(corpus):
+    assert search_index.index_resume("r1", "changed text") is False
+    assert search_index.index_resume("r5", "Kafka administrator") is True
+    assert search_index.indexed(["r1", "r5", "r9"]) == {"r1", "r5"}
+    assert _hashes("kafka") == ["r1", "r3", "r5"]
+
+
+def test_matches_a_scan_across_many_blocks(results_db, monkeypatch):
+    monkeypatch.setattr(search_index, "BLOCK_SHIFT", 2)
+    rng = random.Random(5)
+    vocabulary = ["alpha", "beta", "gamma", "delta", "epsilon"]
+    texts = {f"d{i}": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 12))) for i in range(60)}
+    search_index.index_documents(list(texts.items())[:30])
+    search_index.index_documents(list(texts.items())[30:])
+
+    def scan(predicate):
+        return sorted(h for h, text in texts.items() if predicate(text.split(), text))
+
+    assert _hashes("alpha beta", limit=100) == scan(lambda words, _: "alpha" in words and "beta" in words)
+    assert _hashes("gamma -delta", limit=100) == scan(lambda words, _: "gamma" in words and "delta" not in words)
+    assert _hashes('"alpha beta"', limit=100) == scan(lambda _, text: " alpha beta " in f" {text} ")
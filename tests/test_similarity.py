@@ -0,0 +1,101 @@
+import hashlib
+import math
+import os
+import random
+
+import numpy as np
+import pytest
+
+from backend import similarity
+
+
+def key(name: str) -> str:
+    return hashlib.sha256(name.encode()).hexdigest()
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    index = similarity.SimilarityIndex(str(tmp_path / "similarity"))
+    monkeypatch.setattr(similarity, "_index", index)
+    return index
+
+
+def test_small_corpus_keeps_shared_terms(index):
+    similarity.index_documents([
+        (key("a"), "kafka spark python scala docker"),
+        (key("b"), "kafka spark python scala java"),
+        (key("c"), "cooking gardening painting"),
+    ])
+    [(match, score)] = similarity.similar_candidates([key("a")])[key("a")]
+    assert match == key("b") and score > 0.5
+    assert {h for h, _ in similarity.match_texts(["kafka spark python"])[0]} == {key("a"), key("b")}
+
+
+def test_scores_match_brute_force_cosine(index):
+    rng = random.Random(3)
+    vocabulary = [f"skill{i}" for i in range(60)]
+    texts = {key(str(i)): " ".join(rng.choices(vocabulary, k=20)) for i in range(50)}
+    for start in range(0, 50, 7):  # several segments, merged along the way
+        similarity.index_documents(list(texts.items())[start:start + 7])
+    assert len(index.segments) > 1
+
+    tf = {h: {} for h in texts}
+    for h, text in texts.items():
+        for term in text.split():
+            tf[h][term] = tf[h].get(term, 0) + 1
+    df = {term: sum(term in counts for counts in tf.values()) for term in vocabulary}
+    idf = {term: math.log((1 + 50) / (1 + df[term])) + 1 for term in vocabulary}
+
+    def vector(counts):
+        v = np.array([(1 + math.log(counts[t])) * idf[t] if t in counts else 0.0 for t in vocabulary])
+        return v / np.linalg.norm(v)
+
+    query = "skill1 skill2 skill2 skill40"
+    expected = sorted(texts, key=lambda h: -vector(tf[h]) @ vector({"skill1": 1, "skill2": 2, "skill40": 1}))[:5]
+    found = similarity.match_texts([query], limit=5)[0]
+    assert [h for h, _ in found] == expected
+
+
+def test_document_frequencies_survive_reload(index):
+    similarity.index_documents([(key(str(i)), f"common rare{i}") for i in range(5)])
+    similarity.index_documents([(key("x"), "common other")])
+    reloaded = similarity.SimilarityIndex(index.directory)
+    reloaded.refresh()
+    assert reloaded.documents == 6
+    assert reloaded.doc_freq[reloaded.terms["common"]] == 6
+    np.testing.assert_array_equal(reloaded.doc_freq, index.doc_freq)
+    assert not os.path.exists(os.path.join(index.directory, "doc_freq.npy"))
+
+
+def test_writer_removes_segments_left_by_a_crash(index):
+    similarity.index_documents([(key("a"), "python sql")])
+    os.makedirs(os.path.join(index.directory, "seg-orphan"))
+    os.makedirs(os.path.join(index.directory, "seg-partial.tmp"))
+
+    other = similarity.SimilarityIndex(index.directory)  # e.g. the CLI in another process
+    assert other.add([(key("b"), "python spark")]) == 1
+    listed = {segment.name for segment in other.segments}
+    assert {name for name in os.listdir(index.directory) if name.startswith("seg-")} == listed
+
+    # The first writer sees the other's work before adding its own
+    assert index.add([(key("b"), "python spark"), (key("c"), "go rust")]) == 1
+    assert index.documents == 3 and index.contains(key("b"))
+
+
+def test_norms_from_a_replaced_idf_are_not_served(index):
+    similarity.index_documents([(key(str(i)), f"python term{i}") for i in range(10)])
+    idf, generation, [segment] = index._snapshot()
+    similarity.index_documents([(key(f"new{i}"), "python java") for i in range(10)])  # corpus doubles
+    _, new_generation, _ = index._snapshot()
+    assert new_generation != generation
+
+    index._segment_norms(segment, idf, generation)  # a query that started before the refresh
+    assert (new_generation, segment.name) not in index._norms
+
+
+def test_max_df_cutoff_only_applies_to_large_corpora(index, monkeypatch):
+    monkeypatch.setattr(similarity, "SIMILARITY_MAX_DF", 0.5)
+    similarity.index_documents([(key(str(i)), "python sql" if i < 3 else "python go") for i in range(4)])
+    assert similarity.match_texts(["python"])  # 4 resumes: below SIMILARITY_MAX_DF_MIN_DOCUMENTS
+    monkeypatch.setattr(similarity, "SIMILARITY_MAX_DF_MIN_DOCUMENTS", 4)
+    assert index._idf_for(index.doc_freq)[index.terms["python"]] == 0
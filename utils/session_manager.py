@@ -1,29 +1,124 @@
 import streamlit as st
-from datetime import datetime
+import time
 import uuid
-from typing import List, Tuple
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from backend.question_pool import get_questions, restore_questions
+from config.settings import ANSWER_INLINE_CHARS
+
+
+class CandidateInfo:
+    """Registration details and resume analysis of one candidate"""
+    __slots__ = (
+        "name", "email", "phone", "experience", "resume_path", "resume_hash",
+        "skills", "resume_score", "experience_mismatch", "interview_id",
+    )
+
+    def __init__(self):
+        self.name = ""
+        self.email = ""
+        self.phone = ""
+        self.experience = 0
+        self.resume_path = ""
+        self.resume_hash = ""
+        self.skills: Tuple[str, ...] = ()
+        self.resume_score = 0
+        self.experience_mismatch = False
+        self.interview_id = str(uuid.uuid4())
+
 
 class InterviewState:
+    """Per-session interview state, kept small because every open session holds one
+
+    Questions are (position, config version, index) references into the
+    shared pool in backend.question_pool. Every answer is written to the
+    results store as it is submitted; only answers up to
+    ANSWER_INLINE_CHARS are also kept in the session (None marks one that
+    lives in the store only). See restore_session for resuming.
+    """
+    __slots__ = (
+        "stage", "position", "questions_version", "question_indices", "answers", "current_qindex",
+        "user_info", "question_start_time", "validation_errors", "auth_token", "results_saved", "parse_job",
+    )
+
     def __init__(self):
         self.stage = "registration"
-        self.questions: List[Tuple[str, List[str]]] = []
-        self.answers: List[Tuple[str, str]] = []
-        self.current_qindex = 0
         self.position = ""
-        self.user_info = {
-            "name": "",
-            "email": "",
-            "phone": "",
-            "experience": 0,
-            "resume_path": "",
-            "skills": [],
-            "resume_score": 0,
-            "experience_mismatch": False,
-            "interview_id": str(uuid.uuid4()),
-        }
-        self.question_start_time = datetime.now()
-        self.validation_errors = []
+        self.questions_version = 0
+        self.question_indices: Tuple[int, ...] = ()
+        self.answers: List[Optional[str]] = []
+        self.current_qindex = 0
+        self.user_info = CandidateInfo()
+        self.question_start_time = time.time()
+        self.validation_errors: List[str] = []
         self.auth_token = ""
+        self.results_saved = False
+        self.parse_job = None  # backend.resume_jobs.ParseJob for the current upload
+
+    def set_questions(self, version: int, indices) -> None:
+        self.questions_version = version
+        self.question_indices = tuple(indices)
+
+    def begin_interview(self, version: int, indices) -> None:
+        """Fix the question set and record the interview so it survives a restart"""
+        from backend.results_store import start_interview  # pandas/SQLAlchemy load on first use
+        self.set_questions(version, indices)
+        info = self.user_info
+        start_interview({
+            "interview_id": info.interview_id, "name": info.name, "email": info.email, "phone": info.phone,
+            "experience": info.experience, "position": self.position, "resume_score": info.resume_score,
+            "skills": ", ".join(info.skills), "resume_path": info.resume_path, "resume_hash": info.resume_hash,
+            "started_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }, [[question, list(keywords)] for question, keywords in self.questions])
+        self.stage = "interview"
+        self.question_start_time = time.time()
+
+    @property
+    def questions(self) -> List[Tuple[str, Tuple[str, ...]]]:
+        return get_questions(self.position, self.questions_version, self.question_indices)
+
+    def record_answer(self, answer: str) -> Tuple[List[str], List[str], float]:
+        """Score and persist the answer to the current question; returns (found, missing, coverage %)"""
+        from backend.answer_scoring import get_keyword_scorer
+        from backend.results_store import save_answer
+        question, keywords = self.questions[len(self.answers)]
+        found, missing, coverage = get_keyword_scorer(self.position, keywords).score(answer)
+        save_answer(self.user_info.interview_id, len(self.answers), answer, question, coverage, ", ".join(found))
+        self.answers.append(answer if len(answer) <= ANSWER_INLINE_CHARS else None)
+        return found, missing, coverage
+
+    def answer_pairs(self) -> List[Tuple[str, str]]:
+        """(question, answer) for every submitted answer, reading spilled answers back"""
+        from backend.results_store import load_answers
+        spilled = load_answers(self.user_info.interview_id) if None in self.answers else {}
+        return [
+            (question, answer if answer is not None else spilled.get(index, ""))
+            for index, ((question, _), answer) in enumerate(zip(self.questions, self.answers))
+        ]
+
+def restore_session(email: str, interview_id: str) -> Optional[InterviewState]:
+    """Rebuild an unfinished interview from the results store, continuing at the first unanswered question"""
+    from backend.results_store import find_interview, load_answers
+    interview = find_interview(email, interview_id)
+    if interview is None:
+        return None
+    state = InterviewState()
+    state.stage = "interview"
+    state.position = interview["position"]
+    info = state.user_info
+    for field in ("interview_id", "name", "email", "phone", "experience",
+                  "resume_score", "resume_path", "resume_hash"):
+        setattr(info, field, interview[field])
+    info.skills = tuple(skill for skill in interview["skills"].split(", ") if skill)
+    state.set_questions(*restore_questions(state.position, interview["questions"]))
+
+    stored = load_answers(interview_id)
+    while len(state.answers) in stored and len(state.answers) < len(state.question_indices):
+        answer = stored[len(state.answers)]
+        state.answers.append(answer if len(answer) <= ANSWER_INLINE_CHARS else None)
+    state.current_qindex = len(state.answers)
+    return state
 
 def initialize_session():
     """Session state management"""